@@ -1,6 +1,7 @@
 # alembic/env.py
 from logging.config import fileConfig
 import os
+import re
 import sys
 from pathlib import Path
 
@@ -32,6 +33,14 @@ if config.config_file_name is not None:
 # Set target metadata for autogenerate support
 target_metadata = Base.metadata
 
+# Yearly biomarker_data partitions are created at ingest (utils/partitions.py), not by the models
+PARTITION_TABLE = re.compile(r"^biomarker_data_y\d+$")
+
+
+def include_name(name, type_, parent_names):
+    """Leave partitions out of autogenerate comparisons"""
+    return not (type_ == "table" and PARTITION_TABLE.match(name))
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -54,6 +63,7 @@ def run_migrations_offline() -> None:
         compare_type=True,
         compare_server_default=True,
         include_schemas=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -81,6 +91,7 @@ def run_migrations_online() -> None:
                 compare_type=True,
                 compare_server_default=True,
                 include_schemas=True,
+                include_name=include_name,
             )
             with context.begin_transaction():
                 context.run_migrations()
@@ -93,6 +104,7 @@ def run_migrations_online() -> None:
             compare_type=True,
             compare_server_default=True,
             include_schemas=True,
+            include_name=include_name,
         )
         with context.begin_transaction():
             print("Running migrations...")  # Debug
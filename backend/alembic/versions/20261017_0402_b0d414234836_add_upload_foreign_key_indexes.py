@@ -0,0 +1,52 @@
+"""add upload foreign key indexes
+
+Revision ID: b0d414234836
+Revises: a7bda0f06649
+Create Date: 2026-10-17 04:02:43.446888
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0d414234836'
+down_revision: Union[str, Sequence[str], None] = 'a7bda0f06649'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# biomarker_uploads.user_id needs no index of its own: it leads
+# ix_biomarker_uploads_user_id_content_digest and ix_biomarker_uploads_user_id_upload_date_id,
+# and (upload_id, date) likewise serves lookups on biomarker_data.upload_id alone.
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY builds without blocking writes, but can't run in a transaction.
+    # if_not_exists lets a rerun pick up after an interrupted build
+    # (drop an index left INVALID by a failed build first).
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_analysis_results_upload_id', 'analysis_results', ['upload_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_biomarker_data_upload_id_date', 'biomarker_data', ['upload_id', 'date'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_biomarker_data_upload_id_date', table_name='biomarker_data',
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            'ix_analysis_results_upload_id', table_name='analysis_results',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,116 @@
+"""partition biomarker_data by year
+
+Revision ID: 6f470657bf49
+Revises: b0d414234836
+Create Date: 2026-10-17 04:09:12.518310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f470657bf49'
+down_revision: Union[str, Sequence[str], None] = 'b0d414234836'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BIOMARKER_COLUMNS = 'id, upload_id, date, cholesterol_total, hdl, ldl, triglycerides, glucose, crp, vitamin_d'
+
+# (table, constraint, referred table, column) whose deletes now cascade in the database
+UPLOAD_FOREIGN_KEYS = [
+    ('biomarker_uploads', 'biomarker_uploads_user_id_fkey', 'users', 'user_id'),
+    ('analysis_results', 'analysis_results_upload_id_fkey', 'biomarker_uploads', 'upload_id'),
+    ('upload_jobs', 'upload_jobs_upload_id_fkey', 'biomarker_uploads', 'upload_id'),
+]
+
+
+def _biomarker_data_table(name: str, *constraints, **kw) -> None:
+    # Keeps the existing id sequence, so ids continue where they left off
+    op.create_table(name,
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('biomarker_data_id_seq'::regclass)"), nullable=False),
+    sa.Column('upload_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('cholesterol_total', sa.Float(), nullable=True),
+    sa.Column('hdl', sa.Float(), nullable=True),
+    sa.Column('ldl', sa.Float(), nullable=True),
+    sa.Column('triglycerides', sa.Float(), nullable=True),
+    sa.Column('glucose', sa.Float(), nullable=True),
+    sa.Column('crp', sa.Float(), nullable=True),
+    sa.Column('vitamin_d', sa.Float(), nullable=True),
+    *constraints,
+    **kw
+    )
+    op.execute(f'ALTER SEQUENCE biomarker_data_id_seq OWNED BY {name}.id')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, constraint, referred, column in UPLOAD_FOREIGN_KEYS:
+        op.drop_constraint(constraint, table, type_='foreignkey')
+        op.create_foreign_key(constraint, table, referred, [column], ['id'], ondelete='CASCADE')
+    op.drop_constraint('analysis_timepoints_biomarker_data_id_fkey', 'analysis_timepoints', type_='foreignkey')
+
+    # Rewrites the table: existing rows are copied into one partition per year.
+    # ix_biomarker_data_id goes away, the (id, date) primary key leads with id.
+    op.rename_table('biomarker_data', 'biomarker_data_unpartitioned')
+    op.execute('ALTER INDEX biomarker_data_pkey RENAME TO biomarker_data_unpartitioned_pkey')
+    op.drop_index('ix_biomarker_data_upload_id_date', table_name='biomarker_data_unpartitioned')
+
+    _biomarker_data_table('biomarker_data',
+        sa.ForeignKeyConstraint(['upload_id'], ['biomarker_uploads.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', 'date'),
+        postgresql_partition_by='RANGE (date)'
+    )
+    years = op.get_bind().execute(sa.text(
+        'SELECT DISTINCT extract(year FROM date)::int FROM biomarker_data_unpartitioned ORDER BY 1'
+    )).scalars().all()
+    for year in years:
+        op.execute(
+            f"CREATE TABLE biomarker_data_y{year} PARTITION OF biomarker_data "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+    op.execute(
+        f'INSERT INTO biomarker_data ({BIOMARKER_COLUMNS}) '
+        f'SELECT {BIOMARKER_COLUMNS} FROM biomarker_data_unpartitioned'
+    )
+    op.drop_table('biomarker_data_unpartitioned')
+    op.create_index('ix_biomarker_data_upload_id_date', 'biomarker_data', ['upload_id', 'date'], unique=False)
+
+    op.create_foreign_key(
+        'analysis_timepoints_biomarker_data_id_date_fkey', 'analysis_timepoints', 'biomarker_data',
+        ['biomarker_data_id', 'date'], ['id', 'date'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('analysis_timepoints_biomarker_data_id_date_fkey', 'analysis_timepoints', type_='foreignkey')
+
+    op.rename_table('biomarker_data', 'biomarker_data_partitioned')
+    op.execute('ALTER INDEX biomarker_data_pkey RENAME TO biomarker_data_partitioned_pkey')
+    op.drop_index('ix_biomarker_data_upload_id_date', table_name='biomarker_data_partitioned')
+
+    _biomarker_data_table('biomarker_data',
+        sa.ForeignKeyConstraint(['upload_id'], ['biomarker_uploads.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        f'INSERT INTO biomarker_data ({BIOMARKER_COLUMNS}) '
+        f'SELECT {BIOMARKER_COLUMNS} FROM biomarker_data_partitioned'
+    )
+    # Drops the yearly partitions with it
+    op.drop_table('biomarker_data_partitioned')
+    op.create_index(op.f('ix_biomarker_data_id'), 'biomarker_data', ['id'], unique=False)
+    op.create_index('ix_biomarker_data_upload_id_date', 'biomarker_data', ['upload_id', 'date'], unique=False)
+
+    op.create_foreign_key(
+        'analysis_timepoints_biomarker_data_id_fkey', 'analysis_timepoints', 'biomarker_data',
+        ['biomarker_data_id'], ['id'], ondelete='CASCADE'
+    )
+    for table, constraint, referred, column in UPLOAD_FOREIGN_KEYS:
+        op.drop_constraint(constraint, table, type_='foreignkey')
+        op.create_foreign_key(constraint, table, referred, [column], ['id'])
@@ -1,4 +1,5 @@
 from auth_strategies.strategies import JWTStrategy, HS256Strategy, RS256Strategy
+from auth_strategies.denylist import TokenDenylist
 from auth_strategies.service import JWTService
 from auth_strategies.factory import get_jwt_service
 
@@ -6,6 +7,7 @@ __all__ = [
     "JWTStrategy",
     "HS256Strategy",
     "RS256Strategy",
+    "TokenDenylist",
     "JWTService",
     "get_jwt_service",
 ]
\ No newline at end of file
@@ -0,0 +1,55 @@
+from typing import Any, Dict, Optional
+import threading
+import time
+
+
+class TokenDenylist:
+    """
+    Revoked tokens (by jti) and per-user revocation cutoffs (by iat).
+
+    Entries are kept only as long as a matching token could still be valid:
+    a jti until its token's exp, a user cutoff for max_token_lifetime
+    seconds. Like TTLCache this is per process; in multi-process deployments
+    short token lifetimes bound how long a revoked token works elsewhere.
+    """
+
+    def __init__(self, max_token_lifetime: float):
+        self.max_token_lifetime = max_token_lifetime
+        self._tokens: Dict[str, float] = {}  # jti -> exp
+        self._users: Dict[str, float] = {}  # sub -> tokens issued before this are revoked
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def revoke_token(self, jti: str, exp: Optional[float] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._tokens[jti] = exp if exp is not None else now + self.max_token_lifetime
+            self._prune(now)
+
+    def revoke_user(self, user_id: Any, before: Optional[float] = None) -> None:
+        """Revoke every token of user_id issued before `before` (default: now)"""
+        now = time.time()
+        with self._lock:
+            self._users[str(user_id)] = before if before is not None else now
+            self._prune(now)
+
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        jti = payload.get("jti")
+        if jti is not None and jti in self._tokens:
+            return True
+        cutoff = self._users.get(str(payload.get("sub")))
+        # Tokens without iat predate revocation support; treat them as oldest
+        return cutoff is not None and payload.get("iat", 0) < cutoff
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def _prune(self, now: float) -> None:
+        if now < self._next_prune:
+            return
+        self._next_prune = now + 60
+        self._tokens = {jti: exp for jti, exp in self._tokens.items() if exp > now}
+        self._users = {
+            sub: cutoff for sub, cutoff in self._users.items()
+            if cutoff + self.max_token_lifetime > now
+        }
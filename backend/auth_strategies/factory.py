@@ -2,9 +2,21 @@ from typing import Optional
 import logging
 import time
 
+from auth_strategies.denylist import TokenDenylist
 from auth_strategies.service import JWTService
 from auth_strategies.strategies import HS256Strategy, RS256Strategy
-from config import SECRET_KEY, JWT_ALGORITHM, RSA_PRIVATE_KEY_PATH, RSA_PUBLIC_KEY_PATH
+from config import (
+    SECRET_KEY,
+    JWT_ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    RSA_PRIVATE_KEY_PATH,
+    RSA_PUBLIC_KEY_PATH,
+    RSA_KEYSET_DIR,
+    RSA_KEYSET_RELOAD_SECONDS,
+    JWT_TOKEN_CACHE_MAX_ENTRIES,
+    JWT_TOKEN_CACHE_MAX_TTL_SECONDS,
+)
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -13,13 +25,22 @@ _jwt_service: Optional[JWTService] = None
 _initialization_lock = False
 
 
+def _rs256_strategy() -> RS256Strategy:
+    """RS256 from the keyset directory when configured, else the single key pair"""
+    return RS256Strategy(
+        private_key_path=RSA_PRIVATE_KEY_PATH,
+        public_key_path=RSA_PUBLIC_KEY_PATH,
+        key_dir=RSA_KEYSET_DIR,
+        reload_interval=RSA_KEYSET_RELOAD_SECONDS
+    )
+
+
 def get_jwt_service() -> JWTService:
     """Get or create the JWT service with multi-strategy support"""
     global _jwt_service, _initialization_lock
     
     # Return existing instance if available
     if _jwt_service is not None:
-        logger.debug(f"♻️ Returning existing JWT service (primary={_jwt_service.get_algorithm()})")
         return _jwt_service
     
     # Prevent multiple initializations
@@ -34,23 +55,20 @@ def get_jwt_service() -> JWTService:
     try:
         logger.info("=" * 60)
         logger.info("🚀 INITIALIZING JWT SERVICE (FIRST TIME)")
-        logger.info(f"   JWT_ALGORITHM={JWT_ALGORITHM}")
-        logger.info(f"   SECRET_KEY present={bool(SECRET_KEY)}, length={len(SECRET_KEY)}")
+        logger.info("   JWT_ALGORITHM=%s", JWT_ALGORITHM)
+        logger.info("   SECRET_KEY present=%s, length=%s", bool(SECRET_KEY), len(SECRET_KEY))
         logger.info("=" * 60)
         
         # Choose primary strategy based on config
         if JWT_ALGORITHM == "RS256":
             logger.info("📝 Attempting RS256 as primary")
             try:
-                primary = RS256Strategy(
-                    private_key_path=RSA_PRIVATE_KEY_PATH,
-                    public_key_path=RSA_PUBLIC_KEY_PATH
-                )
+                primary = _rs256_strategy()
                 logger.info("✅ RS256 primary initialized successfully")
                 fallback = [HS256Strategy(SECRET_KEY)]
                 logger.info("✅ HS256 fallback added")
             except Exception as e:
-                logger.error(f"❌ RS256 failed: {e}, falling back to HS256")
+                logger.error("❌ RS256 failed: %s, falling back to HS256", e)
                 primary = HS256Strategy(SECRET_KEY)
                 fallback = []
         else:  # HS256
@@ -58,18 +76,21 @@ def get_jwt_service() -> JWTService:
             primary = HS256Strategy(SECRET_KEY)
             fallback = []
             try:
-                fallback.append(RS256Strategy(
-                    private_key_path=RSA_PRIVATE_KEY_PATH,
-                    public_key_path=RSA_PUBLIC_KEY_PATH
-                ))
+                fallback.append(_rs256_strategy())
                 logger.info("✅ RS256 fallback added")
             except (FileNotFoundError, ValueError) as e:
-                logger.info(f"⚠️ RS256 fallback not available: {e}")
+                logger.info("⚠️ RS256 fallback not available: %s", e)
+        
+        token_cache = None
+        if JWT_TOKEN_CACHE_MAX_ENTRIES > 0:
+            token_cache = TTLCache(JWT_TOKEN_CACHE_MAX_TTL_SECONDS, JWT_TOKEN_CACHE_MAX_ENTRIES)
+        
+        denylist = TokenDenylist(max_token_lifetime=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
         
-        _jwt_service = JWTService(primary, fallback)
-        logger.info(f"✅ JWT Service created successfully")
-        logger.info(f"   Primary: {_jwt_service.get_algorithm()}")
-        logger.info(f"   Fallbacks: {[s.get_algorithm() for s in _jwt_service.fallback_strategies]}")
+        _jwt_service = JWTService(primary, fallback, token_cache, denylist)
+        logger.info("✅ JWT Service created successfully")
+        logger.info("   Primary: %s", _jwt_service.get_algorithm())
+        logger.info("   Fallbacks: %s", [s.get_algorithm() for s in _jwt_service.fallback_strategies])
         logger.info("=" * 60)
         
         return _jwt_service
@@ -1,9 +1,16 @@
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
+import hashlib
 import logging
+import time
+import uuid
 
+from jose import jwt, JWTError
+
+from auth_strategies.denylist import TokenDenylist
 from auth_strategies.strategies import JWTStrategy
 from config import ACCESS_TOKEN_EXPIRE_MINUTES
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -11,10 +18,24 @@ logger = logging.getLogger(__name__)
 class JWTService:
     """Context class that supports multiple JWT strategies"""
     
-    def __init__(self, primary_strategy: JWTStrategy, fallback_strategies: Optional[List[JWTStrategy]] = None):
+    def __init__(
+        self,
+        primary_strategy: JWTStrategy,
+        fallback_strategies: Optional[List[JWTStrategy]] = None,
+        token_cache: Optional[TTLCache] = None,
+        denylist: Optional[TokenDenylist] = None
+    ):
         self.primary_strategy = primary_strategy
         self.fallback_strategies = fallback_strategies or []
-        logger.info(f"🎯 JWTService instance created with primary={primary_strategy.get_algorithm()}")
+        # Tokens are dispatched by their header alg; the primary wins if two strategies share one
+        self._strategies: Dict[str, JWTStrategy] = {}
+        for strategy in [primary_strategy, *self.fallback_strategies]:
+            self._strategies.setdefault(strategy.get_algorithm(), strategy)
+        # Verified payloads keyed by token digest; None disables caching
+        self.token_cache = token_cache
+        # Revoked tokens/users; checked on every decode, including cache hits
+        self.denylist = denylist
+        logger.info("🎯 JWTService instance created with primary=%s", primary_strategy.get_algorithm())
     
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token using the PRIMARY strategy"""
@@ -25,37 +46,91 @@ class JWTService:
         else:
             expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
-        to_encode.update({"exp": expire})
+        # jti/iat let a single token, or all of a user's older tokens, be revoked
+        to_encode.update({"exp": expire, "iat": time.time(), "jti": uuid.uuid4().hex})
         token = self.primary_strategy.encode(to_encode)
-        logger.info(f"🔑 Token created with {self.primary_strategy.get_algorithm()} for user={data.get('sub')}")
+        logger.info("🔑 Token created with %s for user=%s", self.primary_strategy.get_algorithm(), data.get('sub'))
         return token
     
+    @staticmethod
+    def _token_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
     def decode_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Decode and verify a JWT token - tries PRIMARY then FALLBACK strategies"""
-        logger.info(f"🔍 decode_token called with token: {token[:50]}...")
-        logger.info(f"   Primary: {self.primary_strategy.get_algorithm()}")
-        logger.info(f"   Fallbacks: {[s.get_algorithm() for s in self.fallback_strategies]}")
+        """
+        Decode and verify a JWT token.
+        Served from the verified-token cache when possible, otherwise verified
+        by the PRIMARY or FALLBACK strategy matching the token's alg header.
+        Revoked tokens decode to None.
+        """
+        payload = self._decode_verified(token)
+        if payload is not None and self.denylist is not None and self.denylist.is_revoked(payload):
+            logger.warning("⛔ Token revoked for user=%s", payload.get('sub'))
+            return None
+        return payload
+    
+    def _decode_verified(self, token: str) -> Optional[Dict[str, Any]]:
+        if self.token_cache is None:
+            return self._verify_token(token)
         
-        # Try primary strategy first
-        payload = self.primary_strategy.decode(token)
-        if payload:
-            logger.info(f"✅ Decoded with PRIMARY: {self.primary_strategy.get_algorithm()}")
-            return payload
-        else:
-            logger.warning(f"❌ PRIMARY {self.primary_strategy.get_algorithm()} failed")
+        key = self._token_key(token)
+        payload = self.token_cache.get(key)
+        if payload is not None:
+            return dict(payload)
+        
+        payload = self._verify_token(token)
+        if payload is not None:
+            # Never outlive the token: entries expire at exp (capped by the cache TTL)
+            exp = payload.get("exp")
+            ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+            self.token_cache.set(key, dict(payload), ttl)
+        return payload
+    
+    def evict_token(self, token: str) -> None:
+        """Drop a token from the verified-token cache (e.g. on revocation)"""
+        if self.token_cache is not None:
+            self.token_cache.invalidate(self._token_key(token))
+    
+    def revoke_token(self, payload: Dict[str, Any], token: Optional[str] = None) -> bool:
+        """
+        Deny the token with this verified payload until it expires.
+        Returns False if revocation is disabled or the token has no jti.
+        """
+        if token is not None:
+            self.evict_token(token)
+        if self.denylist is None or payload.get("jti") is None:
+            return False
+        self.denylist.revoke_token(payload["jti"], payload.get("exp"))
+        return True
+    
+    def revoke_user(self, user_id: Any) -> None:
+        """Deny every token issued to user_id so far"""
+        if self.denylist is not None:
+            self.denylist.revoke_user(user_id)
+    
+    def _verify_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify a JWT token with the one strategy matching its header's alg.
+        The header is read (unverified) once; the strategy still enforces the
+        algorithm when verifying, so a forged alg can only select which key
+        the signature is checked against, never skip the check.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            logger.warning("❌ Malformed token header - %s: %s", type(e).__name__, e)
+            return None
         
-        # Try fallback strategies
-        for i, strategy in enumerate(self.fallback_strategies):
-            logger.info(f"🔄 Trying fallback {i+1}: {strategy.get_algorithm()}")
-            payload = strategy.decode(token)
-            if payload:
-                logger.info(f"✅ Decoded with FALLBACK: {strategy.get_algorithm()}")
-                return payload
-            else:
-                logger.warning(f"❌ FALLBACK {strategy.get_algorithm()} failed")
+        algorithm = header.get("alg")
+        strategy = self._strategies.get(algorithm)
+        if strategy is None:
+            logger.warning("❌ No strategy configured for alg=%r", algorithm)
+            return None
         
-        logger.error("❌ ALL strategies failed!")
-        return None
+        payload = strategy.decode(token, header)
+        if payload is None:
+            logger.warning("❌ %s verification failed", algorithm)
+        return payload
     
     def get_algorithm(self) -> str:
         """Get the current primary algorithm being used"""
@@ -2,6 +2,11 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 from jose import jwt, JWTError, ExpiredSignatureError
 import logging
+import os
+import threading
+import time
+
+from utils.log_config import log_sampled
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +19,8 @@ class JWTStrategy(ABC):
         pass
     
     @abstractmethod
-    def decode(self, token: str) -> Optional[Dict[str, Any]]:
+    def decode(self, token: str, header: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Verify token; header is its already-parsed unverified header, if the caller has it"""
         pass
     
     @abstractmethod
@@ -27,27 +33,26 @@ class HS256Strategy(JWTStrategy):
     
     def __init__(self, secret_key: str):
         self.secret_key = secret_key
-        logger.info(f"✨ HS256Strategy created (secret key length={len(secret_key)})")
+        logger.info("✨ HS256Strategy created (secret key length=%s)", len(secret_key))
     
     def encode(self, payload: dict) -> str:
         token = jwt.encode(payload, self.secret_key, algorithm="HS256")
-        logger.debug(f"HS256: Encoded payload={payload}")
+        logger.debug("HS256: Encoded token for sub=%s", payload.get("sub"))
         return token
     
-    def decode(self, token: str) -> Optional[Dict[str, Any]]:
-        logger.info(f"🔐 HS256: Attempting to decode token")
+    def decode(self, token: str, header: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
-            logger.info(f"✅ HS256: Successfully decoded! payload={payload}")
+            log_sampled(logger, logging.DEBUG, "✅ HS256: Decoded token for sub=%s", payload.get("sub"))
             return payload
         except ExpiredSignatureError:
             logger.warning("⏰ HS256: Token expired")
             return None
         except JWTError as e:
-            logger.warning(f"❌ HS256: Invalid token - {type(e).__name__}: {str(e)}")
+            logger.warning("❌ HS256: Invalid token - %s: %s", type(e).__name__, e)
             return None
         except Exception as e:
-            logger.error(f"❌ HS256: Unexpected error - {type(e).__name__}: {str(e)}")
+            logger.error("❌ HS256: Unexpected error - %s: %s", type(e).__name__, e)
             return None
     
     def get_algorithm(self) -> str:
@@ -55,58 +60,153 @@ class HS256Strategy(JWTStrategy):
 
 
 class RS256Strategy(JWTStrategy):
-    """RSA SHA-256 strategy using public/private key pair"""
+    """
+    RSA SHA-256 strategy using public/private key pair
+
+    With key_dir set, keys come from a keyset directory instead of the two
+    key paths: <kid>.public.pem files verify tokens carrying that kid, and
+    the newest <kid>.private.pem signs new tokens (with its kid in the
+    header). The directory is rescanned when it changes (checked at most
+    every reload_interval seconds) and when a token names an unknown kid,
+    so keys rotate without a restart.
+    """
     
-    def __init__(self, private_key_path: str, public_key_path: str):
+    def __init__(
+        self,
+        private_key_path: str,
+        public_key_path: str,
+        key_dir: Optional[str] = None,
+        reload_interval: float = 60.0
+    ):
         self.private_key_path = private_key_path
         self.public_key_path = public_key_path
-        logger.info(f"✨ RS256Strategy initializing...")
-        self._load_keys()
+        self.key_dir = key_dir
+        self.reload_interval = reload_interval
+        self.public_keys: Dict[str, str] = {}
+        self.signing_kid: Optional[str] = None
+        self._keyset_mtime: Optional[int] = None
+        self._checked_at = 0.0
+        self._reload_lock = threading.Lock()
+        logger.info("✨ RS256Strategy initializing...")
+        if key_dir:
+            self._load_keyset()
+        else:
+            self._load_keys()
     
     def _load_keys(self):
         """Load RSA keys from files"""
-        import os
         
         # Load private key
         if os.path.exists(self.private_key_path):
             with open(self.private_key_path, 'r') as f:
                 self.private_key = f.read()
-            logger.info(f"✅ RS256: Private key loaded ({len(self.private_key)} bytes)")
+            logger.info("✅ RS256: Private key loaded (%s bytes)", len(self.private_key))
         else:
-            logger.warning(f"⚠️ RS256: Private key not found at {self.private_key_path}")
+            logger.warning("⚠️ RS256: Private key not found at %s", self.private_key_path)
             self.private_key = None
         
         # Load public key
         if os.path.exists(self.public_key_path):
             with open(self.public_key_path, 'r') as f:
                 self.public_key = f.read()
-            logger.info(f"✅ RS256: Public key loaded ({len(self.public_key)} bytes)")
+            logger.info("✅ RS256: Public key loaded (%s bytes)", len(self.public_key))
         else:
-            logger.error(f"❌ RS256: Public key not found at {self.public_key_path}")
+            logger.error("❌ RS256: Public key not found at %s", self.public_key_path)
             raise ValueError(f"Public key not found at {self.public_key_path}")
     
+    def _load_keyset(self):
+        """(Re)load every key in key_dir; keeps the previous keyset if the new one is unusable"""
+        if not os.path.isdir(self.key_dir):
+            raise ValueError(f"Key directory not found at {self.key_dir}")
+        
+        mtime = os.stat(self.key_dir).st_mtime_ns
+        public_keys = {}
+        private_keys = []
+        for name in os.listdir(self.key_dir):
+            path = os.path.join(self.key_dir, name)
+            if name.endswith(".public.pem"):
+                with open(path, 'r') as f:
+                    public_keys[name[:-len(".public.pem")]] = f.read()
+            elif name.endswith(".private.pem"):
+                private_keys.append((os.path.getmtime(path), name[:-len(".private.pem")], path))
+        
+        if not public_keys:
+            raise ValueError(f"No public keys (<kid>.public.pem) found in {self.key_dir}")
+        
+        private_key = None
+        signing_kid = None
+        if private_keys:
+            _, signing_kid, path = max(private_keys)
+            with open(path, 'r') as f:
+                private_key = f.read()
+        
+        # Swap in the complete keyset at once so concurrent decodes never see a partial one
+        self.public_keys = public_keys
+        self.private_key = private_key
+        self.signing_kid = signing_kid
+        self.public_key = public_keys.get(signing_kid) if signing_kid else None
+        self._keyset_mtime = mtime
+        logger.info("✅ RS256: Keyset loaded from %s (kids=%s, signing=%s)", self.key_dir, sorted(public_keys), signing_kid)
+    
+    def _refresh_keyset(self, force: bool = False):
+        """Reload the keyset if the directory changed, or unconditionally when force is set"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_interval:
+            return
+        with self._reload_lock:
+            # Unknown kids force a rescan, but at most once a second
+            if now - self._checked_at < (1.0 if force else self.reload_interval):
+                return
+            self._checked_at = now
+            try:
+                if force or os.stat(self.key_dir).st_mtime_ns != self._keyset_mtime:
+                    self._load_keyset()
+            except (OSError, ValueError) as e:
+                logger.error("❌ RS256: Keyset reload failed, keeping current keys: %s", e)
+    
+    def _verification_key(self, header: Optional[Dict[str, Any]]) -> Optional[str]:
+        if not self.key_dir:
+            return self.public_key
+        
+        self._refresh_keyset()
+        kid = (header or {}).get("kid")
+        if kid is None:
+            # Tokens issued before kids were used: only the current signing key can match
+            return self.public_key
+        if kid not in self.public_keys:
+            self._refresh_keyset(force=True)
+        return self.public_keys.get(kid)
+    
     def encode(self, payload: dict) -> str:
+        if self.key_dir:
+            self._refresh_keyset()
         if not self.private_key:
             raise ValueError("Private key not available")
-        token = jwt.encode(payload, self.private_key, algorithm="RS256")
-        logger.debug(f"RS256: Encoded payload={payload}")
+        headers = {"kid": self.signing_kid} if self.signing_kid else None
+        token = jwt.encode(payload, self.private_key, algorithm="RS256", headers=headers)
+        logger.debug("RS256: Encoded token for sub=%s (kid=%s)", payload.get("sub"), self.signing_kid)
         return token
     
-    def decode(self, token: str) -> Optional[Dict[str, Any]]:
-        logger.info(f"🔐 RS256: Attempting to decode token")
+    def decode(self, token: str, header: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         try:
-            payload = jwt.decode(token, self.public_key, algorithms=["RS256"])
-            logger.info(f"✅ RS256: Successfully decoded! payload={payload}")
+            if header is None and self.key_dir:
+                header = jwt.get_unverified_header(token)
+            public_key = self._verification_key(header)
+            if public_key is None:
+                logger.warning("❌ RS256: Unknown key id %r", (header or {}).get('kid'))
+                return None
+            payload = jwt.decode(token, public_key, algorithms=["RS256"])
+            log_sampled(logger, logging.DEBUG, "✅ RS256: Decoded token for sub=%s", payload.get("sub"))
             return payload
         except ExpiredSignatureError:
             logger.warning("⏰ RS256: Token expired")
             return None
         except JWTError as e:
-            logger.warning(f"❌ RS256: Invalid token - {type(e).__name__}: {str(e)}")
+            logger.warning("❌ RS256: Invalid token - %s: %s", type(e).__name__, e)
             return None
         except Exception as e:
-            logger.error(f"❌ RS256: Unexpected error - {type(e).__name__}: {str(e)}")
+            logger.error("❌ RS256: Unexpected error - %s: %s", type(e).__name__, e)
             return None
     
     def get_algorithm(self) -> str:
-        return "RS256"
\ No newline at end of file
+        return "RS256"
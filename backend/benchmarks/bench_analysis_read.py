@@ -0,0 +1,118 @@
+"""
+Benchmark: GET /biomarkers/analysis/{id} for one large upload, read from the
+packed biomarker_series row vs the biomarker_data rows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_analysis_read
+    python -m benchmarks.bench_analysis_read --sizes 10000 100000 --repeat 10
+
+Runs in-process (TestClient) against DATABASE_URL (override with
+BENCH_DATABASE_URL). A throwaway user and its uploads are created through the
+upload route and removed afterwards. The rows path is forced with a start
+date before every row, which the route serves from biomarker_data.
+
+Reports the median route time and, separately, the median time to fetch and
+decode the biomarkers alone (no JSON encoding).
+"""
+import argparse
+import os
+import statistics
+import time
+import uuid
+
+if os.getenv("BENCH_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+ROWS_START = "1900-01-01"
+
+
+def make_csv(rows: int) -> bytes:
+    rng = np.random.default_rng(42)
+    frame = pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=rows, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+        "cholesterol_total": rng.uniform(120, 300, rows).round(1),
+        "hdl": rng.uniform(25, 90, rows).round(1),
+        "ldl": rng.uniform(50, 220, rows).round(1),
+        "triglycerides": rng.uniform(40, 400, rows).round(1),
+        "glucose": rng.uniform(60, 200, rows).round(1),
+        "crp": rng.uniform(0.1, 10, rows).round(2),
+        "vitamin_d": rng.uniform(5, 80, rows).round(1),
+    })
+    return frame.to_csv(index=False).encode()
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from main import app
+    from middleware.rate_limiter import limiter
+    from dependencies.database import SessionLocal
+    from models import User, BiomarkerData, BiomarkerSeries
+    from utils import decode_series
+    from auth_strategies import get_jwt_service
+
+    limiter.enabled = False
+    client = TestClient(app)
+    db = SessionLocal()
+    user = User(email=f"bench-{uuid.uuid4().hex}@example.com", full_name="Bench", password_hash="x", is_active=1)
+    db.add(user)
+    db.commit()
+    token = get_jwt_service().create_access_token({"sub": str(user.id), "role": user.role.value})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"{'rows':>8} {'route packed':>13} {'route rows':>11} {'fetch packed':>13} {'fetch rows':>11}  (median ms)")
+    try:
+        for rows in args.sizes:
+            response = client.post(
+                "/biomarkers/upload", headers=headers, files={"file": (f"bench-{rows}.csv", make_csv(rows), "text/csv")}
+            )
+            response.raise_for_status()
+            upload_id = response.json()["upload_id"]
+            url = f"/biomarkers/analysis/{upload_id}"
+
+            route_packed = median_ms(lambda: client.get(url, headers=headers).raise_for_status(), args.repeat)
+            route_rows = median_ms(
+                lambda: client.get(url, params={"start": ROWS_START}, headers=headers).raise_for_status(), args.repeat
+            )
+
+            def fetch_packed():
+                db.expunge_all()
+                series = db.execute(select(BiomarkerSeries).where(BiomarkerSeries.upload_id == upload_id)).scalar_one()
+                return [values.tolist() for values in decode_series(series).values()]
+
+            def fetch_rows():
+                db.expunge_all()
+                return db.execute(
+                    select(BiomarkerData).where(BiomarkerData.upload_id == upload_id).order_by(BiomarkerData.date)
+                ).scalars().all()
+
+            fetch_packed_ms = median_ms(fetch_packed, args.repeat)
+            fetch_rows_ms = median_ms(fetch_rows, args.repeat)
+            db.rollback()
+            print(f"{rows:>8} {route_packed:>13.1f} {route_rows:>11.1f} {fetch_packed_ms:>13.1f} {fetch_rows_ms:>11.1f}")
+    finally:
+        # Cascades to the user's uploads, rows and series
+        db.delete(db.get(User, user.id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: GET /auth/me requests per second under different logging setups.
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth_me 2>/dev/null
+    python -m benchmarks.bench_auth_me --logging legacy queue --seconds 5 2>/dev/null
+
+Logging setups:
+    legacy  root logger at DEBUG with synchronous FileHandler + StreamHandler
+            (how main.py configured logging before the queue listener)
+    queue   configure_logging(): QueueHandler on the request path, a
+            listener thread doing the I/O, LOG_LEVEL (default INFO)
+
+Runs the app in-process with TestClient against DATABASE_URL (override with
+BENCH_DATABASE_URL). Creates one throwaway user. Console log output goes to
+stderr, so redirect it as above to keep the table readable.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+if os.getenv("BENCH_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+
+
+def use_legacy_logging(log_dir: str) -> None:
+    from utils.log_config import shutdown_logging
+
+    shutdown_logging()
+    root = logging.getLogger()
+    root.handlers = []
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
+        handlers=[logging.FileHandler(os.path.join(log_dir, "legacy.log")), logging.StreamHandler()],
+        force=True,
+    )
+
+
+def use_queue_logging(log_dir: str) -> None:
+    from utils.log_config import configure_logging, shutdown_logging
+
+    shutdown_logging()
+    configure_logging(log_dir=log_dir)
+
+
+def create_bench_user() -> dict:
+    from dependencies.database import SessionLocal
+    from models import User
+    from auth_strategies import get_jwt_service
+
+    db = SessionLocal()
+    try:
+        user = User(email=f"bench-{uuid.uuid4().hex}@example.com", full_name="Bench", password_hash="x", is_active=1)
+        db.add(user)
+        db.commit()
+        token = get_jwt_service().create_access_token({"sub": str(user.id), "role": user.role.value})
+        return {"id": user.id, "headers": {"Authorization": f"Bearer {token}"}}
+    finally:
+        db.close()
+
+
+def delete_bench_user(user_id: int) -> None:
+    from dependencies.database import SessionLocal
+    from models import User
+
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == user_id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(client, headers: dict, seconds: float) -> float:
+    """GET /auth/me calls per second"""
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        client.get("/auth/me", headers=headers)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logging", nargs="+", choices=["legacy", "queue"], default=["legacy", "queue"])
+    parser.add_argument("--seconds", type=float, default=3.0, help="Measurement time per setup")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from main import app
+    from middleware.rate_limiter import limiter
+
+    limiter.enabled = False
+    user = create_bench_user()
+    log_dir = tempfile.mkdtemp()
+    setups = {"legacy": use_legacy_logging, "queue": use_queue_logging}
+    try:
+        with TestClient(app) as client:
+            results = []
+            for name in args.logging:
+                setups[name](log_dir)
+                results.append((name, run(client, user["headers"], args.seconds)))
+    finally:
+        delete_bench_user(user["id"])
+
+    print(f"{'logging':<8} {'req/s':>9}")
+    for name, rate in results:
+        print(f"{name:<8} {rate:>9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: biomarker_data insert throughput, legacy ORM path vs vectorized bulk load.
+
+Usage (from backend/):
+    python -m benchmarks.bench_bulk_load
+    python -m benchmarks.bench_bulk_load --sizes 10000 100000 --skip-legacy-above 100000
+
+Runs against DATABASE_URL (override with BENCH_DATABASE_URL). Every run happens
+inside a transaction that is rolled back, so no data is left behind.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from config import DATABASE_URL
+from models import Base, User, BiomarkerUpload, BiomarkerData
+from utils.bulk_load import to_biomarker_frame, bulk_insert_biomarkers
+from utils.partitions import ensure_biomarker_partitions
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Build a synthetic CSV-like frame (dates as strings, as read_csv returns them)"""
+    rng = np.random.default_rng(42)
+    dates = pd.date_range("2000-01-01", periods=rows, freq="h").strftime("%Y-%m-%d %H:%M:%S")
+    return pd.DataFrame({
+        "date": dates,
+        "cholesterol_total": rng.uniform(120, 300, rows).round(1),
+        "hdl": rng.uniform(25, 90, rows).round(1),
+        "ldl": rng.uniform(50, 220, rows).round(1),
+        "triglycerides": rng.uniform(40, 400, rows).round(1),
+        "glucose": rng.uniform(60, 200, rows).round(1),
+        "crp": rng.uniform(0.1, 10, rows).round(2),
+        "vitamin_d": rng.uniform(5, 80, rows).round(1),
+    })
+
+
+def legacy_insert(db: Session, upload_id: int, df: pd.DataFrame) -> None:
+    """The original per-row ORM path"""
+    records = []
+    for _, row in df.iterrows():
+        records.append(BiomarkerData(
+            upload_id=upload_id,
+            date=pd.to_datetime(row['date']),
+            cholesterol_total=float(row['cholesterol_total']),
+            hdl=float(row['hdl']),
+            ldl=float(row['ldl']),
+            triglycerides=float(row['triglycerides']),
+            glucose=float(row['glucose']),
+            crp=float(row['crp']),
+            vitamin_d=float(row['vitamin_d'])
+        ))
+    db.bulk_save_objects(records)
+    db.flush()
+
+
+def bulk_insert(db: Session, upload_id: int, df: pd.DataFrame) -> None:
+    """The vectorized conversion + COPY/executemany path"""
+    bulk_insert_biomarkers(db.connection(), to_biomarker_frame(df, upload_id))
+
+
+def run(engine, fn, df: pd.DataFrame) -> float:
+    """Time one insert strategy inside a rolled-back transaction; returns rows/sec"""
+    with Session(engine) as db:
+        user = User(email=f"bench-{time.time_ns()}@example.com", full_name="Bench", password_hash="x")
+        db.add(user)
+        db.flush()
+        upload = BiomarkerUpload(user_id=user.id, filename="bench.csv", status="processing")
+        db.add(upload)
+        db.flush()
+
+        start = time.perf_counter()
+        fn(db, upload.id, df)
+        elapsed = time.perf_counter() - start
+
+        db.rollback()
+    return len(df) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-legacy-above", type=int, default=None,
+                        help="Skip the (slow) legacy path for sizes above this many rows")
+    args = parser.parse_args()
+
+    engine = create_engine(os.getenv("BENCH_DATABASE_URL", DATABASE_URL))
+    Base.metadata.create_all(bind=engine)
+    print(f"Engine: {engine.dialect.name}")
+    print(f"{'rows':>10} {'legacy rows/s':>15} {'bulk rows/s':>15} {'speedup':>9}")
+
+    for rows in args.sizes:
+        df = make_frame(rows)
+        # Ingest creates biomarker_data's yearly partitions before loading; so does the benchmark
+        ensure_biomarker_partitions(engine, pd.to_datetime(df["date"]).dt.year.unique().tolist())
+        bulk_rate = run(engine, bulk_insert, df)
+
+        if args.skip_legacy_above is not None and rows > args.skip_legacy_above:
+            print(f"{rows:>10} {'skipped':>15} {bulk_rate:>15,.0f} {'-':>9}")
+            continue
+
+        legacy_rate = run(engine, legacy_insert, df)
+        print(f"{rows:>10} {legacy_rate:>15,.0f} {bulk_rate:>15,.0f} {bulk_rate / legacy_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
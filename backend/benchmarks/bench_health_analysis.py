@@ -0,0 +1,77 @@
+"""
+Benchmark: health scoring throughput, scalar calculate_health_analysis per row
+vs the vectorized calculate_health_analysis_batch.
+
+Usage (from backend/):
+    python -m benchmarks.bench_health_analysis
+    python -m benchmarks.bench_health_analysis --sizes 1 1000 10000000 --skip-scalar-above 10000
+
+No database needed.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.health_analysis import calculate_health_analysis, calculate_health_analysis_batch
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        "cholesterol_total": rng.uniform(120, 300, rows).round(1),
+        "hdl": rng.uniform(25, 90, rows).round(1),
+        "ldl": rng.uniform(50, 220, rows).round(1),
+        "triglycerides": rng.uniform(40, 400, rows).round(1),
+        "glucose": rng.uniform(60, 200, rows).round(1),
+        "crp": rng.uniform(0.1, 10, rows).round(2),
+        "vitamin_d": rng.uniform(5, 80, rows).round(1),
+    })
+
+
+def scalar(df: pd.DataFrame, ages: np.ndarray) -> None:
+    for i in range(len(df)):
+        calculate_health_analysis(df.iloc[i], int(ages[i]))
+
+
+def batch(df: pd.DataFrame, ages: np.ndarray) -> None:
+    calculate_health_analysis_batch(df, ages)
+
+
+def run(fn, df: pd.DataFrame, ages: np.ndarray, repeat: int) -> float:
+    """Best-of-repeat rows/sec"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df, ages)
+        best = min(best, time.perf_counter() - start)
+    return len(df) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--skip-scalar-above", type=int, default=100_000,
+                        help="Skip the (slow) scalar path for sizes above this many rows")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'scalar rows/s':>15} {'batch rows/s':>15} {'speedup':>9}")
+
+    for rows in args.sizes:
+        df = make_frame(rows)
+        ages = np.random.default_rng(0).integers(20, 80, rows)
+        repeat = 5 if rows <= 100_000 else 1
+        batch_rate = run(batch, df, ages, repeat)
+
+        if rows > args.skip_scalar_above:
+            print(f"{rows:>10} {'skipped':>15} {batch_rate:>15,.0f} {'-':>9}")
+            continue
+
+        scalar_rate = run(scalar, df, ages, 1)
+        print(f"{rows:>10} {scalar_rate:>15,.0f} {batch_rate:>15,.0f} {batch_rate / scalar_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: JWTService.decode_token throughput with the verified-token cache on and off.
+
+Usage (from backend/):
+    python -m benchmarks.bench_jwt_decode
+    python -m benchmarks.bench_jwt_decode --seconds 2 --tokens 1 100
+
+Cases: HS256 and RS256 tokens decoded by a service whose primary strategy
+matches, plus an RS256 token under an HS256 primary (dispatched straight to
+the RS256 fallback by its alg header). Uses RSA_PRIVATE_KEY_PATH / RSA_PUBLIC_KEY_PATH,
+generating a throwaway key pair if they don't exist. Logging is disabled so
+the numbers reflect verification cost.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from auth_strategies import JWTService, HS256Strategy, RS256Strategy
+from config import SECRET_KEY, RSA_PRIVATE_KEY_PATH, RSA_PUBLIC_KEY_PATH
+from utils.cache import TTLCache
+
+
+def rsa_key_paths():
+    if os.path.exists(RSA_PRIVATE_KEY_PATH) and os.path.exists(RSA_PUBLIC_KEY_PATH):
+        return RSA_PRIVATE_KEY_PATH, RSA_PUBLIC_KEY_PATH
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    directory = tempfile.mkdtemp()
+    private_path = os.path.join(directory, "private_key.pem")
+    public_path = os.path.join(directory, "public_key.pem")
+    with open(private_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    with open(public_path, "wb") as f:
+        f.write(key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+    return private_path, public_path
+
+
+def run(service: JWTService, tokens, seconds: float) -> float:
+    """decode_token calls per second, cycling through tokens"""
+    for token in tokens:
+        assert service.decode_token(token) is not None
+    count = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for token in tokens:
+            service.decode_token(token)
+        count += len(tokens)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=1.0, help="Measurement time per case")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1, 1000],
+                        help="Distinct tokens cycled through (1 = one hot user)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    private_path, public_path = rsa_key_paths()
+    hs256 = HS256Strategy(SECRET_KEY)
+    rs256 = RS256Strategy(private_key_path=private_path, public_key_path=public_path)
+
+    cases = [
+        ("HS256", hs256, [], hs256),
+        ("RS256", rs256, [], rs256),
+        ("RS256 via HS256 primary", hs256, [rs256], rs256),
+    ]
+
+    print(f"{'case':<26} {'tokens':>7} {'uncached ops/s':>15} {'cached ops/s':>15} {'speedup':>9}")
+    for name, primary, fallback, signer in cases:
+        for count in args.tokens:
+            tokens = [
+                JWTService(signer).create_access_token({"sub": str(i)}, expires_delta=timedelta(hours=1))
+                for i in range(count)
+            ]
+            uncached = run(JWTService(primary, fallback), tokens, args.seconds)
+            cached = run(JWTService(primary, fallback, TTLCache(300, max(count, 1))), tokens, args.seconds)
+            print(f"{name:<26} {count:>7} {uncached:>15,.0f} {cached:>15,.0f} {cached / uncached:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
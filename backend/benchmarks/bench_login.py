@@ -0,0 +1,141 @@
+"""
+Benchmark: login capacity of the bounded password hashing pool.
+
+Usage (from backend/):
+    python -m benchmarks.bench_login --concurrency 8 64 --seconds 3
+    python -m benchmarks.bench_login --url http://localhost:8000 --email a@example.com --password pw
+
+Without --url, verify_password calls are driven through run_in_password_pool
+in-process (no database), using PASSWORD_HASH_THREADS / PASSWORD_HASH_MAX_QUEUE.
+While they run, a no-op is repeatedly sent to the default thread pool (where
+sync routes run) to show it stays responsive during the burst.
+
+With --url, concurrent POST /auth/login requests are sent to a running
+server. The login rate limit must be lifted for this (e.g. limiter disabled).
+
+Reports throughput, latency percentiles and how many requests were shed (503).
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from utils import (
+    hash_password,
+    verify_password,
+    measure_password_hash_cost,
+    run_in_password_pool,
+    get_password_pool,
+    ExecutorSaturated,
+)
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def drive(attempt, concurrency: int, seconds: float):
+    """Run attempt() from concurrency tasks for seconds; returns (logins/s, latencies, shed)"""
+    latencies = []
+    shed = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+
+    async def client():
+        nonlocal shed
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            if await attempt():
+                latencies.append(time.perf_counter() - started)
+            else:
+                shed += 1
+                await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    # Queued attempts finish after the deadline, so rate over the whole run
+    return len(latencies) / (time.perf_counter() - start), latencies, shed
+
+
+async def default_pool_latency(stop: asyncio.Event):
+    """Round-trip latencies of a no-op on the default executor (where sync routes run)"""
+    loop = asyncio.get_running_loop()
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await loop.run_in_executor(None, lambda: None)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def run_in_process(concurrency: int, seconds: float):
+    hashed = hash_password("benchmark")
+
+    async def attempt():
+        try:
+            return await run_in_password_pool(verify_password, "benchmark", hashed)
+        except ExecutorSaturated:
+            return False
+
+    stop = asyncio.Event()
+    canary = asyncio.create_task(default_pool_latency(stop))
+    rate, latencies, shed = await drive(attempt, concurrency, seconds)
+    stop.set()
+    return rate, latencies, shed, await canary
+
+
+async def run_against_server(url: str, email: str, password: str, concurrency: int, seconds: float):
+    import httpx
+
+    statuses = {}
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        async def attempt():
+            response = await client.post("/auth/login", json={"email": email, "password": password})
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            return response.status_code == 200
+
+        rate, latencies, shed = await drive(attempt, concurrency, seconds)
+    return rate, latencies, shed, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64], help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Measurement time per case")
+    parser.add_argument("--url", help="Benchmark POST /auth/login on this server instead of in-process")
+    parser.add_argument("--email", default="bench@example.com")
+    parser.add_argument("--password", default="benchmark")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    if args.url is None:
+        pool = get_password_pool()
+        cost = measure_password_hash_cost()
+        print(f"pool: {pool.max_workers} threads, queue {pool.max_queue}; "
+              f"verify {cost['verify_seconds'] * 1000:.0f} ms, hash {cost['hash_seconds'] * 1000:.0f} ms")
+        print(f"{'clients':>8} {'logins/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'shed':>6} {'sync p99 ms':>12}")
+        for concurrency in args.concurrency:
+            rate, latencies, shed, canary = asyncio.run(run_in_process(concurrency, args.seconds))
+            print(f"{concurrency:>8} {rate:>9.1f} "
+                  f"{statistics.median(latencies) * 1000:>8.0f} {percentile(latencies, 0.99) * 1000:>8.0f} "
+                  f"{shed:>6} {percentile(canary, 0.99) * 1000:>12.2f}")
+        print(f"pool stats: {pool.stats()}")
+        return
+
+    print(f"{'clients':>8} {'logins/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'shed':>6}  statuses")
+    for concurrency in args.concurrency:
+        rate, latencies, shed, statuses = asyncio.run(
+            run_against_server(args.url, args.email, args.password, concurrency, args.seconds)
+        )
+        print(f"{concurrency:>8} {rate:>9.1f} "
+              f"{statistics.median(latencies) * 1000 if latencies else float('nan'):>8.0f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.0f} {shed:>6}  {statuses}")
+
+
+if __name__ == "__main__":
+    main()
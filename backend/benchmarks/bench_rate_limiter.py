@@ -0,0 +1,109 @@
+"""
+Benchmark: rate limiter checks per second by storage, across worker processes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rate_limiter
+    python -m benchmarks.bench_rate_limiter --storages memory shm db --processes 1 4 --strategy sliding-window-counter
+
+Storages:
+    memory  limits' in-process storage (each worker counts on its own)
+    shm     SharedMemoryStorage on a temporary file
+    db      DatabaseStorage on DATABASE_URL (override with BENCH_DATABASE_URL;
+            needs the rate_limit_counters migration)
+
+Each process calls limiter.hit() on --keys distinct clients for --seconds.
+After that, every process hits one shared key with a limit of --limit; a
+storage is correct across processes when the total allowed equals the limit
+(memory allows processes x limit).
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+if os.getenv("BENCH_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+import middleware.rate_limit_storage  # noqa: F401  registers shm:// and db://
+
+
+def storage_uri(name: str, shm_path: str) -> str:
+    return {"memory": "memory://", "shm": f"shm://{shm_path}", "db": "db://"}[name]
+
+
+def worker(uri: str, strategy: str, keys: int, seconds: float, limit: int, start, results) -> None:
+    if uri.startswith("db"):
+        from dependencies.database import engine
+
+        # Don't share the parent's pooled connections
+        engine.dispose(close=False)
+    limiter = STRATEGIES[strategy](storage_from_string(uri))
+    generous = parse("1000000/hour")
+    clients = [f"client:{os.getpid()}:{i}" for i in range(keys)]
+
+    start.wait()
+    checks = 0
+    began = time.perf_counter()
+    deadline = began + seconds
+    while time.perf_counter() < deadline:
+        limiter.hit(generous, random.choice(clients))
+        checks += 1
+    elapsed = time.perf_counter() - began
+
+    strict = parse(f"{limit}/hour")
+    allowed = sum(limiter.hit(strict, "shared") for _ in range(limit))
+    results.put((checks, elapsed, allowed))
+
+
+def run(uri: str, strategy: str, processes: int, keys: int, seconds: float, limit: int):
+    """(checks/s over all processes, total allowed on the shared key)"""
+    storage_from_string(uri).reset()
+    context = multiprocessing.get_context("fork")
+    start = context.Barrier(processes)
+    results = context.Queue()
+    workers = [
+        context.Process(target=worker, args=(uri, strategy, keys, seconds, limit, start, results))
+        for _ in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    outcomes = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    rate = sum(checks for checks, _, _ in outcomes) / max(elapsed for _, elapsed, _ in outcomes)
+    return rate, sum(allowed for _, _, allowed in outcomes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storages", nargs="+", choices=["memory", "shm", "db"], default=["memory", "shm"])
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="fixed-window")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--keys", type=int, default=1000, help="Distinct clients per process")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Measurement time per case")
+    parser.add_argument("--limit", type=int, default=100, help="Limit on the shared key")
+    args = parser.parse_args()
+
+    shm_path = os.path.join(tempfile.mkdtemp(), "rate-limits")
+    print(f"strategy: {args.strategy}")
+    print(f"{'storage':<8} {'procs':>5} {'checks/s':>10} {'allowed':>8} {'limit':>6}")
+    try:
+        for name in args.storages:
+            for processes in args.processes:
+                rate, allowed = run(
+                    storage_uri(name, shm_path), args.strategy, processes, args.keys, args.seconds, args.limit
+                )
+                print(f"{name:<8} {processes:>5} {rate:>10,.0f} {allowed:>8} {args.limit:>6}")
+    finally:
+        if os.path.exists(shm_path):
+            os.remove(shm_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Load test: GET /biomarkers/summary throughput with the sync and async data paths.
+
+Usage (from backend/):
+    python -m benchmarks.bench_summary_load
+    python -m benchmarks.bench_summary_load --modes async --concurrency 200 --seconds 5
+    python -m benchmarks.bench_summary_load --cached
+
+For each mode a uvicorn server is started on --port with DB_ASYNC=false
+(sync routes in the threadpool, psycopg2) or DB_ASYNC=true (async routes,
+asyncpg), against DATABASE_URL (override with BENCH_DATABASE_URL). A throwaway
+user with one analysed upload is created first and removed afterwards.
+
+The summary cache is disabled in the servers (SUMMARY_CACHE_TTL_SECONDS=0)
+so every request reaches the database; --cached keeps it. Pool sizes come
+from the DB_POOL_* settings in the environment.
+
+Reports requests/s, latency percentiles and non-200 responses (e.g. 500s
+from "QueuePool limit" timeouts) per concurrency level. The load generator
+shares the host with the server, so compare modes rather than absolute rates.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+if os.getenv("BENCH_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+
+import httpx
+
+CSV = b"""date,cholesterol_total,hdl,ldl,triglycerides,glucose,crp,vitamin_d
+2024-01-01,200,50,120,150,95,0.8,35
+2024-06-01,190,55,110,90,105,2.1,45
+2025-01-01,230,40,170,220,130,3.5,15
+"""
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def create_bench_user() -> dict:
+    from dependencies.database import SessionLocal
+    from models import User
+    from auth_strategies import get_jwt_service
+
+    db = SessionLocal()
+    try:
+        user = User(email=f"bench-{uuid.uuid4().hex}@example.com", full_name="Bench", password_hash="x", is_active=1)
+        db.add(user)
+        db.commit()
+        token = get_jwt_service().create_access_token({"sub": str(user.id), "role": user.role.value})
+        return {"id": user.id, "headers": {"Authorization": f"Bearer {token}"}}
+    finally:
+        db.close()
+
+
+def delete_bench_user(user_id: int) -> None:
+    from dependencies.database import SessionLocal
+    from models import User
+
+    db = SessionLocal()
+    try:
+        # Cascades to the user's uploads
+        db.delete(db.get(User, user_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def start_server(mode: str, port: int, cached: bool) -> subprocess.Popen:
+    env = dict(os.environ, DB_ASYNC="true" if mode == "async" else "false", LOG_LEVEL="WARNING")
+    if not cached:
+        env["SUMMARY_CACHE_TTL_SECONDS"] = "0"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"{mode} server did not start on port {port}")
+
+
+async def drive(url: str, headers: dict, concurrency: int, seconds: float):
+    """(requests/s, latencies of 200s, status counts) for concurrency clients over seconds"""
+    latencies = []
+    statuses = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=120) as client:
+        start = time.perf_counter()
+        deadline = start + seconds
+
+        async def client_loop():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    status = (await client.get("/biomarkers/summary")).status_code
+                except httpx.TransportError:
+                    status = "error"
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        # In-flight requests finish after the deadline, so rate over the whole run
+        return len(latencies) / (time.perf_counter() - start), latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000], help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measurement time per case")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cached", action="store_true", help="Keep the summary cache enabled in the servers")
+    args = parser.parse_args()
+
+    user = create_bench_user()
+    results = []
+    try:
+        for mode in args.modes:
+            server = start_server(mode, args.port, args.cached)
+            url = f"http://127.0.0.1:{args.port}"
+            try:
+                upload = httpx.post(
+                    f"{url}/biomarkers/upload", headers=user["headers"],
+                    files={"file": (f"{mode}.csv", CSV, "text/csv")}, timeout=60
+                )
+                upload.raise_for_status()
+                for concurrency in args.concurrency:
+                    rate, latencies, statuses = asyncio.run(drive(url, user["headers"], concurrency, args.seconds))
+                    results.append((mode, concurrency, rate, latencies, statuses))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+    finally:
+        delete_bench_user(user["id"])
+
+    print(f"{'mode':<6} {'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}  statuses")
+    for mode, concurrency, rate, latencies, statuses in results:
+        print(f"{mode:<6} {concurrency:>8} {rate:>8.1f} "
+              f"{statistics.median(latencies) * 1000 if latencies else float('nan'):>8.0f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.0f}  {statuses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,50 @@ from config.jwt import (
     SECRET_KEY,
     JWT_ALGORITHM,
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    AUTH_STATELESS,
+    AUTH_STATELESS_TOKEN_EXPIRE_MINUTES,
     RSA_PRIVATE_KEY_PATH,
     RSA_PUBLIC_KEY_PATH,
+    RSA_KEYSET_DIR,
+    RSA_KEYSET_RELOAD_SECONDS,
+    JWT_TOKEN_CACHE_MAX_ENTRIES,
+    JWT_TOKEN_CACHE_MAX_TTL_SECONDS,
 )
-from config.database import DATABASE_URL
+from config.database import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_ASYNC,
+    ASYNC_DATABASE_URL,
+)
+from config.upload import (
+    UPLOAD_CHUNK_ROWS,
+    UPLOAD_STORAGE_DIR,
+    UPLOAD_WORKER_THREADS,
+    UPLOAD_WORKER_POLL_SECONDS,
+    UPLOAD_JOB_TIMEOUT_SECONDS,
+    UPLOAD_JOB_HEARTBEAT_SECONDS,
+    UPLOAD_JOB_MAX_ATTEMPTS,
+    UPLOAD_READ_BYTES,
+    UPLOAD_PARSE_PROCESSES,
+    UPLOAD_DB_THREADS,
+    UPLOAD_BATCH_MAX_FILES,
+    UPLOAD_PAGE_DEFAULT_LIMIT,
+    UPLOAD_PAGE_MAX_LIMIT,
+)
+from config.cache import (
+    SUMMARY_CACHE_TTL_SECONDS,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    USER_CACHE_TTL_SECONDS,
+    USER_CACHE_MAX_ENTRIES,
+)
+from config.export import EXPORT_BATCH_ROWS
+from config.password import PASSWORD_HASH_THREADS, PASSWORD_HASH_MAX_QUEUE
+from config.logging import LOG_LEVEL, LOG_DIR, LOG_DEBUG_SAMPLE_RATE
+from config.rate_limit import RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY
 from config.settings import load_environment
 
 # Load environment variables
@@ -21,7 +61,45 @@ __all__ = [
     "SECRET_KEY",
     "JWT_ALGORITHM",
     "ACCESS_TOKEN_EXPIRE_MINUTES",
+    "AUTH_STATELESS",
+    "AUTH_STATELESS_TOKEN_EXPIRE_MINUTES",
     "RSA_PRIVATE_KEY_PATH",
     "RSA_PUBLIC_KEY_PATH",
+    "RSA_KEYSET_DIR",
+    "RSA_KEYSET_RELOAD_SECONDS",
+    "JWT_TOKEN_CACHE_MAX_ENTRIES",
+    "JWT_TOKEN_CACHE_MAX_TTL_SECONDS",
     "DATABASE_URL",
+    "DB_POOL_SIZE",
+    "DB_MAX_OVERFLOW",
+    "DB_POOL_TIMEOUT",
+    "DB_POOL_RECYCLE",
+    "DB_POOL_PRE_PING",
+    "DB_ASYNC",
+    "ASYNC_DATABASE_URL",
+    "UPLOAD_CHUNK_ROWS",
+    "UPLOAD_STORAGE_DIR",
+    "UPLOAD_WORKER_THREADS",
+    "UPLOAD_WORKER_POLL_SECONDS",
+    "UPLOAD_JOB_TIMEOUT_SECONDS",
+    "UPLOAD_JOB_HEARTBEAT_SECONDS",
+    "UPLOAD_JOB_MAX_ATTEMPTS",
+    "UPLOAD_READ_BYTES",
+    "UPLOAD_PARSE_PROCESSES",
+    "UPLOAD_DB_THREADS",
+    "UPLOAD_BATCH_MAX_FILES",
+    "UPLOAD_PAGE_DEFAULT_LIMIT",
+    "UPLOAD_PAGE_MAX_LIMIT",
+    "SUMMARY_CACHE_TTL_SECONDS",
+    "SUMMARY_CACHE_MAX_ENTRIES",
+    "USER_CACHE_TTL_SECONDS",
+    "USER_CACHE_MAX_ENTRIES",
+    "EXPORT_BATCH_ROWS",
+    "PASSWORD_HASH_THREADS",
+    "PASSWORD_HASH_MAX_QUEUE",
+    "LOG_LEVEL",
+    "LOG_DIR",
+    "LOG_DEBUG_SAMPLE_RATE",
+    "RATE_LIMIT_STORAGE_URI",
+    "RATE_LIMIT_STRATEGY",
 ]
\ No newline at end of file
@@ -0,0 +1,4 @@
+import os
+
+# Data exports
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "5000"))  # rows fetched from the server-side cursor and encoded per chunk
@@ -5,6 +5,17 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production-2024"
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))  # 24 hours
 
+# Stateless authorization: permission checks use the token's sub/role claims instead of the users table.
+# Role changes and logouts are enforced through the in-process denylist, so keep these tokens short-lived.
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() in ("1", "true", "yes")
+AUTH_STATELESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("AUTH_STATELESS_TOKEN_EXPIRE_MINUTES", "15"))
+
 # RSA Keys (only needed if using RS256)
 RSA_PRIVATE_KEY_PATH = os.getenv("RSA_PRIVATE_KEY_PATH", "keys/private_key.pem")
-RSA_PUBLIC_KEY_PATH = os.getenv("RSA_PUBLIC_KEY_PATH", "keys/public_key.pem")
\ No newline at end of file
+RSA_PUBLIC_KEY_PATH = os.getenv("RSA_PUBLIC_KEY_PATH", "keys/public_key.pem")
+# RSA keyset for rotation: <kid>.public.pem / <kid>.private.pem files (overrides the two paths above when set)
+RSA_KEYSET_DIR = os.getenv("RSA_KEYSET_DIR") or None
+RSA_KEYSET_RELOAD_SECONDS = float(os.getenv("RSA_KEYSET_RELOAD_SECONDS", "60"))  # how often the directory is checked for changes
+# Verified-token cache (skips signature checks for repeat bearer tokens)
+JWT_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("JWT_TOKEN_CACHE_MAX_ENTRIES", "10000"))  # 0 disables the cache
+JWT_TOKEN_CACHE_MAX_TTL_SECONDS = float(os.getenv("JWT_TOKEN_CACHE_MAX_TTL_SECONDS", "300"))  # entries also expire at the token's exp
@@ -0,0 +1,6 @@
+import os
+
+# Logging (records are queued on the request path and written by a background listener thread)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_DIR = os.getenv("LOG_DIR", "logs")  # app_<date>.log is written here; empty disables the file
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))  # fraction of hot-path debug records kept
@@ -0,0 +1,5 @@
+import os
+
+# Password hashing (bcrypt) runs on its own bounded pool so login bursts can't starve other routes
+PASSWORD_HASH_THREADS = int(os.getenv("PASSWORD_HASH_THREADS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))  # waiting hashes beyond this get a 503
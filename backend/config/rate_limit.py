@@ -0,0 +1,12 @@
+import os
+
+# Rate limiter storage (shared by all workers unless memory://)
+#   memory://                               per process
+#   shm:///dev/shm/<name>?slots=N&stripes=M  shared by the processes on one host
+#   db://?pool_size=2                       the application database, shared by all nodes
+#                                           (own pool; a blocking query per hit, also on async routes)
+#   redis://...                             any other storage supported by `limits`
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+# fixed-window or sliding-window-counter (every storage above); moving-window
+# only works with memory:// and redis://, not with shm:// or db://
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "fixed-window")
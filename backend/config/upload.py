@@ -0,0 +1,24 @@
+import os
+
+# Upload ingestion configuration
+UPLOAD_CHUNK_ROWS = int(os.getenv("UPLOAD_CHUNK_ROWS", "50000"))  # rows parsed and inserted per chunk
+
+# Asynchronous upload processing
+UPLOAD_STORAGE_DIR = os.getenv("UPLOAD_STORAGE_DIR", "uploads")  # where queued CSVs are kept until processed
+UPLOAD_WORKER_THREADS = int(os.getenv("UPLOAD_WORKER_THREADS", "0"))  # in-process queue workers (0 = external CLI worker only)
+UPLOAD_WORKER_POLL_SECONDS = float(os.getenv("UPLOAD_WORKER_POLL_SECONDS", "2"))
+UPLOAD_JOB_TIMEOUT_SECONDS = int(os.getenv("UPLOAD_JOB_TIMEOUT_SECONDS", "900"))  # running jobs without a heartbeat for this long are reclaimed
+UPLOAD_JOB_HEARTBEAT_SECONDS = float(os.getenv("UPLOAD_JOB_HEARTBEAT_SECONDS", "30"))  # keep well below the timeout
+UPLOAD_JOB_MAX_ATTEMPTS = int(os.getenv("UPLOAD_JOB_MAX_ATTEMPTS", "3"))
+
+# Upload pipeline executors (keep blocking work off the event loop)
+UPLOAD_READ_BYTES = int(os.getenv("UPLOAD_READ_BYTES", str(1024 * 1024)))  # bytes read from the request per await
+UPLOAD_PARSE_PROCESSES = int(os.getenv("UPLOAD_PARSE_PROCESSES", str(min(4, os.cpu_count() or 1))))  # CSV parsing + analysis
+UPLOAD_DB_THREADS = int(os.getenv("UPLOAD_DB_THREADS", "8"))  # blocking database writes
+
+# Batch uploads
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "100"))  # CSVs per request (including ZIP members)
+
+# Upload listings (keyset pagination)
+UPLOAD_PAGE_DEFAULT_LIMIT = int(os.getenv("UPLOAD_PAGE_DEFAULT_LIMIT", "50"))
+UPLOAD_PAGE_MAX_LIMIT = int(os.getenv("UPLOAD_PAGE_MAX_LIMIT", "500"))
@@ -1,26 +1,58 @@
 from dependencies.database import get_db, engine, SessionLocal
-from dependencies.auth import get_current_user, get_current_admin_user, security
+from dependencies.async_database import get_async_db, get_async_engine, AsyncSessionLocal, dispose_async_engine
+from dependencies.auth import (
+    Principal,
+    UserSnapshot,
+    get_token_payload,
+    get_token_payload_async,
+    get_current_user,
+    get_current_user_async,
+    get_current_principal,
+    get_current_principal_async,
+    get_current_admin_user,
+    security,
+)
 from dependencies.permissions import (
     get_permission_checker,
+    get_permission_checker_async,
     require_permission,
     require_action_on_resource,
-    require_admin
+    require_admin,
+    require_admin_async,
 )
+from dependencies.pagination import PageParams, get_page_params
 
 __all__ = [
     # Database
     "get_db",
     "engine",
     "SessionLocal",
+    "get_async_db",
+    "get_async_engine",
+    "AsyncSessionLocal",
+    "dispose_async_engine",
     
     # Auth
+    "Principal",
+    "UserSnapshot",
+    "get_token_payload",
+    "get_token_payload_async",
     "get_current_user",
+    "get_current_user_async",
+    "get_current_principal",
+    "get_current_principal_async",
     "get_current_admin_user",
     "security",
     
     # Permissions
     "get_permission_checker",
+    "get_permission_checker_async",
     "require_permission",
     "require_action_on_resource",
     "require_admin",
+    "require_admin_async",
+    
+    # Pagination
+    "PageParams",
+    "get_page_params",
 ]
\ No newline at end of file
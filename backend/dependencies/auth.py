@@ -1,56 +1,214 @@
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain
+from typing import Any, Dict, Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event, inspect, select
 from sqlalchemy.orm import Session
 
-from dependencies.database import get_db
+from dependencies.database import SessionLocal
+from dependencies.async_database import AsyncSessionLocal
 from auth_strategies import get_jwt_service
+from config import AUTH_STATELESS
 from models import User, UserRole
+from utils.cache import user_cache
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Dependency to get current authenticated user"""
-    token = credentials.credentials
-    
+@dataclass(frozen=True)
+class Principal:
+    """Who is making the request: all that permission checks and ownership tests need"""
+    id: int
+    role: UserRole
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Detached, read-only copy of the User columns handlers read from current_user"""
+    id: int
+    email: str
+    full_name: str
+    role: UserRole
+    is_active: int
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=user.is_active,
+            created_at=user.created_at
+        )
+
+
+def _load_user_snapshot(user_id: int) -> Optional[UserSnapshot]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        return UserSnapshot.from_user(user) if user is not None else None
+    finally:
+        db.close()
+
+
+async def _load_user_snapshot_async(user_id: int) -> Optional[UserSnapshot]:
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+        return UserSnapshot.from_user(user) if user is not None else None
+
+
+def _changes_authorization(user: User) -> bool:
+    attrs = inspect(user).attrs
+    return any(attrs[name].history.has_changes() for name in ("role", "is_active"))
+
+
+# Any committed change to a users row (profile, role, delete) drops its snapshot;
+# role/activation changes and deletes also revoke the user's existing tokens.
+# Ids are also invalidated at flush so a concurrent cache miss can't store the old row.
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    users = [obj for obj in chain(session.dirty, session.deleted) if isinstance(obj, User)]
+    if users:
+        user_cache.invalidate(*(user.id for user in users))
+        session.info.setdefault("changed_user_ids", set()).update(user.id for user in users)
+        session.info.setdefault("revoked_user_ids", set()).update(
+            user.id for user in users if user in session.deleted or _changes_authorization(user)
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    user_ids = session.info.pop("changed_user_ids", None)
+    if user_ids:
+        user_cache.invalidate(*user_ids)
+    for user_id in session.info.pop("revoked_user_ids", ()):
+        get_jwt_service().revoke_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
+    session.info.pop("revoked_user_ids", None)
+
+
+def _verified_payload(token: str) -> Dict[str, Any]:
     jwt_svc = get_jwt_service()
-    
+
     payload = jwt_svc.decode_token(token)
-    print(token)
 
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
-    
-    user_id = payload.get("sub")
-    if user_id is None:
+
+    if payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload"
         )
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
+
+    return payload
+
+
+def get_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
+    """Dependency to get the verified, unrevoked claims of the bearer token"""
+    return _verified_payload(credentials.credentials)
+
+
+async def get_token_payload_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
+    """get_token_payload() on the event loop (decoding is CPU-only and cached)"""
+    return _verified_payload(credentials.credentials)
+
+
+def _check_user(user: Optional[UserSnapshot]) -> UserSnapshot:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    
     return user
 
 
+def _resolve_user(payload: Dict[str, Any]) -> UserSnapshot:
+    user_id = int(payload["sub"])
+    return _check_user(user_cache.get_or_load(user_id, lambda: _load_user_snapshot(user_id)))
+
+
+async def _resolve_user_async(payload: Dict[str, Any]) -> UserSnapshot:
+    user_id = int(payload["sub"])
+    return _check_user(await user_cache.get_or_load_async(user_id, lambda: _load_user_snapshot_async(user_id)))
+
+
+def _principal_from_claims(payload: Dict[str, Any]) -> Principal:
+    try:
+        return Principal(id=int(payload["sub"]), role=UserRole(payload["role"]))
+    except (KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+
+
+def get_current_user(
+    payload: Dict[str, Any] = Depends(get_token_payload)
+) -> UserSnapshot:
+    """
+    Dependency to get current authenticated user.
+    Returns a cached UserSnapshot; the database is only queried on a cache miss.
+    """
+    return _resolve_user(payload)
+
+
+def get_current_principal(
+    payload: Dict[str, Any] = Depends(get_token_payload)
+) -> Principal:
+    """
+    Dependency to get the id and role of the caller.
+    With AUTH_STATELESS they come straight from the token's sub/role claims
+    (no database access); otherwise from the current user.
+    """
+    if not AUTH_STATELESS:
+        user = _resolve_user(payload)
+        return Principal(id=user.id, role=user.role)
+
+    return _principal_from_claims(payload)
+
+
+async def get_current_user_async(
+    payload: Dict[str, Any] = Depends(get_token_payload_async)
+) -> UserSnapshot:
+    """get_current_user() for async routes: a cache miss loads through an AsyncSession"""
+    return await _resolve_user_async(payload)
+
+
+async def get_current_principal_async(
+    payload: Dict[str, Any] = Depends(get_token_payload_async)
+) -> Principal:
+    """get_current_principal() for async routes"""
+    if not AUTH_STATELESS:
+        user = await _resolve_user_async(payload)
+        return Principal(id=user.id, role=user.role)
+
+    return _principal_from_claims(payload)
+
+
 def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user)
+) -> UserSnapshot:
     """Dependency to ensure current user is admin"""
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return current_user
\ No newline at end of file
+    return current_user
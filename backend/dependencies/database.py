@@ -1,16 +1,120 @@
-from sqlalchemy import create_engine
+from bisect import bisect_left
+from typing import Any, Dict
+import threading
+import time
+
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+)
+
+
+class _PoolTelemetry:
+    """
+    Queue pool mixin that records how long checkouts wait (including
+    connecting and the pre-ping), how often overflow connections are opened
+    and how many checkouts time out with "QueuePool limit ... reached".
+
+    Only public pool API is used: connect() is wrapped for timing, and new
+    connections are seen through the "connect" pool event, counted as
+    overflow when overflow() shows the pool past pool_size.
+    """
+
+    # Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is unbounded
+    WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._wait_counts = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._overflow_opened = 0
+        self._timeouts = 0
+        self._peak_checked_out = 0
+        event.listen(self, "connect", self._on_connect)
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        bucket = bisect_left(self.WAIT_BUCKETS_MS, waited * 1000)
+        with self._stats_lock:
+            self._wait_counts[bucket] += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._peak_checked_out = max(self._peak_checked_out, self.checkedout())
+        return connection
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        # overflow() counts past pool_size once every pooled connection exists
+        if self.overflow() > 0:
+            with self._stats_lock:
+                self._overflow_opened += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            checkouts = sum(self._wait_counts)
+            labels = [f"<={bound}ms" for bound in self.WAIT_BUCKETS_MS] + [f">{self.WAIT_BUCKETS_MS[-1]}ms"]
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "timeout_seconds": self.timeout(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "peak_checked_out": self._peak_checked_out,
+                "checkouts": checkouts,
+                "overflow_opened": self._overflow_opened,
+                "timeouts": self._timeouts,
+                "wait_ms": {
+                    "mean": round(self._wait_total / checkouts * 1000, 3) if checkouts else None,
+                    "max": round(self._wait_max * 1000, 3),
+                    "histogram": dict(zip(labels, self._wait_counts)),
+                },
+            }
+
+
+class InstrumentedQueuePool(_PoolTelemetry, QueuePool):
+    """QueuePool with checkout telemetry (see stats())"""
+
+
+class InstrumentedAsyncQueuePool(_PoolTelemetry, AsyncAdaptedQueuePool):
+    """The async engine's queue pool with checkout telemetry (see stats())"""
 
-from config import DATABASE_URL
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def get_db():
-    """Dependency to get database session"""
+    """
+    Dependency to get database session.
+    The session only checks a connection out of the pool when it first runs a
+    statement, and returns it on commit/rollback/close.
+    """
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+
+from config import UPLOAD_PAGE_DEFAULT_LIMIT, UPLOAD_PAGE_MAX_LIMIT
+from utils.pagination import Cursor, decode_cursor
+
+
+@dataclass
+class PageParams:
+    limit: int
+    after: Optional[Cursor]
+
+
+def get_page_params(
+    limit: int = Query(UPLOAD_PAGE_DEFAULT_LIMIT, ge=1, le=UPLOAD_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+) -> PageParams:
+    """Dependency to parse keyset pagination parameters"""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return PageParams(limit=limit, after=after)
@@ -1,15 +1,22 @@
 from fastapi import Depends, HTTPException, status
 
-from dependencies.auth import get_current_user
+from dependencies.auth import Principal, get_current_principal, get_current_principal_async
 from rbac import PermissionChecker, Permission, Action, Resource
 from models import User
 
 
 def get_permission_checker(
-    current_user: User = Depends(get_current_user)
+    principal: Principal = Depends(get_current_principal)
 ) -> PermissionChecker:
-    """Dependency to get permission checker for current user"""
-    return PermissionChecker(current_user)
+    """Dependency to get permission checker for current user (from token claims in stateless mode)"""
+    return PermissionChecker(principal)
+
+
+async def get_permission_checker_async(
+    principal: Principal = Depends(get_current_principal_async)
+) -> PermissionChecker:
+    """get_permission_checker() for async routes"""
+    return PermissionChecker(principal)
 
 
 def require_permission(permission: Permission):
@@ -57,11 +64,25 @@ def require_admin():
     def admin_dependency(
         checker: PermissionChecker = Depends(get_permission_checker)
     ) -> PermissionChecker:
-        if not checker.is_admin():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access required"
-            )
-        return checker
+        return _require_admin_role(checker)
+    
+    return admin_dependency
+
+
+def _require_admin_role(checker: PermissionChecker) -> PermissionChecker:
+    if not checker.is_admin():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return checker
+
+
+def require_admin_async():
+    """require_admin() for async routes"""
+    async def admin_dependency(
+        checker: PermissionChecker = Depends(get_permission_checker_async)
+    ) -> PermissionChecker:
+        return _require_admin_role(checker)
     
-    return admin_dependency
\ No newline at end of file
+    return admin_dependency
@@ -1,34 +1,32 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+import asyncio
 import logging
 import time
-from datetime import datetime
-import os
 from models import Base
-from dependencies import engine, get_db
+from dependencies import engine, get_db, dispose_async_engine
 from routes import auth, admin, protected, biomarkers
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from middleware.rate_limiter import limiter, rate_limit_exceeded_handler
-
-# Create logs directory if it doesn't exist
-if not os.path.exists('logs'):
-    os.makedirs('logs')
-
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,  # Set to DEBUG level
-    format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-    handlers=[
-        # File handler - writes to file with date
-        logging.FileHandler(f'logs/app_{datetime.now().strftime("%Y%m%d")}.log'),
-        # Console handler - prints to terminal
-        logging.StreamHandler()
-    ]
+from middleware.correlation import CorrelationIdMiddleware
+from workers import UploadWorkerPool
+from config import UPLOAD_WORKER_THREADS
+from utils import (
+    shutdown_executors,
+    run_in_password_pool,
+    measure_password_hash_cost,
+    configure_logging,
+    precreate_biomarker_partitions,
 )
 
+# Configure logging: records are queued here and written by a background listener thread
+configure_logging()
+
 # Create logger instance
 # logger = logging.getLogger(__name__)
 
@@ -43,8 +41,30 @@ logging.basicConfig(
 # Create all tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # bcrypt cost on this host, for login capacity planning (see GET /admin/password-hashing)
+    app.state.password_hash_cost = await run_in_password_pool(measure_password_hash_cost)
+    logging.getLogger(__name__).info("Password hashing cost: %s", app.state.password_hash_cost)
+    
+    # So the first upload of a new year doesn't have to attach its partition
+    try:
+        await asyncio.to_thread(precreate_biomarker_partitions, engine)
+    except SQLAlchemyError:
+        logging.getLogger(__name__).warning("Could not pre-create biomarker_data partitions", exc_info=True)
+    
+    # Drain the async upload queue in-process when configured
+    worker_pool = UploadWorkerPool(UPLOAD_WORKER_THREADS).start() if UPLOAD_WORKER_THREADS > 0 else None
+    yield
+    if worker_pool:
+        worker_pool.stop(timeout=5)
+    shutdown_executors()
+    await dispose_async_engine()
+
+
 # FastAPI App
-app = FastAPI(title="Longevity Biomarker API", version="1.0.0")
+app = FastAPI(title="Longevity Biomarker API", version="1.0.0", lifespan=lifespan)
 
 # Add rate limiter to app state
 app.state.limiter = limiter
@@ -60,8 +80,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+# Correlation id for every request's log records (outermost, so it covers all middleware)
+app.add_middleware(CorrelationIdMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(admin.router)
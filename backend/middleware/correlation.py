@@ -0,0 +1,42 @@
+# middleware/correlation.py
+import re
+import uuid
+
+from utils.log_config import request_id
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_HEADER_KEY = REQUEST_ID_HEADER.lower().encode()
+# Accept caller-supplied ids only if they are short and log-safe
+_VALID_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._\-]{1,64}$")
+
+
+class CorrelationIdMiddleware:
+    """
+    Give every request a correlation id for its log records.
+
+    Reuses a well-formed incoming X-Request-ID (so ids follow a request across
+    services), otherwise generates one, and echoes it in the response headers.
+    Plain ASGI middleware: no per-request task or body wrapping.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(_HEADER_KEY)
+        value = incoming if incoming and _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex.encode()
+        token = request_id.set(value.decode())
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (_HEADER_KEY, value)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,379 @@
+# middleware/rate_limit_storage.py
+"""
+Rate limit storages shared between worker processes (registered with `limits`
+on import, so slowapi can select them through storage_uri).
+
+shm:///dev/shm/<name>?slots=65536&stripes=64
+    Counter table in a memory-mapped file, shared by every process on the
+    host. Fixed size: memory does not grow with the number of clients.
+db://?pool_size=2
+    Counters in the application database (rate_limit_counters), shared by
+    every node that uses it. Every hit is a blocking round trip, made on the
+    event loop for async routes; prefer shm:// or redis:// where latency
+    matters.
+
+Both support the fixed-window and sliding-window-counter strategies.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import urllib.parse
+
+from limits.storage import Storage, SlidingWindowCounterSupport
+from limits.storage.base import TimestampedSlidingWindow
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class _CounterSlidingWindow(TimestampedSlidingWindow):
+    """Sliding-window-counter support on top of incr/decr/get/clear (same algorithm as limits' MemoryStorage)"""
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count, previous_ttl, current_count, _ = self._sliding_window_info(previous_key, current_key, expiry, now)
+        if int(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+            return False
+        # Keep the current window around for its successor's weighting
+        current_count = self.incr(current_key, 2 * expiry, amount)
+        if int(previous_count * previous_ttl / expiry + current_count) > limit:
+            # A concurrent hit took the last entry
+            self.decr(current_key, amount)
+            return False
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window_info(previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        for window_key in self.sliding_window_keys(key, expiry, time.time()):
+            self.clear(window_key)
+
+    def _sliding_window_info(self, previous_key: str, current_key: str, expiry: int, now: float):
+        previous_count = self.get(previous_key)
+        current_count = self.get(current_key)
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+
+class SharedMemoryStorage(_CounterSlidingWindow, Storage, SlidingWindowCounterSupport):
+    """
+    Fixed-size hash table of (key hash, count, expiry) slots in an mmap'd file.
+
+    The table is split into stripes; a key hashes to one stripe and is
+    linearly probed within it, so one stripe lock (a thread lock plus an
+    fcntl byte-range lock for other processes) covers each update. Expired
+    slots are reused in place, stripes are compacted round-robin every
+    sweep_interval seconds, and a full stripe evicts its soonest-expiring
+    entry.
+    """
+
+    STORAGE_SCHEME = ["shm"]
+
+    _MAGIC = b"LSARL001"
+    _HEADER = struct.Struct("<8sII")
+    _HEADER_SIZE = 64
+    _SLOT = struct.Struct("<Qqd")  # key hash (0 = never used), count, expires at (epoch seconds)
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        wrap_exceptions: bool = False,
+        slots: int = 65536,
+        stripes: int = 64,
+        sweep_interval: float = 1.0,
+        **options
+    ):
+        parsed = urllib.parse.urlparse(uri or "shm:///dev/shm/longevity-rate-limits")
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        self.path = parsed.path
+        self.slots = int(query.get("slots", slots))
+        self.stripes = int(query.get("stripes", stripes))
+        self.sweep_interval = float(query.get("sweep_interval", sweep_interval))
+        if self.slots % self.stripes:
+            raise ValueError("slots must be a multiple of stripes")
+        self.stripe_slots = self.slots // self.stripes
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        size = self._HEADER_SIZE + self.slots * self._SLOT.size
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, self._HEADER.pack(self._MAGIC, self.slots, self.stripes), 0)
+            magic, slots, stripes = self._HEADER.unpack(os.pread(self._fd, self._HEADER.size, 0))
+            if (magic, slots, stripes) != (self._MAGIC, self.slots, self.stripes):
+                raise ValueError(
+                    f"{self.path} holds a different rate limit table "
+                    f"(slots={slots}, stripes={stripes}); remove it or match its geometry"
+                )
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
+        self._next_sweep = 0.0
+        self._sweep_stripe = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ValueError)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    @contextmanager
+    def _stripe_lock(self, stripe: int) -> Iterator[None]:
+        # fcntl locks belong to the process, so threads also need their own lock
+        with self._locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+
+    def _offset(self, index: int) -> int:
+        return self._HEADER_SIZE + index * self._SLOT.size
+
+    def _find(self, key_hash: int, stripe: int, now: float) -> Tuple[Optional[int], Optional[int]]:
+        """(slot holding key_hash or None, first slot a new entry may take or None); caller holds the stripe lock"""
+        base = stripe * self.stripe_slots
+        start = (key_hash // self.stripes) % self.stripe_slots
+        reusable = None
+        for i in range(self.stripe_slots):
+            index = base + (start + i) % self.stripe_slots
+            slot_hash, _, expires_at = self._SLOT.unpack_from(self._map, self._offset(index))
+            if slot_hash == key_hash:
+                return index, None
+            if slot_hash == 0:
+                # End of the probe chain: key_hash is not stored
+                return None, index if reusable is None else reusable
+            if reusable is None and expires_at <= now:
+                reusable = index
+        return None, reusable
+
+    def _soonest_expiring(self, stripe: int) -> int:
+        base = stripe * self.stripe_slots
+        return min(
+            range(base, base + self.stripe_slots),
+            key=lambda index: self._SLOT.unpack_from(self._map, self._offset(index))[2]
+        )
+
+    def _live_entry(self, key: str) -> Tuple[int, float]:
+        key_hash = self._hash(key)
+        stripe = key_hash % self.stripes
+        now = time.time()
+        with self._stripe_lock(stripe):
+            index, _ = self._find(key_hash, stripe, now)
+            if index is None:
+                return 0, now
+            _, count, expires_at = self._SLOT.unpack_from(self._map, self._offset(index))
+        return (count, expires_at) if expires_at > now else (0, now)
+
+    def _sweep(self, stripe: int, now: float) -> None:
+        """Rebuild a stripe without its expired entries, shortening probe chains"""
+        base = stripe * self.stripe_slots
+        with self._stripe_lock(stripe):
+            live: List[Tuple[int, int, float]] = []
+            for index in range(base, base + self.stripe_slots):
+                entry = self._SLOT.unpack_from(self._map, self._offset(index))
+                if entry[0] and entry[2] > now:
+                    live.append(entry)
+            start, end = self._offset(base), self._offset(base + self.stripe_slots)
+            self._map[start:end] = bytes(end - start)
+            for entry in live:
+                _, free = self._find(entry[0], stripe, now)
+                self._SLOT.pack_into(self._map, self._offset(free), *entry)
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        stripe, self._sweep_stripe = self._sweep_stripe, (self._sweep_stripe + 1) % self.stripes
+        self._sweep(stripe, now)
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        key_hash = self._hash(key)
+        stripe = key_hash % self.stripes
+        now = time.time()
+        self._maybe_sweep(now)
+        with self._stripe_lock(stripe):
+            index, free = self._find(key_hash, stripe, now)
+            if index is not None:
+                _, count, expires_at = self._SLOT.unpack_from(self._map, self._offset(index))
+                if expires_at > now:
+                    self._SLOT.pack_into(self._map, self._offset(index), key_hash, count + amount, expires_at)
+                    return count + amount
+            else:
+                index = free if free is not None else self._soonest_expiring(stripe)
+            self._SLOT.pack_into(self._map, self._offset(index), key_hash, amount, now + expiry)
+            return amount
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        key_hash = self._hash(key)
+        stripe = key_hash % self.stripes
+        now = time.time()
+        with self._stripe_lock(stripe):
+            index, _ = self._find(key_hash, stripe, now)
+            if index is None:
+                return 0
+            _, count, expires_at = self._SLOT.unpack_from(self._map, self._offset(index))
+            if expires_at <= now:
+                return 0
+            count = max(count - amount, 0)
+            self._SLOT.pack_into(self._map, self._offset(index), key_hash, count, expires_at)
+            return count
+
+    def get(self, key: str) -> int:
+        return self._live_entry(key)[0]
+
+    def get_expiry(self, key: str) -> float:
+        return self._live_entry(key)[1]
+
+    def clear(self, key: str) -> None:
+        key_hash = self._hash(key)
+        stripe = key_hash % self.stripes
+        with self._stripe_lock(stripe):
+            index, _ = self._find(key_hash, stripe, time.time())
+            if index is not None:
+                # Keep the hash so later entries in the probe chain stay reachable
+                self._SLOT.pack_into(self._map, self._offset(index), key_hash, 0, 0.0)
+
+    def check(self) -> bool:
+        return not self._map.closed
+
+    def reset(self) -> Optional[int]:
+        now = time.time()
+        cleared = 0
+        for stripe in range(self.stripes):
+            base = stripe * self.stripe_slots
+            with self._stripe_lock(stripe):
+                for index in range(base, base + self.stripe_slots):
+                    slot_hash, _, expires_at = self._SLOT.unpack_from(self._map, self._offset(index))
+                    cleared += bool(slot_hash) and expires_at > now
+                start, end = self._offset(base), self._offset(base + self.stripe_slots)
+                self._map[start:end] = bytes(end - start)
+        return cleared
+
+
+class DatabaseStorage(_CounterSlidingWindow, Storage, SlidingWindowCounterSupport):
+    """
+    Counters in the rate_limit_counters table of the application database.
+
+    Each increment is one upsert (a new window starts when the stored one
+    has expired), so every node sharing the database enforces one limit.
+    Expiry uses the database clock; expired rows are deleted at most every
+    sweep_interval seconds per process.
+
+    Uses its own small connection pool (pool_size connections, no overflow)
+    rather than the request pool, so rate limiting neither waits for nor
+    takes connections from request handlers.
+    """
+
+    STORAGE_SCHEME = ["db"]
+
+    _NOW = "extract(epoch from clock_timestamp())"
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        wrap_exceptions: bool = False,
+        sweep_interval: float = 60.0,
+        pool_size: int = 2,
+        **options
+    ):
+        from config import DATABASE_URL, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+
+        query = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(uri or "db://").query))
+        self.sweep_interval = float(query.get("sweep_interval", sweep_interval))
+        self.engine = create_engine(
+            DATABASE_URL,
+            pool_size=int(query.get("pool_size", pool_size)),
+            max_overflow=0,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+        self._next_sweep = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+
+    def _execute(self, statement: str, **params):
+        with self.engine.begin() as connection:
+            return connection.execute(text(statement), params)
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self._execute(f"DELETE FROM rate_limit_counters WHERE expires_at <= {self._NOW}")
+        return self._execute(
+            f"""
+            INSERT INTO rate_limit_counters (key, count, expires_at)
+            VALUES (:key, :amount, {self._NOW} + :expiry)
+            ON CONFLICT (key) DO UPDATE SET
+                count = CASE WHEN rate_limit_counters.expires_at <= {self._NOW}
+                    THEN :amount ELSE rate_limit_counters.count + :amount END,
+                expires_at = CASE WHEN rate_limit_counters.expires_at <= {self._NOW}
+                    THEN {self._NOW} + :expiry ELSE rate_limit_counters.expires_at END
+            RETURNING count
+            """,
+            key=key, amount=amount, expiry=expiry
+        ).scalar_one()
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        count = self._execute(
+            f"""
+            UPDATE rate_limit_counters SET count = greatest(count - :amount, 0)
+            WHERE key = :key AND expires_at > {self._NOW}
+            RETURNING count
+            """,
+            key=key, amount=amount
+        ).scalar()
+        return count or 0
+
+    def get(self, key: str) -> int:
+        count = self._execute(
+            f"SELECT count FROM rate_limit_counters WHERE key = :key AND expires_at > {self._NOW}",
+            key=key
+        ).scalar()
+        return count or 0
+
+    def get_expiry(self, key: str) -> float:
+        return self._execute(
+            f"""
+            SELECT coalesce(
+                (SELECT expires_at FROM rate_limit_counters WHERE key = :key AND expires_at > {self._NOW}),
+                {self._NOW}
+            )
+            """,
+            key=key
+        ).scalar_one()
+
+    def clear(self, key: str) -> None:
+        self._execute("DELETE FROM rate_limit_counters WHERE key = :key", key=key)
+
+    def check(self) -> bool:
+        try:
+            self._execute("SELECT 1")
+            return True
+        except SQLAlchemyError:
+            return False
+
+    def reset(self) -> Optional[int]:
+        return self._execute("DELETE FROM rate_limit_counters").rowcount
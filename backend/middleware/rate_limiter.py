@@ -6,6 +6,10 @@ from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 import logging
 
+from config import RATE_LIMIT_STORAGE_URI, RATE_LIMIT_STRATEGY
+from utils.log_config import log_sampled
+import middleware.rate_limit_storage  # noqa: F401  registers the shm:// and db:// storages
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,7 +22,7 @@ def get_user_identifier(request: Request) -> str:
     try:
         if hasattr(request.state, 'user'):
             user_id = request.state.user.id
-            logger.debug(f"Rate limiting by user ID: {user_id}")
+            log_sampled(logger, logging.DEBUG, "Rate limiting by user ID: %s", user_id)
             return f"user:{user_id}"
     except:
         pass
@@ -30,7 +34,7 @@ def get_user_identifier(request: Request) -> str:
     else:
         ip = request.client.host if request.client else "unknown"
     
-    logger.debug(f"Rate limiting by IP: {ip}")
+    log_sampled(logger, logging.DEBUG, "Rate limiting by IP: %s", ip)
     return f"ip:{ip}"
 
 
@@ -38,7 +42,8 @@ def get_user_identifier(request: Request) -> str:
 limiter = Limiter(
     key_func=get_user_identifier,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://",  # Use in-memory storage (for production, use Redis)
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
     headers_enabled=True,
 )
 
@@ -48,7 +53,7 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Res
     """
     Custom handler for rate limit exceeded errors
     """
-    logger.warning(f"Rate limit exceeded for {get_user_identifier(request)}")
+    logger.warning("Rate limit exceeded for %s", get_user_identifier(request))
     
     return JSONResponse(
         status_code=429,
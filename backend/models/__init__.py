@@ -4,7 +4,9 @@ Base = declarative_base()
 
 # Import all models to make them available when importing from models
 from models.users import User, UserRole
-from models.biomarkers import BiomarkerUpload, BiomarkerData, AnalysisResult
+from models.biomarkers import BiomarkerUpload, BiomarkerData, BiomarkerSeries, AnalysisResult, AnalysisTimepoint
+from models.jobs import UploadJob
+from models.rate_limits import RateLimitCounter
 
 __all__ = [
     "Base",
@@ -12,5 +14,9 @@ __all__ = [
     "UserRole",
     "BiomarkerUpload",
     "BiomarkerData",
+    "BiomarkerSeries",
     "AnalysisResult",
+    "AnalysisTimepoint",
+    "UploadJob",
+    "RateLimitCounter",
 ]
\ No newline at end of file
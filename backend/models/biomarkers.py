@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, DateTime, Float, LargeBinary, ForeignKey, ForeignKeyConstraint, Index
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -9,23 +11,50 @@ class BiomarkerUpload(Base):
     __tablename__ = "biomarker_uploads"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     filename = Column(String, nullable=False)
     upload_date = Column(DateTime, default=datetime.utcnow)
     status = Column(String, default="completed")  # processing/completed/failed
+    content_digest = Column(String(64))  # SHA-256 of the uploaded bytes
     
-    # Relationships
+    # Relationships; deletes cascade in the database (ON DELETE CASCADE) instead of row by row
     user = relationship("User", back_populates="biomarker_uploads")
-    biomarker_data = relationship("BiomarkerData", back_populates="upload", cascade="all, delete-orphan")
-    analysis_results = relationship("AnalysisResult", back_populates="upload", cascade="all, delete-orphan")
+    biomarker_data = relationship(
+        "BiomarkerData", back_populates="upload", cascade="all, delete-orphan", passive_deletes=True
+    )
+    analysis_results = relationship(
+        "AnalysisResult", back_populates="upload", cascade="all, delete-orphan", passive_deletes=True
+    )
+    job = relationship(
+        "UploadJob", back_populates="upload", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
+    analysis_timepoints = relationship(
+        "AnalysisTimepoint", back_populates="upload", cascade="all, delete-orphan", passive_deletes=True
+    )
+    series = relationship(
+        "BiomarkerSeries", back_populates="upload", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
+    
+    __table_args__ = (
+        # One upload per distinct file per user; repeat uploads reuse the existing one
+        Index("ix_biomarker_uploads_user_id_content_digest", "user_id", "content_digest", unique=True),
+        # Keyset pagination of upload listings, newest first (per user and across users)
+        Index("ix_biomarker_uploads_user_id_upload_date_id", user_id, upload_date.desc(), id.desc()),
+        Index("ix_biomarker_uploads_upload_date_id", "upload_date", "id"),
+    )
 
 
 class BiomarkerData(Base):
+    """
+    One dated measurement row. On PostgreSQL the table is range partitioned by
+    date, one partition per year (see utils/partitions.py), so the partition
+    key is part of the primary key.
+    """
     __tablename__ = "biomarker_data"
     
-    id = Column(Integer, primary_key=True, index=True)
-    upload_id = Column(Integer, ForeignKey("biomarker_uploads.id"), nullable=False)
-    date = Column(DateTime, nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    upload_id = Column(Integer, ForeignKey("biomarker_uploads.id", ondelete="CASCADE"), nullable=False)
+    date = Column(DateTime, primary_key=True)
     cholesterol_total = Column(Float)
     hdl = Column(Float)
     ldl = Column(Float)
@@ -36,13 +65,43 @@ class BiomarkerData(Base):
     
     # Relationships
     upload = relationship("BiomarkerUpload", back_populates="biomarker_data")
+    
+    __table_args__ = (
+        # An upload's rows in date order (analysis, latest reading); also serves upload_id lookups
+        Index("ix_biomarker_data_upload_id_date", "upload_id", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+
+class BiomarkerSeries(Base):
+    """
+    An upload's biomarker_data rows packed column-wise for whole-series reads,
+    in (date, id) order: dates as big-endian int64 epoch microseconds, values
+    as big-endian float64 (NULL stored as NaN). Written once at ingest; see
+    utils/series.py. biomarker_data stays the queryable form.
+    """
+    __tablename__ = "biomarker_series"
+    
+    upload_id = Column(Integer, ForeignKey("biomarker_uploads.id", ondelete="CASCADE"), primary_key=True)
+    row_count = Column(Integer, nullable=False)
+    dates = Column(LargeBinary, nullable=False)
+    cholesterol_total = Column(LargeBinary, nullable=False)
+    hdl = Column(LargeBinary, nullable=False)
+    ldl = Column(LargeBinary, nullable=False)
+    triglycerides = Column(LargeBinary, nullable=False)
+    glucose = Column(LargeBinary, nullable=False)
+    crp = Column(LargeBinary, nullable=False)
+    vitamin_d = Column(LargeBinary, nullable=False)
+    
+    # Relationships
+    upload = relationship("BiomarkerUpload", back_populates="series")
 
 
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
     
     id = Column(Integer, primary_key=True, index=True)
-    upload_id = Column(Integer, ForeignKey("biomarker_uploads.id"), nullable=False)
+    upload_id = Column(Integer, ForeignKey("biomarker_uploads.id", ondelete="CASCADE"), nullable=False)
     biological_age = Column(Float)
     chronological_age = Column(Float)
     inflammation_score = Column(Float)
@@ -51,4 +110,37 @@ class AnalysisResult(Base):
     calculated_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    upload = relationship("BiomarkerUpload", back_populates="analysis_results")
\ No newline at end of file
+    upload = relationship("BiomarkerUpload", back_populates="analysis_results")
+    
+    __table_args__ = (
+        Index("ix_analysis_results_upload_id", "upload_id"),
+    )
+
+
+class AnalysisTimepoint(Base):
+    """Scores for one dated biomarker_data row; the per-user biological-age curve"""
+    __tablename__ = "analysis_timepoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Indexed so cascading deletes from uploads and biomarker_data don't scan this table
+    upload_id = Column(Integer, ForeignKey("biomarker_uploads.id", ondelete="CASCADE"), nullable=False, index=True)
+    biomarker_data_id = Column(Integer, nullable=False, index=True)
+    date = Column(DateTime, nullable=False)
+    biological_age = Column(Float)
+    chronological_age = Column(Float)
+    inflammation_score = Column(SmallInteger)
+    metabolic_health_score = Column(SmallInteger)
+    cardiovascular_risk = Column(String(6))  # low/medium/high
+    
+    # Relationships
+    upload = relationship("BiomarkerUpload", back_populates="analysis_timepoints")
+    
+    __table_args__ = (
+        # biomarker_data rows are keyed by (id, date), date being its partition key
+        ForeignKeyConstraint(
+            ["biomarker_data_id", "date"], ["biomarker_data.id", "biomarker_data.date"], ondelete="CASCADE"
+        ),
+        # History reads are a single range scan per user, ordered by date
+        Index("ix_analysis_timepoints_user_id_date", "user_id", "date"),
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from models import Base
+
+
+class UploadJob(Base):
+    __tablename__ = "upload_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(Integer, ForeignKey("biomarker_uploads.id", ondelete="CASCADE"), nullable=False, unique=True)
+    file_path = Column(String, nullable=False)
+    chronological_age = Column(Integer, nullable=False)
+    status = Column(String, default="queued", nullable=False)  # queued/running/completed/failed
+    attempts = Column(Integer, default=0, nullable=False)
+    worker_id = Column(String)
+    records_processed = Column(Integer)
+    error = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)  # refreshed by the owning worker while running
+    finished_at = Column(DateTime)
+    
+    # Relationships
+    upload = relationship("BiomarkerUpload", back_populates="job")
+    
+    __table_args__ = (
+        Index("ix_upload_jobs_status_id", "status", "id"),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, BigInteger, Float
+
+from models import Base
+
+
+class RateLimitCounter(Base):
+    """Rate limit window counters for the db:// limiter storage (see middleware/rate_limit_storage.py)"""
+    __tablename__ = "rate_limit_counters"
+
+    key = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)  # epoch seconds, database clock
+
+    # Counters are disposable: skip WAL for cheaper upserts (emptied after a crash)
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
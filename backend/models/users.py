@@ -23,4 +23,6 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    biomarker_uploads = relationship("BiomarkerUpload", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    biomarker_uploads = relationship(
+        "BiomarkerUpload", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+    )
\ No newline at end of file
@@ -1,16 +1,47 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterator, List
 from datetime import datetime
+import json
+
+import anyio
 
 from models import User, UserRole, BiomarkerUpload, AnalysisResult
-from dependencies import get_db, get_current_user, get_permission_checker, require_admin
+from dependencies import (
+    get_db,
+    get_async_db,
+    get_current_user,
+    get_current_user_async,
+    get_current_principal,
+    Principal,
+    UserSnapshot,
+    get_permission_checker,
+    require_admin,
+    require_admin_async,
+    PageParams,
+    get_page_params,
+    SessionLocal,
+    engine,
+    get_async_engine,
+)
+from config import UPLOAD_DB_THREADS, UPLOAD_WORKER_THREADS, DB_ASYNC
 from routes.auth import UserResponse
 from rbac import PermissionChecker, PermissionRegistry, Action, Resource, ResourceOwnershipValidator
+from utils import summary_cache, user_cache, keyset_order, encode_cursor, get_password_pool
+
+# Uploads serialized per chunk of the streamed /admin/all-uploads response
+ADMIN_STREAM_BATCH_ROWS = 200
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
-@router.get("/users", response_model=List[UserResponse])
+# Read routes with an asyncpg AsyncSession variant; DB_ASYNC picks one (included at the bottom)
+read_router = APIRouter()
+async_read_router = APIRouter()
+
+@read_router.get("/users", response_model=List[UserResponse])
 def get_all_users(
     db: Session = Depends(get_db),
     checker: PermissionChecker = Depends(require_admin())
@@ -21,20 +52,26 @@ def get_all_users(
     users = db.query(User).all()
     return users
 
-@router.get("/stats")
-def admin_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    checker: PermissionChecker = Depends(require_admin())
+@async_read_router.get("/users", response_model=List[UserResponse])
+async def get_all_users_async(
+    db: AsyncSession = Depends(get_async_db),
+    checker: PermissionChecker = Depends(require_admin_async())
 ):
-    """Get system statistics - Admin only"""
-    checker.require_permission(PermissionRegistry.ADMIN_MANAGE_SYSTEM)
-    
-    total_users = db.query(User).count()
-    total_admins = db.query(User).filter(User.role == UserRole.ADMIN).count()
-    total_regular_users = db.query(User).filter(User.role == UserRole.USER).count()
-    total_uploads = db.query(BiomarkerUpload).count()
+    """Get all users - Admin only"""
+    checker.require_permission(PermissionRegistry.ADMIN_VIEW_ALL_USERS)
     
+    return (await db.execute(select(User))).scalars().all()
+
+def _stats_statements():
+    return (
+        select(func.count(User.id)),
+        select(func.count(User.id)).where(User.role == UserRole.ADMIN),
+        select(func.count(User.id)).where(User.role == UserRole.USER),
+        select(func.count(BiomarkerUpload.id)),
+    )
+
+def _stats_response(current_user: UserSnapshot, counts) -> dict:
+    total_users, total_admins, total_regular_users, total_uploads = counts
     return {
         "message": "Admin statistics",
         "admin": {
@@ -50,10 +87,72 @@ def admin_stats(
         }
     }
 
+@read_router.get("/stats")
+def admin_stats(
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    checker: PermissionChecker = Depends(require_admin())
+):
+    """Get system statistics - Admin only"""
+    checker.require_permission(PermissionRegistry.ADMIN_MANAGE_SYSTEM)
+    
+    return _stats_response(current_user, [db.execute(statement).scalar_one() for statement in _stats_statements()])
+
+@async_read_router.get("/stats")
+async def admin_stats_async(
+    current_user: UserSnapshot = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+    checker: PermissionChecker = Depends(require_admin_async())
+):
+    """Get system statistics - Admin only"""
+    checker.require_permission(PermissionRegistry.ADMIN_MANAGE_SYSTEM)
+    
+    return _stats_response(current_user, [(await db.execute(statement)).scalar_one() for statement in _stats_statements()])
+
+@router.get("/password-hashing")
+def password_hashing_stats(
+    request: Request,
+    checker: PermissionChecker = Depends(require_admin())
+):
+    """Password hashing pool metrics and the bcrypt cost measured at startup - Admin only"""
+    checker.require_permission(PermissionRegistry.ADMIN_MANAGE_SYSTEM)
+    
+    pool = get_password_pool().stats()
+    cost = getattr(request.app.state, "password_hash_cost", None)
+    return {
+        "pool": pool,
+        "cost": cost,
+        # Upper bound on logins per second this process can verify
+        "estimated_logins_per_second": round(pool["max_workers"] / cost["verify_seconds"], 1) if cost else None
+    }
+
+@router.get("/db-pool")
+async def db_pool_stats(
+    checker: PermissionChecker = Depends(require_admin())
+):
+    """Database connection pool telemetry for this process - Admin only"""
+    checker.require_permission(PermissionRegistry.ADMIN_MANAGE_SYSTEM)
+    
+    pool = engine.pool.stats()
+    # Threads that may each hold a connection at once
+    threads = {
+        "request_threadpool": int(anyio.to_thread.current_default_thread_limiter().total_tokens),
+        "db_pool": UPLOAD_DB_THREADS,
+        "upload_workers": UPLOAD_WORKER_THREADS,
+    }
+    return {
+        "pool": pool,
+        # Separate pool (same DB_POOL_* sizes) used by the async routes
+        "async_pool": get_async_engine().pool.stats() if DB_ASYNC else None,
+        "capacity": pool["pool_size"] + max(pool["max_overflow"], 0),
+        "threads": threads,
+        "max_concurrent_sessions": sum(threads.values())
+    }
+
 @router.delete("/users/{user_id}")
 def delete_user(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     checker: PermissionChecker = Depends(require_admin())
 ):
@@ -75,47 +174,111 @@ def delete_user(
     
     db.delete(user)
     db.commit()
+    summary_cache.invalidate(user_id)
+    user_cache.invalidate(user_id)
     
     return {"message": f"User {user.email} deleted successfully"}
 
+def _serialize_admin_upload(row) -> dict:
+    return {
+        "id": row.id,
+        "filename": row.filename,
+        "upload_date": row.upload_date.isoformat(),
+        "status": row.status,
+        "user": {
+            "id": row.user_id,
+            "email": row.email,
+            "full_name": row.full_name
+        },
+        "analysis": {
+            "biological_age": row.biological_age,
+            "chronological_age": row.chronological_age,
+            "age_difference": row.chronological_age - row.biological_age,
+            "inflammation_score": row.inflammation_score,
+            "metabolic_health_score": row.metabolic_health_score,
+            "cardiovascular_risk": row.cardiovascular_risk
+        } if row.analysis_id is not None else None
+    }
+
+
+def _stream_all_uploads(after, limit: int) -> Iterator[str]:
+    """
+    Yield the admin upload listing as one JSON document, a batch of uploads
+    at a time, from a server-side cursor over a single joined query.
+
+    Opens its own session: the response body is produced after the route
+    (and its get_db session) has returned.
+    """
+    db = SessionLocal()
+    try:
+        total_uploads = db.query(func.count(BiomarkerUpload.id)).scalar()
+        
+        # One analysis per upload, so the outer join never multiplies rows
+        query = db.query(
+            BiomarkerUpload.id,
+            BiomarkerUpload.filename,
+            BiomarkerUpload.upload_date,
+            BiomarkerUpload.status,
+            BiomarkerUpload.user_id,
+            User.email,
+            User.full_name,
+            AnalysisResult.id.label("analysis_id"),
+            AnalysisResult.biological_age,
+            AnalysisResult.chronological_age,
+            AnalysisResult.inflammation_score,
+            AnalysisResult.metabolic_health_score,
+            AnalysisResult.cardiovascular_risk
+        ).join(
+            User, User.id == BiomarkerUpload.user_id
+        ).outerjoin(
+            AnalysisResult, AnalysisResult.upload_id == BiomarkerUpload.id
+        )
+        rows = keyset_order(
+            query, BiomarkerUpload.upload_date, BiomarkerUpload.id, after
+        ).limit(limit + 1).yield_per(ADMIN_STREAM_BATCH_ROWS)
+        
+        yield f'{{"total_uploads": {total_uploads}, "uploads": ['
+        
+        count = 0
+        last = None
+        has_more = False
+        batch = []
+        for row in rows:
+            if count == limit:
+                # A row beyond the limit means there is another page
+                has_more = True
+                break
+            batch.append(json.dumps(_serialize_admin_upload(row)))
+            count += 1
+            last = row
+            if len(batch) == ADMIN_STREAM_BATCH_ROWS:
+                yield ("," if count > len(batch) else "") + ",".join(batch)
+                batch = []
+        if batch:
+            yield ("," if count > len(batch) else "") + ",".join(batch)
+        
+        next_cursor = encode_cursor(last.upload_date, last.id) if has_more else None
+        yield f'], "next_cursor": {json.dumps(next_cursor)}}}'
+    finally:
+        db.close()
+
+
 @router.get("/all-uploads")
 def get_all_uploads(
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(get_page_params),
     checker: PermissionChecker = Depends(require_admin())
 ):
-    """Get all uploads from all users - Admin only"""
-    checker.require_permission(PermissionRegistry.ADMIN_VIEW_ALL_UPLOADS)
-    
-    uploads = db.query(BiomarkerUpload).order_by(BiomarkerUpload.upload_date.desc()).all()
+    """
+    Get uploads from all users, newest first - Admin only
     
-    result = []
-    for upload in uploads:
-        user = db.query(User).filter(User.id == upload.user_id).first()
-        analysis = db.query(AnalysisResult).filter(
-            AnalysisResult.upload_id == upload.id
-        ).first()
-        
-        result.append({
-            "id": upload.id,
-            "filename": upload.filename,
-            "upload_date": upload.upload_date.isoformat(),
-            "status": upload.status,
-            "user": {
-                "id": user.id,
-                "email": user.email,
-                "full_name": user.full_name
-            },
-            "analysis": {
-                "biological_age": analysis.biological_age,
-                "chronological_age": analysis.chronological_age,
-                "age_difference": analysis.chronological_age - analysis.biological_age,
-                "inflammation_score": analysis.inflammation_score,
-                "metabolic_health_score": analysis.metabolic_health_score,
-                "cardiovascular_risk": analysis.cardiovascular_risk
-            } if analysis else None
-        })
+    Streamed as a chunked JSON document built from one joined query.
+    """
+    checker.require_permission(PermissionRegistry.ADMIN_VIEW_ALL_UPLOADS)
     
-    return {
-        "total_uploads": len(result),
-        "uploads": result
-    }
\ No newline at end of file
+    return StreamingResponse(
+        _stream_all_uploads(page.after, page.limit),
+        media_type="application/json"
+    )
+
+
+router.include_router(async_read_router if DB_ASYNC else read_router)
@@ -4,10 +4,12 @@ from sqlalchemy.orm import Session
 from datetime import timedelta, datetime
 from typing import Optional
 from fastapi.responses import Response
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from models import User, UserRole
-from dependencies import get_db, get_current_user
-from utils import hash_password, verify_password
-from config import ACCESS_TOKEN_EXPIRE_MINUTES
+from dependencies import get_db, get_current_user, get_token_payload, security, UserSnapshot
+from utils import hash_password, verify_password, run_in_password_pool, ExecutorSaturated
+from config import ACCESS_TOKEN_EXPIRE_MINUTES, AUTH_STATELESS, AUTH_STATELESS_TOKEN_EXPIRE_MINUTES
 from auth_strategies import get_jwt_service
 from middleware.rate_limiter import limiter
 
@@ -40,9 +42,35 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# The user lookups below are short queries; they run on the request threadpool
+# (like the sync routes), never behind bulk loads on the upload db-write pool
+
+def _find_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+async def _run_password_hashing(fn, *args):
+    """Run fn on the bounded password pool, shedding load with a 503 when it is full"""
+    try:
+        return await run_in_password_pool(fn, *args)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent authentication requests, try again shortly",
+            headers={"Retry-After": "1"}
+        )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+    existing_user = await run_in_threadpool(_find_user_by_email, db, user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -52,28 +80,22 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     new_user = User(
         email=user_data.email,
         full_name=user_data.full_name,
-        password_hash=hash_password(user_data.password),
+        password_hash=await _run_password_hashing(hash_password, user_data.password),
         role=user_data.role,
         is_active=1
     )
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
-    return new_user
+    return await run_in_threadpool(_save_user, db, new_user)
 
 @router.post("/login", response_model=Token)
 @limiter.limit("1/hour") 
-def login(
+async def login(
     request: Request,
     response: Response, 
     user_credentials: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_credentials.email).first()
-
-    print("user_details",user)
+    user = await run_in_threadpool(_find_user_by_email, db, user_credentials.email)
     
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    if not user or not await _run_password_hashing(verify_password, user_credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -86,7 +108,9 @@ def login(
             detail="Account is inactive"
         )
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token_expires = timedelta(
+        minutes=AUTH_STATELESS_TOKEN_EXPIRE_MINUTES if AUTH_STATELESS else ACCESS_TOKEN_EXPIRE_MINUTES
+    )
     jwt_svc = get_jwt_service()
     access_token = jwt_svc.create_access_token(
         data={"sub": str(user.id), "role": user.role.value},
@@ -105,5 +129,18 @@ def login(
     }
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
-    return current_user
\ No newline at end of file
+def get_me(current_user: UserSnapshot = Depends(get_current_user)):
+    return current_user
+
+@router.post("/logout")
+def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    payload: dict = Depends(get_token_payload)
+):
+    """Revoke the bearer token until it expires"""
+    if not get_jwt_service().revoke_token(payload, credentials.credentials):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token cannot be revoked; it expires on its own"
+        )
+    return {"message": "Logged out"}
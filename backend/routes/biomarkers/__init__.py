@@ -1,13 +1,16 @@
 from fastapi import APIRouter
+from config import DB_ASYNC
 from routes.biomarkers.upload import router as upload_router
-from routes.biomarkers.analysis import router as analysis_router
+from routes.biomarkers.analysis import router as analysis_router, async_router as async_analysis_router
 from routes.biomarkers.management import router as management_router
+from routes.biomarkers.export import router as export_router
 
 router = APIRouter(prefix="/biomarkers", tags=["Biomarkers"])
 
 # Include all sub-routers
 router.include_router(upload_router)
-router.include_router(analysis_router)
+router.include_router(async_analysis_router if DB_ASYNC else analysis_router)
+router.include_router(export_router)
 router.include_router(management_router)
 
 __all__ = ["router"]
\ No newline at end of file
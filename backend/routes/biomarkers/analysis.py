@@ -1,21 +1,75 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Header, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select, select, func, true
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
 
-from models import User, BiomarkerUpload, BiomarkerData, AnalysisResult
-from dependencies import get_db, get_current_user
+import numpy as np
+
+from models import BiomarkerUpload, BiomarkerData, BiomarkerSeries, AnalysisResult, AnalysisTimepoint
+from dependencies import (
+    get_db,
+    get_async_db,
+    get_current_user,
+    get_current_user_async,
+    get_current_principal,
+    get_current_principal_async,
+    Principal,
+    UserSnapshot,
+)
+from utils import summary_cache, make_etag, etag_matches, not_modified, decode_series, PRIVATE_REVALIDATE, NO_STORE
 
 router = APIRouter()
 
+# The same routes on an asyncpg AsyncSession, for DB_ASYNC (see routes/biomarkers/__init__.py)
+async_router = APIRouter()
 
-@router.get("/analysis/{upload_id}")
-def get_analysis(
-    upload_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get detailed analysis for a specific upload"""
+
+def _analysis_upload_statement(upload_id: int) -> Select:
+    return select(
+        BiomarkerUpload.id,
+        BiomarkerUpload.user_id,
+        BiomarkerUpload.filename,
+        BiomarkerUpload.upload_date,
+        BiomarkerUpload.status,
+        AnalysisResult.calculated_at
+    ).outerjoin(
+        AnalysisResult, AnalysisResult.upload_id == BiomarkerUpload.id
+    ).where(BiomarkerUpload.id == upload_id).limit(1)
+
+
+def _analysis_biomarkers_statement(upload_id: int, start: Optional[datetime], end: Optional[datetime]) -> Select:
+    statement = select(BiomarkerData).where(BiomarkerData.upload_id == upload_id)
+    
+    # biomarker_data is partitioned by date, so a range only reads the years it spans
+    if start is not None:
+        statement = statement.where(BiomarkerData.date >= start)
+    if end is not None:
+        statement = statement.where(BiomarkerData.date <= end)
     
-    upload = db.query(BiomarkerUpload).filter(BiomarkerUpload.id == upload_id).first()
+    # Same order as the packed series, ties included
+    return statement.order_by(BiomarkerData.date, BiomarkerData.id)
+
+
+def _analysis_series_statement(upload_id: int) -> Select:
+    return select(BiomarkerSeries).where(BiomarkerSeries.upload_id == upload_id)
+
+
+def _analysis_result_statement(upload_id: int) -> Select:
+    return select(AnalysisResult).where(AnalysisResult.upload_id == upload_id).limit(1)
+
+
+def _revalidate_analysis(
+    upload,
+    current_user: Principal,
+    response: Response,
+    if_none_match: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime]
+):
+    """Check access to the upload and set its caching headers; returns a 304 response when the client's copy is current"""
     if not upload:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -28,34 +82,72 @@ def get_analysis(
             detail="Access denied"
         )
     
-    biomarkers = db.query(BiomarkerData).filter(
-        BiomarkerData.upload_id == upload_id
-    ).order_by(BiomarkerData.date).all()
-    
-    analysis = db.query(AnalysisResult).filter(
-        AnalysisResult.upload_id == upload_id
-    ).first()
-    
-    return {
+    if upload.status == "completed" and upload.calculated_at is not None:
+        date_range = (start, end) if start is not None or end is not None else ()
+        etag = make_etag("analysis", upload.id, upload.calculated_at.isoformat(), *date_range)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    else:
+        response.headers["Cache-Control"] = NO_STORE
+    return None
+
+
+def _json_float(value: Optional[float]) -> Optional[float]:
+    """A missing measurement (NULL, or NaN as ingest stores it) as None (JSON null)"""
+    return None if value is None or value != value else value
+
+
+def _serialize_biomarker_rows(biomarkers) -> list:
+    return [
+        {
+            "date": b.date.isoformat(),
+            "cholesterol_total": _json_float(b.cholesterol_total),
+            "hdl": _json_float(b.hdl),
+            "ldl": _json_float(b.ldl),
+            "triglycerides": _json_float(b.triglycerides),
+            "glucose": _json_float(b.glucose),
+            "crp": _json_float(b.crp),
+            "vitamin_d": _json_float(b.vitamin_d)
+        }
+        for b in biomarkers
+    ]
+
+
+def _json_floats(values: np.ndarray) -> list:
+    """_json_float over a whole column: a list with None where the series holds NaN"""
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.tolist()
+    return np.where(missing, None, values).tolist()
+
+
+def _serialize_biomarker_series(series: BiomarkerSeries) -> list:
+    """The same entries as _serialize_biomarker_rows, built column-wise from the packed series"""
+    arrays = decode_series(series)
+    dates = [date.isoformat() for date in arrays.pop("date").astype(object)]
+    columns = {name: _json_floats(values) for name, values in arrays.items()}
+    return [
+        {"date": date, **dict(zip(columns, values))}
+        for date, *values in zip(dates, *columns.values())
+    ]
+
+
+def _analysis_response(upload, biomarkers: list, analysis, response: Response) -> JSONResponse:
+    """
+    The analysis with the caching headers set on response. Every value is a
+    plain JSON type already, so it skips FastAPI's per-value encoding pass,
+    which dominates the response time of long series.
+    """
+    return JSONResponse({
         "upload": {
             "id": upload.id,
             "filename": upload.filename,
             "upload_date": upload.upload_date.isoformat(),
             "status": upload.status
         },
-        "biomarkers": [
-            {
-                "date": b.date.isoformat(),
-                "cholesterol_total": b.cholesterol_total,
-                "hdl": b.hdl,
-                "ldl": b.ldl,
-                "triglycerides": b.triglycerides,
-                "glucose": b.glucose,
-                "crp": b.crp,
-                "vitamin_d": b.vitamin_d
-            }
-            for b in biomarkers
-        ],
+        "biomarkers": biomarkers,
         "analysis": {
             "biological_age": analysis.biological_age,
             "chronological_age": analysis.chronological_age,
@@ -65,21 +157,124 @@ def get_analysis(
             "cardiovascular_risk": analysis.cardiovascular_risk,
             "calculated_at": analysis.calculated_at.isoformat()
         } if analysis else None
-    }
+    }, headers=dict(response.headers))
 
 
-@router.get("/summary")
-def get_summary(
-    current_user: User = Depends(get_current_user),
+@router.get("/analysis/{upload_id}")
+def get_analysis(
+    upload_id: int,
+    response: Response,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    """Get comprehensive summary of user's biomarker data and health trends"""
+    """
+    Get detailed analysis for a specific upload, its biomarker rows
+    optionally limited to start <= date <= end
+
+    A completed upload's analysis never changes, so it carries a strong ETag;
+    a matching If-None-Match gets a 304 after a single indexed lookup.
+    The whole series is read from its packed form when there is one; a date
+    range is read from the (partitioned) rows.
+    """
+    
+    upload = db.execute(_analysis_upload_statement(upload_id)).first()
+    not_modified_response = _revalidate_analysis(upload, current_user, response, if_none_match, start, end)
+    if not_modified_response is not None:
+        return not_modified_response
+    
+    series = None
+    if start is None and end is None:
+        series = db.execute(_analysis_series_statement(upload_id)).scalars().first()
+    if series is not None:
+        biomarkers = _serialize_biomarker_series(series)
+    else:
+        biomarkers = _serialize_biomarker_rows(
+            db.execute(_analysis_biomarkers_statement(upload_id, start, end)).scalars().all()
+        )
+    analysis = db.execute(_analysis_result_statement(upload_id)).scalars().first()
+    
+    return _analysis_response(upload, biomarkers, analysis, response)
+
+
+# The _summary_version_statement columns, and their values for a user without uploads
+SUMMARY_VERSION_COLUMNS = (
+    "version_uploads", "version_last_id", "version_last_date",
+    "version_completed", "version_failed", "version_calculated_at",
+)
+EMPTY_SUMMARY_VERSION = (0, None, None, 0, 0, None)
+
+
+def _summary_version_statement(user_id: int) -> Select:
+    """
+    A cheap probe of what the summary is built from: one aggregate row that
+    changes whenever one of the user's uploads is added, deleted, finishes,
+    fails or is (re)analyzed. Used to answer If-None-Match without building
+    the summary.
+    """
+    return select(
+        func.count(BiomarkerUpload.id).label("version_uploads"),
+        func.max(BiomarkerUpload.id).label("version_last_id"),
+        func.max(BiomarkerUpload.upload_date).label("version_last_date"),
+        func.count().filter(BiomarkerUpload.status == "completed").label("version_completed"),
+        func.count().filter(BiomarkerUpload.status == "failed").label("version_failed"),
+        func.max(AnalysisResult.calculated_at).label("version_calculated_at")
+    ).select_from(BiomarkerUpload).outerjoin(
+        AnalysisResult, AnalysisResult.upload_id == BiomarkerUpload.id
+    ).where(BiomarkerUpload.user_id == user_id)
+
+
+def _summary_statement(user_id: int) -> Select:
+    """
+    One statement for the summary: the user's two most recent uploads (plus
+    the total count) with each upload's analysis, the newest biomarker row of
+    the latest upload, and the summary version (read in the same snapshot).
+    """
+    ranked = select(
+        BiomarkerUpload.id,
+        BiomarkerUpload.filename,
+        BiomarkerUpload.upload_date,
+        BiomarkerUpload.status,
+        func.row_number().over(
+            order_by=(BiomarkerUpload.upload_date.desc(), BiomarkerUpload.id.desc())
+        ).label("position"),
+        func.count().over().label("total_uploads")
+    ).where(BiomarkerUpload.user_id == user_id).cte("ranked")
+    
+    analysis = aliased(AnalysisResult, (
+        select(AnalysisResult)
+        .where(AnalysisResult.upload_id == ranked.c.id)
+        .order_by(AnalysisResult.id)
+        .limit(1)
+        .lateral()
+    ), name="analysis")
+    latest_biomarkers = aliased(BiomarkerData, (
+        select(BiomarkerData)
+        .where(BiomarkerData.upload_id == ranked.c.id, ranked.c.position == 1)
+        .order_by(BiomarkerData.date.desc())
+        .limit(1)
+        .lateral()
+    ), name="latest_biomarkers")
     
-    uploads = db.query(BiomarkerUpload).filter(
-        BiomarkerUpload.user_id == current_user.id
-    ).order_by(BiomarkerUpload.upload_date.desc()).all()
+    version = _summary_version_statement(user_id).subquery("version")
     
-    if not uploads:
+    return (
+        select(ranked, analysis, latest_biomarkers, *version.c)
+        .select_from(ranked)
+        .outerjoin(analysis, true())
+        .outerjoin(latest_biomarkers, true())
+        .join(version, true())
+        .where(ranked.c.position <= 2)
+        .order_by(ranked.c.position)
+    )
+
+
+def _build_summary(rows) -> dict:
+    """Everything in the summary except the user block, which is never cached"""
+    
+    if not rows:
         return {
             "message": "No biomarker data uploaded yet",
             "total_uploads": 0,
@@ -88,23 +283,14 @@ def get_summary(
             "recommendations": []
         }
     
-    latest_upload = uploads[0]
-    
-    latest_analysis = db.query(AnalysisResult).filter(
-        AnalysisResult.upload_id == latest_upload.id
-    ).first()
-    
-    latest_biomarkers = db.query(BiomarkerData).filter(
-        BiomarkerData.upload_id == latest_upload.id
-    ).order_by(BiomarkerData.date.desc()).first()
+    latest_upload = rows[0]
+    latest_analysis = latest_upload.analysis
+    latest_biomarkers = latest_upload.latest_biomarkers
     
     # Calculate trends if there are multiple uploads
     trends = None
-    if len(uploads) >= 2:
-        previous_upload = uploads[1]
-        previous_analysis = db.query(AnalysisResult).filter(
-            AnalysisResult.upload_id == previous_upload.id
-        ).first()
+    if len(rows) >= 2:
+        previous_analysis = rows[1].analysis
         
         if previous_analysis and latest_analysis:
             trends = {
@@ -214,11 +400,7 @@ def get_summary(
         }
     
     return {
-        "user": {
-            "name": current_user.full_name,
-            "email": current_user.email
-        },
-        "total_uploads": len(uploads),
+        "total_uploads": latest_upload.total_uploads,
         "latest_upload": {
             "id": latest_upload.id,
             "filename": latest_upload.filename,
@@ -248,4 +430,199 @@ def get_summary(
         "health_trends": trends,
         "recommendations": recommendations,
         "overall_health_status": overall_status
-    }
\ No newline at end of file
+    }
+
+
+def _summary_etag(version, current_user: UserSnapshot) -> str:
+    return make_etag("summary", *version, current_user.full_name, current_user.email)
+
+
+def _versioned(rows):
+    """(summary, version) from the _summary_statement rows"""
+    version = tuple(getattr(rows[0], column) for column in SUMMARY_VERSION_COLUMNS) if rows else EMPTY_SUMMARY_VERSION
+    return _build_summary(rows), version
+
+
+def _load_versioned_summary(db: Session, user_id: int):
+    return _versioned(db.execute(_summary_statement(user_id)).all())
+
+
+def _summary_not_modified(version, current_user: UserSnapshot, if_none_match: Optional[str]):
+    """A 304 when the client's copy matches the probed version, else None"""
+    etag = _summary_etag(tuple(version), current_user)
+    return not_modified(etag) if etag_matches(if_none_match, etag) else None
+
+
+def _summary_response(
+    versioned_summary, current_user: UserSnapshot, response: Response, if_none_match: Optional[str]
+):
+    summary, version = versioned_summary
+    etag = _summary_etag(version, current_user)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    
+    if not summary["total_uploads"]:
+        return summary
+    
+    return {
+        "user": {
+            "name": current_user.full_name,
+            "email": current_user.email
+        },
+        **summary
+    }
+
+
+@router.get("/summary")
+def get_summary(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get comprehensive summary of user's biomarker data and health trends
+
+    The ETag versions the user's uploads (see _summary_version_statement).
+    A cached summary answers If-None-Match without touching the database; on
+    a cache miss one aggregate probe does, before the summary is built.
+    """
+    
+    versioned_summary = summary_cache.get(current_user.id)
+    if versioned_summary is None and if_none_match:
+        not_modified_response = _summary_not_modified(
+            db.execute(_summary_version_statement(current_user.id)).one(), current_user, if_none_match
+        )
+        if not_modified_response is not None:
+            return not_modified_response
+    
+    if versioned_summary is None:
+        versioned_summary = summary_cache.get_or_load(
+            current_user.id, lambda: _load_versioned_summary(db, current_user.id)
+        )
+    return _summary_response(versioned_summary, current_user, response, if_none_match)
+
+
+def _history_statement(user_id: int, start: Optional[datetime], end: Optional[datetime]) -> Select:
+    statement = select(
+        AnalysisTimepoint.date,
+        AnalysisTimepoint.biological_age,
+        AnalysisTimepoint.chronological_age,
+        AnalysisTimepoint.inflammation_score,
+        AnalysisTimepoint.metabolic_health_score,
+        AnalysisTimepoint.cardiovascular_risk,
+        AnalysisTimepoint.upload_id
+    ).where(AnalysisTimepoint.user_id == user_id)
+    
+    if start is not None:
+        statement = statement.where(AnalysisTimepoint.date >= start)
+    if end is not None:
+        statement = statement.where(AnalysisTimepoint.date <= end)
+    
+    return statement.order_by(AnalysisTimepoint.date)
+
+
+def _history_response(points) -> dict:
+    return {
+        "total_points": len(points),
+        "points": [
+            {
+                "date": point.date.isoformat(),
+                "biological_age": point.biological_age,
+                "chronological_age": point.chronological_age,
+                "age_difference": round(point.chronological_age - point.biological_age, 1),
+                "inflammation_score": point.inflammation_score,
+                "metabolic_health_score": point.metabolic_health_score,
+                "cardiovascular_risk": point.cardiovascular_risk,
+                "upload_id": point.upload_id
+            }
+            for point in points
+        ]
+    }
+
+
+@router.get("/history")
+def get_history(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the biological-age curve across all uploads, one point per dated
+    measurement, oldest first. Optionally limited to start <= date <= end.
+    """
+    
+    points = db.execute(_history_statement(current_user.id, start, end)).all()
+    return _history_response(points)
+
+
+@async_router.get("/analysis/{upload_id}")
+async def get_analysis_async(
+    upload_id: int,
+    response: Response,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get detailed analysis for a specific upload, optionally limited to start <= date <= end"""
+    
+    upload = (await db.execute(_analysis_upload_statement(upload_id))).first()
+    not_modified_response = _revalidate_analysis(upload, current_user, response, if_none_match, start, end)
+    if not_modified_response is not None:
+        return not_modified_response
+    
+    series = None
+    if start is None and end is None:
+        series = (await db.execute(_analysis_series_statement(upload_id))).scalars().first()
+    if series is not None:
+        biomarkers = _serialize_biomarker_series(series)
+    else:
+        biomarkers = _serialize_biomarker_rows(
+            (await db.execute(_analysis_biomarkers_statement(upload_id, start, end))).scalars().all()
+        )
+    analysis = (await db.execute(_analysis_result_statement(upload_id))).scalars().first()
+    
+    return _analysis_response(upload, biomarkers, analysis, response)
+
+
+@async_router.get("/summary")
+async def get_summary_async(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get comprehensive summary of user's biomarker data and health trends"""
+    
+    async def load():
+        return _versioned((await db.execute(_summary_statement(current_user.id))).all())
+    
+    versioned_summary = summary_cache.get(current_user.id)
+    if versioned_summary is None and if_none_match:
+        not_modified_response = _summary_not_modified(
+            (await db.execute(_summary_version_statement(current_user.id))).one(), current_user, if_none_match
+        )
+        if not_modified_response is not None:
+            return not_modified_response
+    
+    if versioned_summary is None:
+        versioned_summary = await summary_cache.get_or_load_async(current_user.id, load)
+    return _summary_response(versioned_summary, current_user, response, if_none_match)
+
+
+@async_router.get("/history")
+async def get_history_async(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the biological-age curve across all uploads, optionally limited to start <= date <= end"""
+    
+    points = (await db.execute(_history_statement(current_user.id, start, end))).all()
+    return _history_response(points)
@@ -0,0 +1,151 @@
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from typing import Iterator, List, Optional
+import enum
+
+from models import BiomarkerUpload, BiomarkerData, AnalysisResult, AnalysisTimepoint
+from dependencies import get_current_principal, get_permission_checker, get_db, Principal, SessionLocal
+from rbac import PermissionChecker, PermissionRegistry
+from utils import encode_csv, encode_ndjson, encode_parquet
+from config import EXPORT_BATCH_ROWS
+
+router = APIRouter()
+
+
+class ExportDataset(str, enum.Enum):
+    BIOMARKERS = "biomarkers"  # raw biomarker_data rows
+    ANALYSES = "analyses"  # one analysis_results row per upload
+    TIMEPOINTS = "timepoints"  # per-row scores
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+EXPORT_ENCODERS = {
+    ExportFormat.CSV: encode_csv,
+    ExportFormat.NDJSON: encode_ndjson,
+    ExportFormat.PARQUET: encode_parquet,
+}
+
+
+def _export_statement(dataset: ExportDataset, user_id: int) -> Select:
+    if dataset == ExportDataset.BIOMARKERS:
+        return select(
+            BiomarkerData.upload_id,
+            BiomarkerUpload.filename,
+            BiomarkerData.date,
+            BiomarkerData.cholesterol_total,
+            BiomarkerData.hdl,
+            BiomarkerData.ldl,
+            BiomarkerData.triglycerides,
+            BiomarkerData.glucose,
+            BiomarkerData.crp,
+            BiomarkerData.vitamin_d
+        ).join(
+            BiomarkerUpload, BiomarkerUpload.id == BiomarkerData.upload_id
+        ).where(
+            BiomarkerUpload.user_id == user_id
+        ).order_by(BiomarkerData.upload_id, BiomarkerData.date)
+    
+    if dataset == ExportDataset.ANALYSES:
+        return select(
+            AnalysisResult.upload_id,
+            BiomarkerUpload.filename,
+            BiomarkerUpload.upload_date,
+            AnalysisResult.biological_age,
+            AnalysisResult.chronological_age,
+            AnalysisResult.inflammation_score,
+            AnalysisResult.metabolic_health_score,
+            AnalysisResult.cardiovascular_risk,
+            AnalysisResult.calculated_at
+        ).join(
+            BiomarkerUpload, BiomarkerUpload.id == AnalysisResult.upload_id
+        ).where(
+            BiomarkerUpload.user_id == user_id
+        ).order_by(BiomarkerUpload.upload_date, AnalysisResult.upload_id)
+    
+    return select(
+        AnalysisTimepoint.upload_id,
+        AnalysisTimepoint.date,
+        AnalysisTimepoint.biological_age,
+        AnalysisTimepoint.chronological_age,
+        AnalysisTimepoint.inflammation_score,
+        AnalysisTimepoint.metabolic_health_score,
+        AnalysisTimepoint.cardiovascular_risk
+    ).where(
+        AnalysisTimepoint.user_id == user_id
+    ).order_by(AnalysisTimepoint.date)
+
+
+def _fetch_batches(statement: Select) -> Iterator[List[tuple]]:
+    """
+    Yield the statement's rows in batches from a server-side cursor.
+
+    Opens its own session: the response body is produced after the route
+    has returned, and closing the stream early closes the cursor.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_ROWS))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+    finally:
+        db.close()
+
+
+@router.get("/export")
+def export_data(
+    dataset: ExportDataset = ExportDataset.BIOMARKERS,
+    format: ExportFormat = ExportFormat.CSV,
+    upload_id: Optional[int] = None,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    checker: PermissionChecker = Depends(get_permission_checker)
+):
+    """
+    Export the current user's biomarker data or analyses, optionally for a
+    single upload
+    
+    Streamed as CSV, NDJSON or Parquet. Memory use is bounded by
+    EXPORT_BATCH_ROWS, not the row count.
+    """
+    if dataset == ExportDataset.BIOMARKERS:
+        checker.require_permission(PermissionRegistry.USER_EXPORT_OWN_DATA)
+    else:
+        checker.require_permission(PermissionRegistry.USER_EXPORT_OWN_RESULTS)
+    
+    statement = _export_statement(dataset, current_user.id)
+    if upload_id is not None:
+        upload_user_id = db.execute(
+            select(BiomarkerUpload.user_id).where(BiomarkerUpload.id == upload_id)
+        ).scalar()
+        if upload_user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
+            )
+        if upload_user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+        statement = statement.where(statement.selected_columns.upload_id == upload_id)
+    encoder = EXPORT_ENCODERS[format]
+    
+    return StreamingResponse(
+        encoder(statement.selected_columns, _fetch_batches(statement)),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset.value}.{format.value}"'}
+    )
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.orm import Session
 
-from models import User, BiomarkerUpload
-from dependencies import get_db, get_current_user, get_permission_checker
+from models import BiomarkerUpload
+from dependencies import get_db, get_current_principal, get_permission_checker, Principal
 from rbac import PermissionChecker, PermissionRegistry
+from utils import summary_cache
 
 router = APIRouter()
 
@@ -11,7 +12,7 @@ router = APIRouter()
 @router.delete("/{upload_id}")
 def delete_upload(
     upload_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
     checker: PermissionChecker = Depends(get_permission_checker)
 ):
@@ -34,5 +35,6 @@ def delete_upload(
     
     db.delete(upload)
     db.commit()
+    summary_cache.invalidate(current_user.id)
     
     return {"message": "Upload deleted successfully"}
\ No newline at end of file
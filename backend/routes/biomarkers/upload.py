@@ -1,23 +1,231 @@
 from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
+from fastapi.responses import JSONResponse
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from typing import Dict, List
+import asyncio
+import zipfile
 import pandas as pd
-import io
 
-from models import User, BiomarkerUpload, BiomarkerData, AnalysisResult
-from dependencies import get_db, get_current_user
-from utils import calculate_health_analysis
+from models import BiomarkerUpload, BiomarkerData, AnalysisResult
+from dependencies import get_db, get_current_principal, Principal, PageParams, get_page_params
+from utils import (
+    PreparedUpload,
+    store_upload_file,
+    remove_upload_files,
+    extract_csv_members,
+    inspect_upload_file,
+    prepare_upload_file,
+    load_prepared_upload,
+    ensure_biomarker_partitions,
+    run_in_process_pool,
+    run_in_db_pool,
+    summary_cache,
+    keyset_page,
+)
+from workers import enqueue_upload
+from config import UPLOAD_BATCH_MAX_FILES
 
 router = APIRouter()
 
 
+def _create_upload(db: Session, user_id: int, filename: str, content_digest: str) -> BiomarkerUpload:
+    upload = BiomarkerUpload(
+        user_id=user_id,
+        filename=filename,
+        status="processing",
+        content_digest=content_digest
+    )
+    db.add(upload)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    db.refresh(upload)
+    return upload
+
+
+def _complete_upload(
+    db: Session,
+    upload: BiomarkerUpload,
+    prepared: PreparedUpload,
+    chronological_age: int
+) -> AnalysisResult:
+    analysis_result = load_prepared_upload(db, upload, prepared, chronological_age)
+    db.commit()
+    db.refresh(analysis_result)
+    return analysis_result
+
+
+def _mark_upload_failed(db: Session, upload: BiomarkerUpload) -> None:
+    db.rollback()
+    upload.status = "failed"
+    db.commit()
+
+
+def _create_uploads(db: Session, user_id: int, files: List[tuple]) -> List[int]:
+    """Create "processing" uploads for (filename, content_digest) pairs in one commit"""
+    uploads = [
+        BiomarkerUpload(user_id=user_id, filename=filename, status="processing", content_digest=content_digest)
+        for filename, content_digest in files
+    ]
+    db.add_all(uploads)
+    db.flush()
+    upload_ids = [upload.id for upload in uploads]
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    return upload_ids
+
+
+def _complete_uploads(
+    db: Session,
+    prepared_by_id: Dict[int, PreparedUpload],
+    failed_ids: List[int],
+    chronological_age: int
+) -> Dict[int, AnalysisResult]:
+    """Load every prepared upload of a batch in one transaction"""
+    all_ids = list(prepared_by_id) + failed_ids
+    # Partitions for the whole batch up front: the first load starts writing
+    ensure_biomarker_partitions(
+        db.get_bind(), {year for prepared in prepared_by_id.values() for year in prepared.years}
+    )
+    uploads = {
+        upload.id: upload
+        for upload in db.query(BiomarkerUpload).filter(BiomarkerUpload.id.in_(all_ids))
+    }
+    
+    try:
+        for upload_id, prepared in prepared_by_id.items():
+            load_prepared_upload(db, uploads[upload_id], prepared, chronological_age)
+        for upload_id in failed_ids:
+            uploads[upload_id].status = "failed"
+        db.commit()
+    except Exception:
+        db.rollback()
+        db.query(BiomarkerUpload).filter(BiomarkerUpload.id.in_(all_ids)).update(
+            {"status": "failed"}, synchronize_session=False
+        )
+        db.commit()
+        raise
+    
+    return {
+        analysis.upload_id: analysis
+        for analysis in db.query(AnalysisResult).filter(AnalysisResult.upload_id.in_(list(prepared_by_id)))
+    }
+
+
+def _find_duplicates(db: Session, user_id: int, digests: List[str]) -> Dict[str, dict]:
+    """
+    Find this user's existing uploads of identical bytes, keyed by digest.
+    Failed uploads give up their digest so the same file can be retried.
+    """
+    duplicates = {}
+    released = False
+    
+    for upload in db.query(BiomarkerUpload).filter(
+        BiomarkerUpload.user_id == user_id,
+        BiomarkerUpload.content_digest.in_(digests)
+    ):
+        if upload.status == "failed":
+            upload.content_digest = None
+            released = True
+        else:
+            duplicates[upload.content_digest] = {"upload_id": upload.id, "status": upload.status}
+    
+    if released:
+        db.commit()
+    
+    if duplicates:
+        upload_ids = [duplicate["upload_id"] for duplicate in duplicates.values()]
+        analyses = {
+            analysis.upload_id: analysis
+            for analysis in db.query(AnalysisResult).filter(AnalysisResult.upload_id.in_(upload_ids))
+        }
+        row_counts = dict(
+            db.query(BiomarkerData.upload_id, func.count(BiomarkerData.id))
+            .filter(BiomarkerData.upload_id.in_(upload_ids))
+            .group_by(BiomarkerData.upload_id)
+            .all()
+        )
+        for duplicate in duplicates.values():
+            analysis = analyses.get(duplicate["upload_id"])
+            duplicate["records_processed"] = row_counts.get(duplicate["upload_id"], 0)
+            duplicate["analysis"] = _serialize_analysis(analysis) if analysis else None
+    
+    return duplicates
+
+
+def _duplicate_response(duplicate: dict):
+    """Short-circuit response pointing at the original upload of identical bytes"""
+    if duplicate["status"] == "processing":
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "message": "Identical file is already being processed",
+                "upload_id": duplicate["upload_id"],
+                "status": duplicate["status"],
+                "duplicate": True,
+                "status_url": f"/biomarkers/uploads/{duplicate['upload_id']}/status"
+            }
+        )
+    
+    return {
+        "message": "Identical file already uploaded; returning existing analysis",
+        "upload_id": duplicate["upload_id"],
+        "duplicate": True,
+        "records_processed": duplicate["records_processed"],
+        "analysis": duplicate["analysis"]
+    }
+
+
+def _serialize_analysis(analysis_result: AnalysisResult) -> dict:
+    return {
+        "biological_age": analysis_result.biological_age,
+        "chronological_age": analysis_result.chronological_age,
+        "age_difference": analysis_result.chronological_age - analysis_result.biological_age,
+        "inflammation_score": analysis_result.inflammation_score,
+        "metabolic_health_score": analysis_result.metabolic_health_score,
+        "cardiovascular_risk": analysis_result.cardiovascular_risk,
+        "calculated_at": analysis_result.calculated_at.isoformat()
+    }
+
+
+async def _concurrent_duplicate_response(db: Session, user_id: int, content_digest: str):
+    """An identical upload committed between our duplicate check and insert; return that one"""
+    duplicates = await run_in_db_pool(_find_duplicates, db, user_id, [content_digest])
+    if content_digest not in duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An identical upload is in progress, please retry"
+        )
+    return _duplicate_response(duplicates[content_digest])
+
+
 @router.post("/upload")
 async def upload_biomarkers(
     file: UploadFile = File(...),
     chronological_age: int = 30,
-    current_user: User = Depends(get_current_user),
+    async_mode: bool = False,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    """Upload CSV file with biomarker data"""
+    """
+    Upload CSV file with biomarker data
+
+    With async_mode=true the file is queued for a background worker and the
+    request returns 202 immediately; poll /biomarkers/uploads/{id}/status.
+
+    Re-uploading byte-identical content returns the original upload and its
+    analysis (duplicate=true) without parsing or inserting anything.
+
+    Only reading the request body happens on the event loop: parsing and
+    analysis run in the process pool, database writes in the DB thread pool.
+    """
     
     if not file.filename.endswith('.csv'):
         raise HTTPException(
@@ -25,105 +233,261 @@ async def upload_biomarkers(
             detail="Only CSV files are allowed"
         )
     
+    file_path = None
+    prepared = None
+    queued = False
+    
     try:
-        contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
+        file_path, content_digest = await store_upload_file(file)
         
-        required_columns = ['date', 'cholesterol_total', 'hdl', 'ldl', 'triglycerides', 'glucose', 'crp', 'vitamin_d']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        duplicates = await run_in_db_pool(_find_duplicates, db, current_user.id, [content_digest])
+        if content_digest in duplicates:
+            return _duplicate_response(duplicates[content_digest])
+        
+        missing_columns = await run_in_process_pool(inspect_upload_file, file_path)
         if missing_columns:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Missing required columns: {', '.join(missing_columns)}"
             )
         
-        upload = BiomarkerUpload(
-            user_id=current_user.id,
-            filename=file.filename,
-            status="processing"
-        )
-        db.add(upload)
-        db.commit()
-        db.refresh(upload)
-        
-        biomarker_records = []
-        for _, row in df.iterrows():
-            biomarker = BiomarkerData(
-                upload_id=upload.id,
-                date=pd.to_datetime(row['date']),
-                cholesterol_total=float(row['cholesterol_total']),
-                hdl=float(row['hdl']),
-                ldl=float(row['ldl']),
-                triglycerides=float(row['triglycerides']),
-                glucose=float(row['glucose']),
-                crp=float(row['crp']),
-                vitamin_d=float(row['vitamin_d'])
+        if async_mode:
+            try:
+                upload = await run_in_db_pool(
+                    enqueue_upload, db, current_user.id, file.filename, file_path, chronological_age, content_digest
+                )
+            except IntegrityError:
+                return await _concurrent_duplicate_response(db, current_user.id, content_digest)
+            queued = True
+            
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={
+                    "message": "Biomarkers accepted for processing",
+                    "upload_id": upload.id,
+                    "status": upload.status,
+                    "status_url": f"/biomarkers/uploads/{upload.id}/status"
+                }
             )
-            biomarker_records.append(biomarker)
         
-        db.bulk_save_objects(biomarker_records)
-        db.commit()
-        
-        latest_data = df.iloc[-1]
-        analysis = calculate_health_analysis(latest_data, chronological_age)
+        try:
+            upload = await run_in_db_pool(_create_upload, db, current_user.id, file.filename, content_digest)
+        except IntegrityError:
+            return await _concurrent_duplicate_response(db, current_user.id, content_digest)
         
-        analysis_result = AnalysisResult(
-            upload_id=upload.id,
-            biological_age=analysis['biological_age'],
-            chronological_age=chronological_age,
-            inflammation_score=analysis['inflammation_score'],
-            metabolic_health_score=analysis['metabolic_health_score'],
-            cardiovascular_risk=analysis['cardiovascular_risk']
-        )
-        db.add(analysis_result)
-        
-        upload.status = "completed"
-        db.commit()
-        db.refresh(analysis_result)
+        prepared = await run_in_process_pool(prepare_upload_file, file_path, upload.id, chronological_age)
+        analysis_result = await run_in_db_pool(_complete_upload, db, upload, prepared, chronological_age)
         
         return {
             "message": "Biomarkers uploaded and analyzed successfully",
             "upload_id": upload.id,
-            "records_processed": len(df),
-            "analysis": {
-                "biological_age": analysis_result.biological_age,
-                "chronological_age": analysis_result.chronological_age,
-                "age_difference": chronological_age - analysis_result.biological_age,
-                "inflammation_score": analysis_result.inflammation_score,
-                "metabolic_health_score": analysis_result.metabolic_health_score,
-                "cardiovascular_risk": analysis_result.cardiovascular_risk,
-                "calculated_at": analysis_result.calculated_at.isoformat()
-            }
+            "records_processed": prepared.records_processed,
+            "analysis": _serialize_analysis(analysis_result)
         }
         
+    except HTTPException:
+        raise
     except pd.errors.EmptyDataError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="CSV file is empty"
         )
     except Exception as e:
-        db.rollback()
         if 'upload' in locals():
-            upload.status = "failed"
-            db.commit()
+            await run_in_db_pool(_mark_upload_failed, db, upload)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing file: {str(e)}"
         )
+    finally:
+        summary_cache.invalidate(current_user.id)
+        remove_upload_files(*(prepared.paths if prepared else ()))
+        if not queued:
+            remove_upload_files(file_path)
+
+
+@router.post("/upload/batch")
+async def upload_biomarkers_batch(
+    files: List[UploadFile] = File(...),
+    chronological_age: int = 30,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload several CSV files, or a single ZIP of CSV files, in one request
+
+    Files are validated, parsed and scored in parallel in the process pool,
+    then loaded in a single transaction. Returns one result per file.
+    """
+    stored = []  # (filename, stored path, content digest)
+    prepared_files = []
+    
+    try:
+        if len(files) == 1 and files[0].filename.lower().endswith('.zip'):
+            zip_path, _ = await store_upload_file(files[0], suffix=".zip")
+            try:
+                stored = await run_in_process_pool(extract_csv_members, zip_path, UPLOAD_BATCH_MAX_FILES)
+            except (zipfile.BadZipFile, ValueError) as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid ZIP file: {str(e)}"
+                )
+            finally:
+                remove_upload_files(zip_path)
+        else:
+            if len(files) > UPLOAD_BATCH_MAX_FILES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Too many files (maximum {UPLOAD_BATCH_MAX_FILES})"
+                )
+            for file in files:
+                if not file.filename.endswith('.csv'):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Only CSV files or a single ZIP file are allowed: {file.filename}"
+                    )
+                stored.append((file.filename, *await store_upload_file(file)))
+        
+        if not stored:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No CSV files found"
+            )
+        
+        results = [{"filename": filename} for filename, _, _ in stored]
+        
+        # Files already uploaded before get the original upload; repeats within
+        # the batch are processed once and copied from the first occurrence
+        duplicates = await run_in_db_pool(
+            _find_duplicates, db, current_user.id, list({digest for _, _, digest in stored})
+        )
+        first_index = {}
+        pending = []
+        for index, (_, _, digest) in enumerate(stored):
+            if digest in duplicates:
+                duplicate = duplicates[digest]
+                results[index].update(
+                    status=duplicate["status"],
+                    upload_id=duplicate["upload_id"],
+                    duplicate=True,
+                    records_processed=duplicate["records_processed"],
+                    analysis=duplicate["analysis"]
+                )
+            elif digest in first_index:
+                continue
+            else:
+                first_index[digest] = index
+                pending.append(index)
+        
+        # Column validation for every file in parallel
+        inspections = await asyncio.gather(
+            *(run_in_process_pool(inspect_upload_file, stored[index][1]) for index in pending),
+            return_exceptions=True
+        )
+        valid = []
+        for index, outcome in zip(pending, inspections):
+            if isinstance(outcome, pd.errors.EmptyDataError):
+                results[index].update(status="failed", error="CSV file is empty")
+            elif isinstance(outcome, Exception):
+                results[index].update(status="failed", error=f"Error processing file: {str(outcome)}")
+            elif outcome:
+                results[index].update(status="failed", error=f"Missing required columns: {', '.join(outcome)}")
+            else:
+                valid.append(index)
+        
+        if valid:
+            try:
+                upload_ids = await run_in_db_pool(
+                    _create_uploads, db, current_user.id, [(stored[index][0], stored[index][2]) for index in valid]
+                )
+            except IntegrityError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="An identical upload is in progress, please retry"
+                )
+            for index, upload_id in zip(valid, upload_ids):
+                results[index]["upload_id"] = upload_id
+            
+            # Parse and score every valid file in parallel
+            outcomes = await asyncio.gather(
+                *(
+                    run_in_process_pool(prepare_upload_file, stored[index][1], upload_id, chronological_age)
+                    for index, upload_id in zip(valid, upload_ids)
+                ),
+                return_exceptions=True
+            )
+            prepared_by_id = {}
+            failed_ids = []
+            for index, upload_id, outcome in zip(valid, upload_ids, outcomes):
+                if isinstance(outcome, Exception):
+                    failed_ids.append(upload_id)
+                    results[index].update(status="failed", error=f"Error processing file: {str(outcome)}")
+                else:
+                    prepared_files.append(outcome)
+                    prepared_by_id[upload_id] = outcome
+            
+            try:
+                analyses = await run_in_db_pool(
+                    _complete_uploads, db, prepared_by_id, failed_ids, chronological_age
+                )
+            except Exception as e:
+                for index in valid:
+                    results[index].update(status="failed", error=f"Error processing file: {str(e)}")
+                analyses = {}
+            
+            for index, upload_id in zip(valid, upload_ids):
+                if upload_id in analyses:
+                    results[index].update(
+                        status="completed",
+                        records_processed=prepared_by_id[upload_id].records_processed,
+                        analysis=_serialize_analysis(analyses[upload_id])
+                    )
+        
+        for index, (_, _, digest) in enumerate(stored):
+            if "status" not in results[index]:
+                original = {key: value for key, value in results[first_index[digest]].items() if key != "filename"}
+                results[index].update(original, duplicate=True)
+        
+        completed = sum(1 for result in results if result["status"] == "completed")
+        
+        return {
+            "message": "Batch processed",
+            "total_files": len(results),
+            "completed": completed,
+            "failed": len(results) - completed,
+            "results": results
+        }
+    
+    finally:
+        summary_cache.invalidate(current_user.id)
+        remove_upload_files(*(path for prepared in prepared_files for path in prepared.paths))
+        remove_upload_files(*(path for _, path, _ in stored))
 
 
 @router.get("/uploads")
 def get_user_uploads(
-    current_user: User = Depends(get_current_user),
+    page: PageParams = Depends(get_page_params),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    """Get all uploads for current user"""
-    uploads = db.query(BiomarkerUpload).filter(
+    """Get uploads for current user, newest first; pass next_cursor back as cursor for the next page"""
+    query = db.query(
+        BiomarkerUpload.id,
+        BiomarkerUpload.filename,
+        BiomarkerUpload.upload_date,
+        BiomarkerUpload.status
+    ).filter(BiomarkerUpload.user_id == current_user.id)
+    
+    uploads, next_cursor = keyset_page(
+        query, BiomarkerUpload.upload_date, BiomarkerUpload.id, page.after, page.limit
+    )
+    total_uploads = db.query(func.count(BiomarkerUpload.id)).filter(
         BiomarkerUpload.user_id == current_user.id
-    ).order_by(BiomarkerUpload.upload_date.desc()).all()
+    ).scalar()
     
     return {
-        "total_uploads": len(uploads),
+        "total_uploads": total_uploads,
+        "next_cursor": next_cursor,
         "uploads": [
             {
                 "id": upload.id,
@@ -133,4 +497,41 @@ def get_user_uploads(
             }
             for upload in uploads
         ]
+    }
+
+
+@router.get("/uploads/{upload_id}/status")
+def get_upload_status(
+    upload_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """Get processing status of an upload (used to poll async uploads)"""
+    upload = db.query(BiomarkerUpload).filter(BiomarkerUpload.id == upload_id).first()
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+    
+    if upload.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    job = upload.job
+    analysis = None
+    if upload.status == "completed":
+        analysis = db.query(AnalysisResult).filter(
+            AnalysisResult.upload_id == upload_id
+        ).first()
+    
+    return {
+        "upload_id": upload.id,
+        "filename": upload.filename,
+        "status": upload.status,
+        "records_processed": job.records_processed if job else None,
+        "error": job.error if job else None,
+        "analysis": _serialize_analysis(analysis) if analysis else None
     }
\ No newline at end of file
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from models import User, BiomarkerUpload
-from dependencies import get_db, get_current_user,get_permission_checker
+from models import BiomarkerUpload
+from dependencies import get_db, get_current_user,get_permission_checker, PageParams, get_page_params, UserSnapshot
+from utils import keyset_page
 from rbac import PermissionChecker, PermissionRegistry, Resource, ResourceOwnershipValidator
 
 router = APIRouter(prefix="/protected", tags=["Protected"])
 
 @router.get("/user")
 def protected_user_route(
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     checker: PermissionChecker = Depends(get_permission_checker)
 ):
     """Get current user profile"""
@@ -26,14 +28,31 @@ def protected_user_route(
     }
 
 @router.get("/dashboard")
-def user_dashboard(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    uploads = db.query(BiomarkerUpload).filter(BiomarkerUpload.user_id == current_user.id).all()
+def user_dashboard(
+    page: PageParams = Depends(get_page_params),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    query = db.query(
+        BiomarkerUpload.id,
+        BiomarkerUpload.filename,
+        BiomarkerUpload.upload_date,
+        BiomarkerUpload.status
+    ).filter(BiomarkerUpload.user_id == current_user.id)
+    
+    uploads, next_cursor = keyset_page(
+        query, BiomarkerUpload.upload_date, BiomarkerUpload.id, page.after, page.limit
+    )
+    total_uploads = db.query(func.count(BiomarkerUpload.id)).filter(
+        BiomarkerUpload.user_id == current_user.id
+    ).scalar()
     
     return {
         "message": f"Welcome to your dashboard, {current_user.full_name}!",
         "user_id": current_user.id,
         "role": current_user.role.value,
-        "total_uploads": len(uploads),
+        "total_uploads": total_uploads,
+        "next_cursor": next_cursor,
         "uploads": [
             {
                 "id": upload.id,
@@ -0,0 +1,34 @@
+import time
+
+from auth_strategies import TokenDenylist
+
+
+def test_revoked_jti_is_denied_until_exp():
+    denylist = TokenDenylist(max_token_lifetime=60)
+    payload = {"sub": "1", "jti": "a", "iat": time.time(), "exp": time.time() + 60}
+
+    assert not denylist.is_revoked(payload)
+    denylist.revoke_token("a", payload["exp"])
+    assert denylist.is_revoked(payload)
+    assert not denylist.is_revoked({**payload, "jti": "b"})
+
+
+def test_user_cutoff_denies_only_older_tokens():
+    denylist = TokenDenylist(max_token_lifetime=60)
+    old = {"sub": "1", "jti": "a", "iat": time.time()}
+    denylist.revoke_user(1)
+    new = {"sub": "1", "jti": "b", "iat": time.time() + 1}
+
+    assert denylist.is_revoked(old)
+    assert denylist.is_revoked({"sub": "1"})
+    assert not denylist.is_revoked(new)
+    assert not denylist.is_revoked({**old, "sub": "2"})
+
+
+def test_expired_entries_are_pruned():
+    denylist = TokenDenylist(max_token_lifetime=0)
+    denylist.revoke_token("a", time.time() - 1)
+    denylist.revoke_user(1, before=time.time() - 1)
+    denylist._next_prune = 0.0
+    denylist.revoke_token("b", time.time() + 60)
+    assert len(denylist) == 1
@@ -0,0 +1,85 @@
+import time
+
+from jose import jwt
+
+from auth_strategies import JWTService, JWTStrategy
+from utils.cache import TTLCache
+
+
+class CountingStrategy(JWTStrategy):
+    """Accepts any token, returning the payload it was created with"""
+
+    def __init__(self, payload, algorithm="HS256"):
+        self.payload = payload
+        self.algorithm = algorithm
+        self.decodes = 0
+
+    def encode(self, payload):
+        return make_token(self.algorithm)
+
+    def decode(self, token, header=None):
+        self.decodes += 1
+        return dict(self.payload)
+
+    def get_algorithm(self):
+        return self.algorithm
+
+
+def make_token(algorithm="HS256", sub="1"):
+    """A token whose header names algorithm (the signature is never checked by CountingStrategy)"""
+    return jwt.encode({"sub": sub}, "secret", algorithm="HS256", headers={"alg": algorithm})
+
+
+def test_repeat_tokens_skip_verification():
+    strategy = CountingStrategy({"sub": "1", "exp": time.time() + 60})
+    service = JWTService(strategy, token_cache=TTLCache(300, 10))
+    token = make_token()
+
+    assert service.decode_token(token)["sub"] == "1"
+    assert service.decode_token(token)["sub"] == "1"
+    assert strategy.decodes == 1
+
+    service.evict_token(token)
+    service.decode_token(token)
+    assert strategy.decodes == 2
+
+
+def test_cached_payload_expires_with_the_token():
+    strategy = CountingStrategy({"sub": "1", "exp": time.time() + 0.05})
+    service = JWTService(strategy, token_cache=TTLCache(300, 10))
+    token = make_token()
+
+    service.decode_token(token)
+    time.sleep(0.06)
+    service.decode_token(token)
+    assert strategy.decodes == 2
+
+
+def test_callers_cannot_mutate_the_cached_payload():
+    strategy = CountingStrategy({"sub": "1", "exp": time.time() + 60})
+    service = JWTService(strategy, token_cache=TTLCache(300, 10))
+    token = make_token()
+
+    service.decode_token(token)["sub"] = "2"
+    assert service.decode_token(token)["sub"] == "1"
+
+
+def test_tokens_dispatch_to_the_strategy_named_by_alg():
+    hs256 = CountingStrategy({"sub": "hs"}, "HS256")
+    rs256 = CountingStrategy({"sub": "rs"}, "RS256")
+    service = JWTService(hs256, [rs256])
+
+    assert service.decode_token(make_token("RS256"))["sub"] == "rs"
+    assert (hs256.decodes, rs256.decodes) == (0, 1)
+
+    assert service.decode_token(make_token("HS256"))["sub"] == "hs"
+    assert (hs256.decodes, rs256.decodes) == (1, 1)
+
+
+def test_unknown_alg_and_malformed_tokens_are_rejected_without_verifying():
+    strategy = CountingStrategy({"sub": "1"})
+    service = JWTService(strategy)
+
+    assert service.decode_token(make_token("none")) is None
+    assert service.decode_token("not-a-jwt") is None
+    assert strategy.decodes == 0
@@ -1,5 +1,5 @@
 import os
-from .fixtures import db_session
+from .fixtures import db_session, app, auth_headers
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from tests.fixtures import create_user_headers
+
+
+@contextmanager
+def count_statements():
+    from dependencies.database import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_cached_user_needs_no_queries(app):
+    headers = create_user_headers("user")
+    client = TestClient(app)
+
+    assert client.get("/protected/user", headers=headers).status_code == 200
+    with count_statements() as statements:
+        response = client.get("/protected/user", headers=headers)
+    assert response.status_code == 200
+    assert statements == []
+
+
+def test_user_changes_invalidate_the_snapshot(app):
+    from dependencies.database import SessionLocal
+    from models import User
+
+    headers = create_user_headers("user")
+    admin_headers = create_user_headers("admin")
+    client = TestClient(app)
+
+    user = client.get("/auth/me", headers=headers).json()
+    assert user["full_name"] == "Test User"
+
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == user["id"]).one().full_name = "Renamed"
+        db.commit()
+    finally:
+        db.close()
+    assert client.get("/auth/me", headers=headers).json()["full_name"] == "Renamed"
+
+    response = client.delete(f"/admin/users/{user['id']}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_stateless_mode_authorizes_from_token_claims(app, monkeypatch):
+    import dependencies.auth
+    from utils.cache import user_cache
+
+    monkeypatch.setattr(dependencies.auth, "AUTH_STATELESS", True)
+    headers = create_user_headers("user")
+    client = TestClient(app)
+    user_cache.clear()
+
+    with count_statements() as statements:
+        response = client.get("/biomarkers/uploads", headers=headers)
+    assert response.status_code == 200, response.text
+    assert not [statement for statement in statements if "FROM users" in statement]
+
+
+def test_logout_revokes_only_that_token(app):
+    from auth_strategies import get_jwt_service
+
+    headers = create_user_headers("user")
+    user_id = get_jwt_service().decode_token(headers["Authorization"].split()[1])["sub"]
+    other_token = get_jwt_service().create_access_token(data={"sub": user_id, "role": "user"})
+    client = TestClient(app)
+
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {other_token}"}).status_code == 200
+
+
+def test_role_change_revokes_existing_tokens(app):
+    from dependencies.database import SessionLocal
+    from models import User, UserRole
+
+    headers = create_user_headers("user")
+    client = TestClient(app)
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == user_id).one().role = UserRole.ADMIN
+        db.commit()
+    finally:
+        db.close()
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_register_is_not_queued_behind_upload_writes(app):
+    import threading
+    import uuid
+
+    from config import UPLOAD_DB_THREADS
+    from utils.executors import get_db_pool
+
+    # Every db-write thread busy, as with large concurrent upload loads
+    release = threading.Event()
+    busy = [get_db_pool().submit(release.wait, 30) for _ in range(UPLOAD_DB_THREADS)]
+    try:
+        response = TestClient(app).post("/auth/register", json={
+            "email": f"register-{uuid.uuid4().hex}@example.com",
+            "password": "a-long-password",
+            "full_name": "Register Test",
+        })
+        assert response.status_code == 201, response.text
+        assert not any(future.done() for future in busy)
+    finally:
+        release.set()
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+
+from dependencies.database import InstrumentedQueuePool
+from tests.fixtures import create_user_headers
+
+
+def test_pool_records_overflow_and_timeouts():
+    engine = create_engine(
+        os.getenv("TEST_DATABASE_URL"),
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    try:
+        first = engine.connect()
+        second = engine.connect()  # beyond pool_size: an overflow connection
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        stats = engine.pool.stats()
+        assert (stats["checked_out"], stats["peak_checked_out"]) == (2, 2)
+        assert (stats["checkouts"], stats["overflow_opened"], stats["timeouts"]) == (2, 1, 1)
+        assert sum(stats["wait_ms"]["histogram"].values()) == 2
+
+        second.close()
+        first.close()
+        assert engine.pool.stats()["checked_out"] == 0
+    finally:
+        engine.dispose()
+
+
+def test_overflow_is_counted_by_the_recreated_pool():
+    engine = create_engine(
+        os.getenv("TEST_DATABASE_URL"),
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    try:
+        engine.connect().close()
+        # dispose() replaces the pool; the new one counts its own connections
+        engine.dispose()
+        first, second = engine.connect(), engine.connect()
+        stats = engine.pool.stats()
+        assert (stats["checkouts"], stats["overflow_opened"]) == (2, 1)
+        second.close()
+        first.close()
+    finally:
+        engine.dispose()
+
+
+def test_session_checks_out_a_connection_on_first_statement():
+    from dependencies.database import SessionLocal, engine
+
+    before = engine.pool.stats()["checkouts"]
+    db = SessionLocal()
+    try:
+        assert engine.pool.stats()["checkouts"] == before
+        db.execute(text("SELECT 1"))
+        assert engine.pool.stats()["checkouts"] == before + 1
+    finally:
+        db.close()
+
+
+def test_db_pool_endpoint_is_admin_only(app):
+    client = TestClient(app)
+
+    assert client.get("/admin/db-pool", headers=create_user_headers("user")).status_code == 403
+
+    response = client.get("/admin/db-pool", headers=create_user_headers("admin"))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["capacity"] == body["pool"]["pool_size"] + body["pool"]["max_overflow"]
+    assert body["max_concurrent_sessions"] == sum(body["threads"].values())
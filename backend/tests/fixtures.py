@@ -1,4 +1,5 @@
 import os
+import uuid
 from pathlib import Path
 from dotenv import load_dotenv
 import pytest
@@ -12,14 +13,60 @@ load_dotenv(env_path)
 
 print(f"TEST_DATABASE_URL: {os.getenv('TEST_DATABASE_URL')}")
 
+# Point the application at the test database before any app module reads its config
+if os.getenv("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL")
+
 @pytest.fixture(scope="session", autouse=True)
 def db_session():
     container = start_database_container()
     
     engine = create_engine(os.getenv("TEST_DATABASE_URL"))
     
-    with engine.begin() as connection:
+    # A plain connection: alembic manages (and commits) the migration transaction itself,
+    # which migrations with autocommit blocks (CREATE INDEX CONCURRENTLY) rely on
+    with engine.connect() as connection:
         # Pass just the ini filename, the function will find the correct path
         migrate_to_db("alembic", "alembic.ini", connection)
     
-    yield engine
\ No newline at end of file
+    yield engine
+
+
+def create_user_headers(role="user"):
+    """Create a user directly in the test database and return bearer headers for it"""
+    from dependencies.database import SessionLocal
+    from models import User, UserRole
+    from auth_strategies import get_jwt_service
+
+    db = SessionLocal()
+    try:
+        user = User(
+            email=f"{role}-{uuid.uuid4().hex}@example.com",
+            full_name="Test User",
+            password_hash="not-a-real-hash",
+            role=UserRole(role),
+            is_active=1
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        token = get_jwt_service().create_access_token(
+            data={"sub": str(user.id), "role": user.role.value}
+        )
+    finally:
+        db.close()
+
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+def app(db_session):
+    """The FastAPI application, bound to the migrated test database"""
+    from main import app
+    return app
+
+
+@pytest.fixture
+def auth_headers(db_session):
+    """Bearer headers for a fresh regular user"""
+    return create_user_headers("user")
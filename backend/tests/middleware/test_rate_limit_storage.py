@@ -0,0 +1,99 @@
+import multiprocessing
+import time
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+from middleware.rate_limit_storage import SharedMemoryStorage, DatabaseStorage
+
+
+@pytest.fixture
+def shm_uri(tmp_path):
+    return f"shm://{tmp_path / 'rate-limits'}?slots=256&stripes=8"
+
+
+def _hit_shared_key(uri, strategy, results):
+    limiter = strategy(storage_from_string(uri))
+    results.put(sum(limiter.hit(parse("50/hour"), "shared") for _ in range(40)))
+
+
+@pytest.mark.parametrize("strategy", [FixedWindowRateLimiter, SlidingWindowCounterRateLimiter])
+def test_shared_memory_limit_holds_across_processes(shm_uri, strategy):
+    storage_from_string(shm_uri)
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_hit_shared_key, args=(shm_uri, strategy, results)) for _ in range(3)]
+    for process in workers:
+        process.start()
+    allowed = sum(results.get(timeout=30) for _ in workers)
+    for process in workers:
+        process.join()
+
+    assert allowed == 50
+
+
+def test_shared_memory_counters_expire_and_clear(shm_uri):
+    storage = storage_from_string(shm_uri)
+    assert isinstance(storage, SharedMemoryStorage)
+
+    assert [storage.incr("a", 0.2) for _ in range(3)] == [1, 2, 3]
+    assert storage.decr("a") == 2
+    assert storage.get("a") == 2
+    assert time.time() < storage.get_expiry("a") <= time.time() + 0.2
+
+    time.sleep(0.25)
+    assert storage.get("a") == 0
+    assert storage.incr("a", 10) == 1
+
+    storage.clear("a")
+    assert storage.get("a") == 0
+    assert storage.reset() == 0
+
+
+def test_full_stripe_evicts_the_soonest_expiring_entry(tmp_path):
+    storage = SharedMemoryStorage(f"shm://{tmp_path / 'tiny'}?slots=4&stripes=1")
+    storage.incr("short", 1)
+    for key in ("a", "b", "c"):
+        storage.incr(key, 60)
+
+    storage.incr("d", 60)
+
+    assert storage.get("short") == 0
+    assert [storage.get(key) for key in ("a", "b", "c", "d")] == [1, 1, 1, 1]
+
+
+def test_table_geometry_must_match(tmp_path):
+    SharedMemoryStorage(f"shm://{tmp_path / 'table'}?slots=16&stripes=4")
+    with pytest.raises(ValueError):
+        SharedMemoryStorage(f"shm://{tmp_path / 'table'}?slots=32&stripes=4")
+
+
+def test_database_storage_counts_in_one_window():
+    storage = storage_from_string("db://")
+    assert isinstance(storage, DatabaseStorage)
+    storage.reset()
+
+    limiter = SlidingWindowCounterRateLimiter(storage)
+    limit = parse("3/minute")
+    assert [limiter.hit(limit, "client") for _ in range(4)] == [True, True, True, False]
+    assert limiter.get_window_stats(limit, "client").remaining == 0
+
+    assert storage.incr("short", 0.2) == 1
+    time.sleep(0.25)
+    assert storage.get("short") == 0
+    assert storage.incr("short", 10) == 1
+
+
+def test_database_storage_has_its_own_pool():
+    from dependencies.database import engine
+
+    storage = storage_from_string("db://?pool_size=1")
+    assert storage.engine is not engine
+    assert storage.engine.pool.size() == 1
+
+    checked_out = engine.pool.checkedout()
+    storage.incr("own-pool", 60)
+    assert storage.engine.pool.checkedin() == 1
+    assert engine.pool.checkedout() == checked_out
@@ -0,0 +1,89 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from tests.fixtures import create_user_headers
+
+
+def add_uploads(count):
+    from dependencies.database import SessionLocal
+    from models import User, BiomarkerUpload, AnalysisResult
+
+    db = SessionLocal()
+    try:
+        user = User(email=f"uploads-{datetime.utcnow().timestamp()}@example.com", full_name="Uploader", password_hash="x")
+        db.add(user)
+        db.flush()
+        for i in range(count):
+            upload = BiomarkerUpload(
+                user_id=user.id,
+                filename=f"file_{i}.csv",
+                status="completed",
+                upload_date=datetime(2100, 1, 1) + timedelta(minutes=i)
+            )
+            db.add(upload)
+            db.flush()
+            if i % 2 == 0:
+                db.add(AnalysisResult(
+                    upload_id=upload.id,
+                    biological_age=40,
+                    chronological_age=42,
+                    inflammation_score=90,
+                    metabolic_health_score=95,
+                    cardiovascular_risk="low"
+                ))
+        db.commit()
+    finally:
+        db.close()
+
+
+@contextmanager
+def count_statements():
+    from dependencies.database import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def fetch_all_uploads(client, headers):
+    with count_statements() as statements:
+        response = client.get("/admin/all-uploads", headers=headers, params={"limit": 500})
+    assert response.status_code == 200, response.text
+    return response.json(), len(statements)
+
+
+def test_all_uploads_runs_a_constant_number_of_queries(app):
+    headers = create_user_headers("admin")
+    client = TestClient(app)
+    # Warm the user snapshot cache so the auth lookup isn't counted
+    client.get("/protected/user", headers=headers)
+
+    add_uploads(5)
+    small, small_statements = fetch_all_uploads(client, headers)
+
+    add_uploads(300)
+    large, large_statements = fetch_all_uploads(client, headers)
+
+    assert len(large["uploads"]) == len(small["uploads"]) + 300
+    assert large_statements == small_statements
+    # COUNT and the joined page query
+    assert large_statements <= 2
+
+    newest = large["uploads"][0]
+    assert newest["filename"] == "file_299.csv"
+    assert newest["user"]["full_name"] == "Uploader"
+    latest_batch = [upload for upload in large["uploads"] if upload["user"]["id"] == newest["user"]["id"]]
+    assert len(latest_batch) == 300
+    for upload in latest_batch:
+        index = int(upload["filename"][len("file_"):-len(".csv")])
+        assert (upload["analysis"] is not None) == (index % 2 == 0)
@@ -0,0 +1,79 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from tests.fixtures import create_user_headers
+
+# Out of date order, with a tie and fractional seconds
+CSV = b"""date,cholesterol_total,hdl,ldl,triglycerides,glucose,crp,vitamin_d
+2024-06-01 13:45:10.123456,190,55,110,90,105,2.1,45
+2023-01-01,200,50,120,150,95,0.8,35
+2024-06-01 13:45:10.123456,191,56,111,91,106,2.2,46
+2025-02-03T04:05:06,230,40,170,220,130,3.5,15
+"""
+
+
+def load_series(upload_id):
+    from dependencies.database import SessionLocal
+    from models import BiomarkerSeries
+
+    db = SessionLocal()
+    try:
+        return db.execute(select(BiomarkerSeries).where(BiomarkerSeries.upload_id == upload_id)).scalars().first()
+    finally:
+        db.close()
+
+
+def test_packed_series_serves_the_same_biomarkers_as_the_rows(app):
+    from middleware.rate_limiter import limiter
+    from utils import decode_series
+
+    limiter.enabled = False
+    client = TestClient(app)
+    headers = create_user_headers("user")
+    response = client.post("/biomarkers/upload", headers=headers, files={"file": ("series.csv", CSV, "text/csv")})
+    assert response.status_code == 200, response.text
+    upload_id = response.json()["upload_id"]
+
+    series = load_series(upload_id)
+    assert series.row_count == 4
+    arrays = decode_series(series)
+    assert [str(date) for date in arrays["date"]] == [
+        "2023-01-01T00:00:00.000000",
+        "2024-06-01T13:45:10.123456",
+        "2024-06-01T13:45:10.123456",
+        "2025-02-03T04:05:06.000000",
+    ]
+    assert arrays["crp"].tolist() == [0.8, 2.1, 2.2, 3.5]
+
+    packed = client.get(f"/biomarkers/analysis/{upload_id}", headers=headers)
+    # Any date range is read from biomarker_data instead
+    rows = client.get(f"/biomarkers/analysis/{upload_id}", params={"start": "1900-01-01"}, headers=headers)
+    assert packed.status_code == rows.status_code == 200
+    assert packed.json()["biomarkers"] == rows.json()["biomarkers"]
+    assert packed.json()["biomarkers"][0]["date"] == "2023-01-01T00:00:00"
+    assert packed.headers["ETag"]
+
+    assert client.delete(f"/biomarkers/{upload_id}", headers=headers).status_code == 200
+    assert load_series(upload_id) is None
+
+
+def test_missing_values_are_served_as_null(app):
+    from middleware.rate_limiter import limiter
+
+    limiter.enabled = False
+    client = TestClient(app)
+    headers = create_user_headers("user")
+    csv = b"""date,cholesterol_total,hdl,ldl,triglycerides,glucose,crp,vitamin_d
+2024-01-01,190,55,110,90,105,2.1,
+2024-02-01,200,50,120,150,95,0.8,35
+"""
+    response = client.post("/biomarkers/upload", headers=headers, files={"file": ("nulls.csv", csv, "text/csv")})
+    assert response.status_code == 200, response.text
+    upload_id = response.json()["upload_id"]
+    assert load_series(upload_id) is not None
+
+    packed = client.get(f"/biomarkers/analysis/{upload_id}", headers=headers)
+    rows = client.get(f"/biomarkers/analysis/{upload_id}", params={"start": "1900-01-01"}, headers=headers)
+    assert packed.status_code == rows.status_code == 200
+    assert [entry["vitamin_d"] for entry in packed.json()["biomarkers"]] == [None, 35.0]
+    assert packed.json()["biomarkers"] == rows.json()["biomarkers"]
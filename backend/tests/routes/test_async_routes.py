@@ -0,0 +1,68 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from tests.fixtures import create_user_headers
+
+CSV = b"""date,cholesterol_total,hdl,ldl,triglycerides,glucose,crp,vitamin_d
+2024-01-01,200,50,120,150,95,0.8,35
+2024-06-01,190,55,110,90,105,2.1,45
+"""
+
+
+def make_async_app():
+    """An app serving only the DB_ASYNC variants of the analysis and admin read routes"""
+    from routes.biomarkers.analysis import async_router as analysis_router
+    from routes.admin import async_read_router as admin_router
+
+    async_app = FastAPI()
+    async_app.include_router(analysis_router, prefix="/biomarkers")
+    async_app.include_router(admin_router, prefix="/admin")
+    return async_app
+
+
+def test_async_routes_match_sync_routes(app, auth_headers):
+    from dependencies import dispose_async_engine
+    from utils import summary_cache, user_cache
+
+    admin_headers = create_user_headers("admin")
+
+    async def scenario():
+        sync_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        async_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=make_async_app()), base_url="http://test")
+        try:
+            upload = await sync_client.post(
+                "/biomarkers/upload", headers=auth_headers, files={"file": ("a.csv", CSV, "text/csv")}
+            )
+            assert upload.status_code == 200, upload.text
+            upload_id = upload.json()["upload_id"]
+
+            requests = [
+                (f"/biomarkers/analysis/{upload_id}", auth_headers),
+                ("/biomarkers/summary", auth_headers),
+                ("/biomarkers/history", auth_headers),
+                ("/admin/stats", admin_headers),
+                ("/admin/users", admin_headers),
+            ]
+            for path, headers in requests:
+                expected = await sync_client.get(path, headers=headers)
+                # Make the async route load through its own session
+                summary_cache.clear()
+                user_cache.clear()
+                actual = await async_client.get(path, headers=headers)
+                assert (actual.status_code, actual.json()) == (expected.status_code, expected.json()), path
+                assert actual.headers.get("etag") == expected.headers.get("etag"), path
+
+            etag = (await async_client.get(f"/biomarkers/analysis/{upload_id}", headers=auth_headers)).headers["etag"]
+            revalidated = await async_client.get(
+                f"/biomarkers/analysis/{upload_id}", headers={**auth_headers, "If-None-Match": etag}
+            )
+            assert revalidated.status_code == 304
+            assert (await async_client.get("/admin/stats", headers=auth_headers)).status_code == 403
+        finally:
+            await sync_client.aclose()
+            await async_client.aclose()
+            await dispose_async_engine()
+
+    asyncio.run(scenario())
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.fixtures import create_user_headers
+
+CSV = b"""date,cholesterol_total,hdl,ldl,triglycerides,glucose,crp,vitamin_d
+2024-01-01 08:00:00,190,55,110,120,92,1.1,35
+2024-02-01 08:00:00,185,57,105,115,90,0.9,38
+2024-03-01 08:00:00,180,60,100,110,88,0.7,40
+"""
+
+BIOMARKER_COLUMNS = [
+    "upload_id", "filename", "date", "cholesterol_total", "hdl", "ldl",
+    "triglycerides", "glucose", "crp", "vitamin_d",
+]
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    from middleware.rate_limiter import limiter
+
+    limiter.enabled = False
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def owner(client):
+    """Headers of a user with one upload, and that upload's id"""
+    headers = create_user_headers("user")
+    response = client.post("/biomarkers/upload", headers=headers, files={"file": ("export.csv", CSV, "text/csv")})
+    assert response.status_code == 200, response.text
+    return headers, response.json()["upload_id"]
+
+
+def export(client, headers, format, **params):
+    response = client.get("/biomarkers/export", params={"format": format, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_csv_export_has_a_header_and_one_row_per_biomarker_row(client, owner):
+    headers, upload_id = owner
+    response = export(client, headers, "csv")
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == BIOMARKER_COLUMNS
+    assert len(rows) == 4
+    assert rows[1][:4] == [str(upload_id), "export.csv", "2024-01-01T08:00:00", "190.0"]
+    assert [row[8] for row in rows[1:]] == ["1.1", "0.9", "0.7"]
+
+
+def test_ndjson_export_has_one_object_per_line(client, owner):
+    headers, upload_id = owner
+    response = export(client, headers, "ndjson")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = response.text.splitlines()
+    assert len(lines) == 3
+    records = [json.loads(line) for line in lines]
+    assert list(records[0]) == BIOMARKER_COLUMNS
+    assert records[0]["upload_id"] == upload_id
+    assert [record["date"] for record in records] == [
+        "2024-01-01T08:00:00", "2024-02-01T08:00:00", "2024-03-01T08:00:00",
+    ]
+    assert [record["hdl"] for record in records] == [55.0, 57.0, 60.0]
+
+
+def test_parquet_export_round_trips(client, owner):
+    headers, upload_id = owner
+    response = export(client, headers, "parquet")
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names == BIOMARKER_COLUMNS
+    assert str(table.schema.field("date").type) == "timestamp[us]"
+    data = table.to_pydict()
+    assert data["upload_id"] == [upload_id] * 3
+    assert data["glucose"] == [92.0, 90.0, 88.0]
+    assert [date.isoformat() for date in data["date"]] == [
+        "2024-01-01T08:00:00", "2024-02-01T08:00:00", "2024-03-01T08:00:00",
+    ]
+
+
+def test_export_of_one_upload(client, owner):
+    headers, upload_id = owner
+    response = export(client, headers, "ndjson", dataset="analyses", upload_id=upload_id)
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["upload_id"] for record in records] == [upload_id]
+
+
+def test_exporting_another_users_upload_is_denied(client, owner):
+    _, upload_id = owner
+    other_headers = create_user_headers("user")
+
+    response = client.get("/biomarkers/export", params={"upload_id": upload_id}, headers=other_headers)
+    assert response.status_code == 403
+
+    # Nor does a plain export include it
+    response = export(client, other_headers, "ndjson")
+    assert response.text == ""
+
+
+def test_exporting_a_missing_upload_is_not_found(client, owner):
+    headers, _ = owner
+    response = client.get("/biomarkers/export", params={"upload_id": 0}, headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,225 @@
+"""
+Query plan regression suite: the SQL each route runs must not sequentially
+scan a large table.
+
+Statements are captured by calling the routes, then EXPLAINed against a
+seeded copy of the data (inserted and ANALYZEd in a transaction that is
+rolled back, so other tests never see it).
+"""
+import json
+import re
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from tests.fixtures import create_user_headers
+
+# Tables that grow with users and uploads; partitions match by prefix
+LARGE_TABLES = ("biomarker_uploads", "biomarker_data", "biomarker_series", "analysis_results", "analysis_timepoints")
+
+SEED_USERS = 500
+SEED_UPLOADS_PER_USER = 10
+SEED_ROWS_PER_UPLOAD = 20
+# Each upload's rows go back about five years, so every yearly biomarker_data partition is large
+SEED_ROW_INTERVAL_DAYS = 91
+SEED_YEARS = SEED_ROWS_PER_UPLOAD * SEED_ROW_INTERVAL_DAYS // 365 + 1
+
+SEED_SQL = [
+    f"""
+    INSERT INTO users (email, full_name, password_hash, role, is_active, created_at)
+    SELECT 'plan-seed-' || g || '@example.com', 'Seed', 'x', 'USER', 1, now()
+    FROM generate_series(1, {SEED_USERS}) g
+    """,
+    f"""
+    INSERT INTO biomarker_uploads (user_id, filename, upload_date, status, content_digest)
+    SELECT u.id, 'seed.csv', now() - g * interval '1 day', 'completed', md5(u.id || '-' || g)
+    FROM users u, generate_series(1, {SEED_UPLOADS_PER_USER}) g
+    WHERE u.email LIKE 'plan-seed-%'
+    """,
+    f"""
+    INSERT INTO biomarker_data (upload_id, date, cholesterol_total, hdl, ldl, triglycerides, glucose, crp, vitamin_d)
+    SELECT up.id, up.upload_date - g * interval '{SEED_ROW_INTERVAL_DAYS} days', 200, 50, 120, 150, 95, 0.8, 35
+    FROM biomarker_uploads up, generate_series(1, {SEED_ROWS_PER_UPLOAD}) g
+    WHERE up.filename = 'seed.csv'
+    """,
+    """
+    INSERT INTO biomarker_series (upload_id, row_count, dates, cholesterol_total, hdl, ldl, triglycerides,
+                                  glucose, crp, vitamin_d)
+    SELECT id, 0, '', '', '', '', '', '', '', '' FROM biomarker_uploads WHERE filename = 'seed.csv'
+    """,
+    """
+    INSERT INTO analysis_results (upload_id, biological_age, chronological_age, inflammation_score,
+                                  metabolic_health_score, cardiovascular_risk, calculated_at)
+    SELECT id, 40, 42, 90, 95, 'low', now() FROM biomarker_uploads WHERE filename = 'seed.csv'
+    """,
+    """
+    INSERT INTO analysis_timepoints (user_id, upload_id, biomarker_data_id, date, biological_age,
+                                     chronological_age, inflammation_score, metabolic_health_score, cardiovascular_risk)
+    SELECT up.user_id, up.id, d.id, d.date, 40, 42, 90, 95, 'low'
+    FROM biomarker_data d JOIN biomarker_uploads up ON up.id = d.upload_id
+    WHERE up.filename = 'seed.csv'
+    """,
+    "ANALYZE users, biomarker_uploads, biomarker_data, biomarker_series, analysis_results, analysis_timepoints",
+]
+
+# Uploads are dated within the seeded years
+UPLOAD_YEAR = datetime.utcnow().year - 1
+
+CSV_TEMPLATE = """date,cholesterol_total,hdl,ldl,triglycerides,glucose,crp,vitamin_d
+{year}-01-01,200,50,120,150,95,0.8,35
+{year}-06-01,190,55,110,90,105,2.1,45
+"""
+
+
+def csv_for(year):
+    return CSV_TEMPLATE.format(year=year).encode()
+
+
+CSV = csv_for(UPLOAD_YEAR)
+
+# Unfiltered aggregates (e.g. admin totals) read the whole table by design
+TABLE_WIDE = re.compile(r"^\s*SELECT\s+count\((?:(?!\bWHERE\b).)*$", re.IGNORECASE | re.DOTALL)
+
+
+def upload_csv(client, headers, content):
+    response = client.post("/biomarkers/upload", headers=headers, files={"file": ("plan.csv", content, "text/csv")})
+    assert response.status_code == 200, response.text
+    return response.json()["upload_id"]
+
+
+@pytest.fixture(scope="module")
+def route_statements(app):
+    """{route: [(statement, parameters), ...]} for every route under test"""
+    from dependencies.database import engine
+    from middleware.rate_limiter import limiter
+
+    client = TestClient(app)
+    limiter.enabled = False
+    user = create_user_headers("user")
+    admin = create_user_headers("admin")
+    upload_id = upload_csv(client, user, CSV)
+    upload_csv(client, user, csv_for(UPLOAD_YEAR - 1))
+    doomed_upload_id = upload_csv(client, user, csv_for(UPLOAD_YEAR - 2))
+    doomed_user = create_user_headers("user")
+    upload_csv(client, doomed_user, csv_for(UPLOAD_YEAR - 3))
+    doomed_user_id = client.get("/auth/me", headers=doomed_user).json()["id"]
+
+    requests = {
+        "GET /biomarkers/analysis/{id}": lambda: client.get(f"/biomarkers/analysis/{upload_id}", headers=user),
+        "GET /biomarkers/analysis/{id}?start=&end=": lambda: client.get(
+            f"/biomarkers/analysis/{upload_id}",
+            params={"start": f"{UPLOAD_YEAR}-03-01", "end": f"{UPLOAD_YEAR}-12-31"},
+            headers=user
+        ),
+        "GET /biomarkers/summary": lambda: client.get("/biomarkers/summary", headers=user),
+        "GET /biomarkers/history": lambda: client.get("/biomarkers/history", headers=user),
+        "GET /biomarkers/uploads": lambda: client.get("/biomarkers/uploads", headers=user),
+        "GET /biomarkers/uploads/{id}/status": lambda: client.get(f"/biomarkers/uploads/{upload_id}/status", headers=user),
+        "GET /biomarkers/export": lambda: client.get("/biomarkers/export", headers=user),
+        "GET /biomarkers/export?dataset=timepoints": lambda: client.get(
+            "/biomarkers/export", params={"dataset": "timepoints"}, headers=user
+        ),
+        "POST /biomarkers/upload (duplicate)": lambda: client.post(
+            "/biomarkers/upload", headers=user, files={"file": ("again.csv", CSV, "text/csv")}
+        ),
+        "DELETE /biomarkers/{id}": lambda: client.delete(f"/biomarkers/{doomed_upload_id}", headers=user),
+        "GET /admin/all-uploads": lambda: client.get("/admin/all-uploads", headers=admin),
+        "GET /admin/stats": lambda: client.get("/admin/stats", headers=admin),
+        "DELETE /admin/users/{id}": lambda: client.delete(f"/admin/users/{doomed_user_id}", headers=admin),
+    }
+
+    statements = {}
+    for route, send in requests.items():
+        captured = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+                captured.append((statement, parameters[0] if executemany else parameters))
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = send()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert response.status_code == 200, f"{route}: {response.text}"
+        statements[route] = captured
+    return statements
+
+
+@pytest.fixture(scope="module")
+def explain(db_session):
+    """EXPLAIN a captured statement against the seeded data; returns the JSON plan"""
+    from utils import ensure_biomarker_partitions
+
+    this_year = datetime.utcnow().year
+    ensure_biomarker_partitions(db_session, range(this_year - SEED_YEARS, this_year + 1))
+    with db_session.connect() as connection:
+        transaction = connection.begin()
+        try:
+            for statement in SEED_SQL:
+                connection.execute(text(statement))
+            cursor = connection.connection.cursor()
+
+            def run(statement, parameters):
+                sql = cursor.mogrify(statement, parameters).decode()
+                cursor.execute("EXPLAIN (FORMAT JSON) " + sql)
+                plan = cursor.fetchone()[0]
+                return plan if isinstance(plan, list) else json.loads(plan)
+
+            yield run
+        finally:
+            transaction.rollback()
+
+
+def sequential_scans(node):
+    """Large tables read by a Seq Scan anywhere in the plan tree"""
+    scans = []
+    if node.get("Node Type") == "Seq Scan" and node.get("Relation Name", "").startswith(LARGE_TABLES):
+        scans.append(node["Relation Name"])
+    for child in node.get("Plans", []):
+        scans.extend(sequential_scans(child))
+    return scans
+
+
+def scanned_relations(node):
+    """Every table read anywhere in the plan tree"""
+    relations = {node["Relation Name"]} if "Relation Name" in node else set()
+    for child in node.get("Plans", []):
+        relations |= scanned_relations(child)
+    return relations
+
+
+def test_routes_do_not_scan_large_tables(route_statements, explain):
+    failures = []
+    for route, statements in route_statements.items():
+        assert statements, f"{route} ran no SQL"
+        for statement, parameters in statements:
+            if TABLE_WIDE.match(statement):
+                continue
+            scans = sequential_scans(explain(statement, parameters)[0]["Plan"])
+            if scans:
+                failures.append(f"{route}: Seq Scan on {', '.join(scans)}\n{statement}")
+    assert not failures, "\n\n".join(failures)
+
+
+def test_suite_detects_a_sequential_scan(explain):
+    plan = explain("SELECT * FROM biomarker_data WHERE crp > %(crp)s", {"crp": 0.5})
+    scans = sequential_scans(plan[0]["Plan"])
+    assert scans and all(scan.startswith("biomarker_data_y") for scan in scans)
+
+
+def test_date_range_prunes_biomarker_partitions(route_statements, explain):
+    from utils import biomarker_partition_name
+
+    statement, parameters = next(
+        (statement, parameters)
+        for statement, parameters in route_statements["GET /biomarkers/analysis/{id}?start=&end="]
+        if "FROM biomarker_data" in statement
+    )
+    partitions = {
+        relation for relation in scanned_relations(explain(statement, parameters)[0]["Plan"])
+        if relation.startswith("biomarker_data")
+    }
+    assert partitions == {biomarker_partition_name(UPLOAD_YEAR)}
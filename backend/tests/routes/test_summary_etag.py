@@ -0,0 +1,74 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from tests.fixtures import create_user_headers
+
+CSV = b"""date,cholesterol_total,hdl,ldl,triglycerides,glucose,crp,vitamin_d
+2024-01-01 08:00:00,190,55,110,120,92,1.1,35
+2024-02-01 08:00:00,185,57,105,115,90,0.9,38
+"""
+
+
+def summary_statements(client, headers, **request_headers):
+    from dependencies.database import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/biomarkers/summary", headers={**headers, **request_headers})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return response, statements
+
+
+def test_cache_miss_revalidates_with_the_version_probe_only(app):
+    from middleware.rate_limiter import limiter
+    from utils import summary_cache
+
+    limiter.enabled = False
+    client = TestClient(app)
+    headers = create_user_headers("user")
+    response = client.post("/biomarkers/upload", headers=headers, files={"file": ("a.csv", CSV, "text/csv")})
+    assert response.status_code == 200, response.text
+
+    etag = client.get("/biomarkers/summary", headers=headers).headers["ETag"]
+
+    summary_cache.clear()
+    response, statements = summary_statements(client, headers, **{"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    # The probe, not the ranked summary statement
+    assert len(statements) == 1
+    assert "row_number" not in statements[0]
+
+    # Served from a rebuilt cache entry, the ETag is the same
+    summary_cache.clear()
+    assert client.get("/biomarkers/summary", headers=headers).headers["ETag"] == etag
+
+    # A new upload is a new version
+    response = client.post(
+        "/biomarkers/upload", headers=headers,
+        files={"file": ("b.csv", CSV.replace(b"2024-", b"2023-"), "text/csv")}
+    )
+    assert response.status_code == 200, response.text
+    summary_cache.clear()
+    response, _ = summary_statements(client, headers, **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["total_uploads"] == 2
+
+
+def test_user_without_uploads_gets_the_same_etag_from_the_probe(app):
+    from utils import summary_cache
+
+    client = TestClient(app)
+    headers = create_user_headers("user")
+    etag = client.get("/biomarkers/summary", headers=headers).headers["ETag"]
+
+    summary_cache.clear()
+    response = client.get("/biomarkers/summary", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+LARGE_UPLOAD_ROWS = 200_000
+CONCURRENT_UPLOADS = 3
+LATENCY_SAMPLES = 60
+
+
+def make_large_csv(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "date": pd.date_range("2000-01-01", periods=rows, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+        "cholesterol_total": rng.uniform(120, 300, rows).round(1),
+        "hdl": rng.uniform(25, 90, rows).round(1),
+        "ldl": rng.uniform(50, 220, rows).round(1),
+        "triglycerides": rng.uniform(40, 400, rows).round(1),
+        "glucose": rng.uniform(60, 200, rows).round(1),
+        "crp": rng.uniform(0.1, 10, rows).round(2),
+        "vitamin_d": rng.uniform(5, 80, rows).round(1),
+    })
+    return df.to_csv(index=False).encode()
+
+
+def p99(samples):
+    return float(np.percentile(samples, 99))
+
+
+async def measure_auth_me(client, headers, samples):
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        response = await client.get("/auth/me", headers=headers)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+def test_auth_me_p99_stays_flat_during_large_uploads(app, auth_headers):
+    # Distinct content per upload so none is short-circuited as a duplicate
+    csv_files = [make_large_csv(LARGE_UPLOAD_ROWS, seed=i) for i in range(CONCURRENT_UPLOADS)]
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=300) as client:
+            baseline = await measure_auth_me(client, auth_headers, LATENCY_SAMPLES)
+
+            uploads = [
+                asyncio.create_task(client.post(
+                    "/biomarkers/upload",
+                    headers=auth_headers,
+                    files={"file": (f"large_{i}.csv", csv_files[i], "text/csv")},
+                ))
+                for i in range(CONCURRENT_UPLOADS)
+            ]
+            await asyncio.sleep(0.05)
+
+            during = await measure_auth_me(client, auth_headers, LATENCY_SAMPLES)
+            still_in_flight = sum(not task.done() for task in uploads)
+
+            responses = await asyncio.gather(*uploads)
+        return baseline, during, still_in_flight, responses
+
+    baseline, during, still_in_flight, responses = asyncio.run(scenario())
+
+    for response in responses:
+        assert response.status_code == 200, response.text
+        assert response.json()["records_processed"] == LARGE_UPLOAD_ROWS
+
+    # The measurement only means something if uploads overlapped it
+    assert still_in_flight > 0
+
+    baseline_p99 = p99(baseline)
+    during_p99 = p99(during)
+    assert during_p99 < max(5 * baseline_p99, baseline_p99 + 0.25), (
+        f"/auth/me p99 went from {baseline_p99 * 1000:.1f}ms to {during_p99 * 1000:.1f}ms during uploads"
+    )
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from utils.cache import TTLCache
+
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(ttl_seconds=0.05, max_entries=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+
+    def stale_loader():
+        cache.invalidate("user")
+        return "stale"
+
+    assert cache.get_or_load("user", stale_loader) == "stale"
+    assert cache.get("user") is None
+    assert cache.get_or_load("user", lambda: "fresh") == "fresh"
+    assert cache.get_or_load("user", lambda: "unused") == "fresh"
+
+
+def test_invalidations_do_not_accumulate_versions():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    for i in range(1000):
+        cache.invalidate(f"revoked-{i}")
+        cache.get_or_load(f"user-{i}", lambda: i)
+        cache.invalidate(f"user-{i}")
+    assert len(cache._versions) == 0
+
+
+def test_version_is_kept_while_a_load_is_in_flight():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+
+    def outer_loader():
+        # A nested load for the same key finishing first must not drop the
+        # version the outer load still compares against
+        assert cache.get_or_load("user", lambda: "inner") == "inner"
+        cache.invalidate("user")
+        assert len(cache._versions) == 1
+        return "stale"
+
+    assert cache.get_or_load("user", outer_loader) == "stale"
+    assert cache.get("user") is None
+    assert len(cache._versions) == 0
+
+
+def test_failed_load_releases_its_version():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+
+    def failing_loader():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("user", failing_loader)
+    assert len(cache._versions) == 0
@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from utils.executors import BoundedExecutor, ExecutorSaturated
+
+
+def test_submissions_beyond_the_queue_are_rejected():
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = executor.submit(release.wait)
+        queued = executor.submit(lambda: "queued")
+        with pytest.raises(ExecutorSaturated):
+            executor.submit(lambda: "rejected")
+
+        stats = executor.stats()
+        assert (stats["in_flight"], stats["queue_depth"], stats["rejected"]) == (2, 1, 1)
+
+        release.set()
+        assert running.result(timeout=5) is True
+        assert queued.result(timeout=5) == "queued"
+        # Finished work frees capacity again
+        assert executor.submit(lambda: "accepted").result(timeout=5) == "accepted"
+    finally:
+        release.set()
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert (stats["in_flight"], stats["completed"], stats["peak_queue_depth"]) == (0, 3, 1)
+
+
+def test_failing_tasks_release_their_slot():
+    executor = BoundedExecutor(max_workers=1, max_queue=0)
+    try:
+        with pytest.raises(ZeroDivisionError):
+            executor.submit(lambda: 1 / 0).result(timeout=5)
+        assert executor.submit(lambda: 1).result(timeout=5) == 1
+    finally:
+        executor.shutdown()
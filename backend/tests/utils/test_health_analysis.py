@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from utils.health_analysis import calculate_health_analysis, calculate_health_analysis_batch
+
+ROWS = 5_000
+
+
+def make_biomarkers(rows):
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        "cholesterol_total": rng.uniform(100, 320, rows).round(1),
+        "hdl": rng.uniform(20, 95, rows).round(1),
+        "ldl": rng.uniform(40, 240, rows).round(0),
+        "triglycerides": rng.uniform(30, 450, rows).round(0),
+        "glucose": rng.uniform(60, 220, rows).round(0),
+        "crp": rng.uniform(0.1, 10, rows).round(1),
+        "vitamin_d": rng.uniform(5, 90, rows).round(0),
+    })
+    # Exact branch boundaries, missing values and a zero divisor
+    df.loc[0, ["cholesterol_total", "hdl", "crp", "glucose", "triglycerides", "vitamin_d", "ldl"]] = [175, 50, 1.0, 100, 100, 20, 100]
+    df.loc[1, ["cholesterol_total", "hdl", "crp", "glucose", "triglycerides", "vitamin_d", "ldl"]] = [250, 50, 3.0, 126, 200, 40, 160]
+    df.loc[2, ["hdl", "crp", "vitamin_d"]] = [np.nan, np.nan, np.nan]
+    df.loc[3, "hdl"] = 0
+    return df
+
+
+def test_batch_matches_scalar_row_for_row():
+    df = make_biomarkers(ROWS)
+    ages = np.random.default_rng(8).integers(0, 90, ROWS)
+
+    batch = calculate_health_analysis_batch(df, ages)
+
+    for i in range(ROWS):
+        expected = calculate_health_analysis(df.iloc[i], int(ages[i]))
+        assert {key: values[i] for key, values in batch.items()} == expected, i
+
+
+def test_batch_accepts_scalar_age():
+    df = make_biomarkers(10)
+    batch = calculate_health_analysis_batch(df, 45)
+    assert list(batch["biological_age"]) == [
+        calculate_health_analysis(df.iloc[i], 45)["biological_age"] for i in range(10)
+    ]
@@ -0,0 +1,52 @@
+import logging
+
+from utils import log_config
+
+
+def test_records_are_written_by_the_listener_with_request_id(tmp_path):
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    # The app may already have configured logging in this session
+    was_configured = log_config._listener is not None
+    log_config.shutdown_logging()
+    try:
+        log_config.configure_logging(level="INFO", log_dir=str(tmp_path))
+        token = log_config.request_id.set("req-123")
+        try:
+            payload = {"sub": "1"}
+            logging.getLogger("tests.log").info("decoded %s", payload)
+            # Later mutation must not change the queued record
+            payload["sub"] = "2"
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                logging.getLogger("tests.log").exception("failed")
+        finally:
+            log_config.request_id.reset(token)
+        logging.getLogger("tests.log").debug("below the configured level")
+    finally:
+        log_config.shutdown_logging()
+        root.handlers, root.level = saved_handlers, saved_level
+        if was_configured:
+            root.handlers = []
+            log_config.configure_logging()
+
+    (log_file,) = tmp_path.iterdir()
+    content = log_file.read_text()
+    assert "[req-123] - decoded {'sub': '1'}" in content
+    assert "ZeroDivisionError" in content
+    assert "below the configured level" not in content
+
+
+def test_sampled_logs_respect_level_and_rate(caplog):
+    logger = logging.getLogger("tests.sampled")
+    with caplog.at_level(logging.DEBUG, logger="tests.sampled"):
+        for _ in range(10):
+            log_config.log_sampled(logger, logging.DEBUG, "always", rate=1.0)
+            log_config.log_sampled(logger, logging.DEBUG, "never", rate=0.0)
+    assert [record.message for record in caplog.records] == ["always"] * 10
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger="tests.sampled"):
+        log_config.log_sampled(logger, logging.DEBUG, "disabled", rate=1.0)
+    assert caplog.records == []
@@ -0,0 +1,80 @@
+from datetime import datetime
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from utils import biomarker_partition_name, ensure_biomarker_partitions, precreate_biomarker_partitions
+from utils import partitions
+
+
+def partition_bounds(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(text(
+            "SELECT pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'biomarker_data'::regclass AND c.relname = :name"
+        ), {"name": name}).scalar()
+
+
+def test_creates_and_attaches_missing_year_partitions(db_session):
+    ensure_biomarker_partitions(db_session, [1990, 1991])
+    # Already known to this process: no round trip, no error
+    ensure_biomarker_partitions(db_session, [1990])
+
+    assert partition_bounds(db_session, biomarker_partition_name(1990)) == (
+        "FOR VALUES FROM ('1990-01-01 00:00:00') TO ('1991-01-01 00:00:00')"
+    )
+    assert partition_bounds(db_session, biomarker_partition_name(1991)) is not None
+
+
+def test_partition_gets_the_parent_indexes(db_session):
+    ensure_biomarker_partitions(db_session, [1992])
+
+    with db_session.connect() as connection:
+        indexes = connection.execute(text(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = :name"
+        ), {"name": biomarker_partition_name(1992)}).scalars().all()
+    assert any("(id, date)" in index for index in indexes)
+    assert any("(upload_id, date)" in index for index in indexes)
+
+
+def test_precreates_this_and_next_years_partitions(db_session):
+    precreate_biomarker_partitions(db_session)
+
+    year = datetime.utcnow().year
+    for partition_year in (year, year + 1):
+        assert partition_bounds(db_session, biomarker_partition_name(partition_year)) is not None
+
+
+def test_lock_timeout_is_retried(db_session, monkeypatch):
+    monkeypatch.setattr(partitions, "PARTITION_LOCK_TIMEOUT", "100ms")
+    monkeypatch.setattr(partitions, "PARTITION_RETRY_DELAY_SECONDS", 0.1)
+
+    # An open write transaction on biomarker_uploads blocks the ATTACH for a while
+    holder = db_session.connect()
+    transaction = holder.begin()
+    holder.execute(text("LOCK TABLE biomarker_uploads IN ROW EXCLUSIVE MODE"))
+    release = threading.Timer(0.3, transaction.rollback)
+    release.start()
+    try:
+        ensure_biomarker_partitions(db_session, [1993])
+    finally:
+        release.join()
+        holder.close()
+
+    assert partition_bounds(db_session, biomarker_partition_name(1993)) is not None
+
+
+def test_lock_timeout_is_raised_after_the_last_attempt(db_session, monkeypatch):
+    monkeypatch.setattr(partitions, "PARTITION_LOCK_TIMEOUT", "50ms")
+    monkeypatch.setattr(partitions, "PARTITION_RETRY_DELAY_SECONDS", 0.01)
+
+    with db_session.connect() as holder:
+        holder.execute(text("LOCK TABLE biomarker_uploads IN ROW EXCLUSIVE MODE"))
+        with pytest.raises(OperationalError):
+            ensure_biomarker_partitions(db_session, [1994])
+        holder.rollback()
+
+    assert partition_bounds(db_session, biomarker_partition_name(1994)) is None
@@ -0,0 +1,133 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from config import UPLOAD_JOB_TIMEOUT_SECONDS
+from dependencies.database import SessionLocal
+from models import BiomarkerData, UploadJob, User
+from workers import claim_next_job, enqueue_upload, process_job
+from workers.upload_worker import JobHeartbeat
+
+CSV = (
+    "date,cholesterol_total,hdl,ldl,triglycerides,glucose,crp,vitamin_d\n"
+    "2024-01-01 08:00:00,190,55,110,120,92,1.1,35\n"
+    "2024-02-01 08:00:00,185,57,105,115,90,0.9,38\n"
+)
+
+
+@pytest.fixture
+def queued_job(db_session, tmp_path):
+    """One queued job for a fresh user, with the queue otherwise drained"""
+    db = SessionLocal()
+    try:
+        db.execute(update(UploadJob).where(UploadJob.status.in_(["queued", "running"])).values(status="failed"))
+        user = User(email=f"worker-{uuid.uuid4().hex}@example.com", full_name="Worker", password_hash="x", is_active=1)
+        db.add(user)
+        db.commit()
+
+        path = tmp_path / "upload.csv"
+        path.write_text(CSV)
+        upload = enqueue_upload(db, user.id, "upload.csv", str(path), 40)
+        yield upload.job.id
+    finally:
+        db.close()
+
+
+def expire_heartbeat(job_id):
+    db = SessionLocal()
+    try:
+        stale = datetime.utcnow() - timedelta(seconds=UPLOAD_JOB_TIMEOUT_SECONDS + 1)
+        db.execute(update(UploadJob).where(UploadJob.id == job_id).values(heartbeat_at=stale))
+        db.commit()
+    finally:
+        db.close()
+
+
+def job_and_row_count(job_id):
+    db = SessionLocal()
+    try:
+        job = db.get(UploadJob, job_id)
+        rows = db.execute(
+            select(func.count()).select_from(BiomarkerData).where(BiomarkerData.upload_id == job.upload_id)
+        ).scalar()
+        return job, job.upload, rows
+    finally:
+        db.close()
+
+
+def test_expired_claim_is_reclaimed_and_the_first_worker_cannot_finish_it(queued_job):
+    db_a, db_b = SessionLocal(), SessionLocal()
+    try:
+        job_a = claim_next_job(db_a, "worker-a")
+        assert job_a.id == queued_job
+
+        # worker-a stalls past the timeout, so worker-b takes the job over
+        expire_heartbeat(queued_job)
+        job_b = claim_next_job(db_b, "worker-b")
+        assert job_b.id == queued_job
+        assert job_b.attempts == 2
+
+        # worker-a finishing late must not complete the job or keep its rows
+        process_job(db_a, job_a, "worker-a")
+        job, upload, rows = job_and_row_count(queued_job)
+        assert (job.status, job.worker_id) == ("running", "worker-b")
+        assert upload.status == "processing"
+        assert rows == 0
+
+        process_job(db_b, job_b, "worker-b")
+        job, upload, rows = job_and_row_count(queued_job)
+        assert (job.status, job.records_processed) == ("completed", 2)
+        assert upload.status == "completed"
+        assert rows == 2
+    finally:
+        db_a.close()
+        db_b.close()
+
+
+def test_failure_after_losing_the_claim_leaves_the_job_to_its_new_owner(queued_job, tmp_path):
+    db_a, db_b = SessionLocal(), SessionLocal()
+    try:
+        job_a = claim_next_job(db_a, "worker-a")
+        expire_heartbeat(queued_job)
+        claim_next_job(db_b, "worker-b")
+
+        # worker-a's processing fails (its file is unreadable), after worker-b reclaimed
+        (tmp_path / "upload.csv").write_text("date,hdl\n2024-01-01,50\n")
+        process_job(db_a, job_a, "worker-a")
+
+        job, upload, _ = job_and_row_count(queued_job)
+        assert (job.status, job.worker_id, job.error) == ("running", "worker-b", None)
+        assert upload.status == "processing"
+        assert (tmp_path / "upload.csv").exists()
+    finally:
+        db_a.close()
+        db_b.close()
+
+
+def test_live_heartbeat_keeps_the_claim(queued_job):
+    db_a, db_b = SessionLocal(), SessionLocal()
+    try:
+        claim_next_job(db_a, "worker-a")
+        assert claim_next_job(db_b, "worker-b") is None
+    finally:
+        db_a.close()
+        db_b.close()
+
+
+def test_heartbeat_refreshes_only_its_own_claim(queued_job):
+    db_a, db_b = SessionLocal(), SessionLocal()
+    try:
+        claim_next_job(db_a, "worker-a")
+        expire_heartbeat(queued_job)
+        assert JobHeartbeat(queued_job, "worker-a").beat()
+        # Fresh again, so nobody can reclaim it
+        assert claim_next_job(db_b, "worker-b") is None
+
+        expire_heartbeat(queued_job)
+        claim_next_job(db_b, "worker-b")
+        assert not JobHeartbeat(queued_job, "worker-a").beat()
+    finally:
+        db_a.close()
+        db_b.close()
@@ -1,8 +1,85 @@
-from utils.password import hash_password, verify_password
-from utils.health_analysis import calculate_health_analysis
+from utils.password import hash_password, verify_password, measure_password_hash_cost
+from utils.health_analysis import calculate_health_analysis, calculate_health_analysis_batch
+from utils.bulk_load import to_biomarker_frame, bulk_insert_biomarkers
+from utils.biomarker_ingest import (
+    REQUIRED_COLUMNS,
+    PreparedUpload,
+    store_upload_file,
+    remove_upload_files,
+    extract_csv_members,
+    read_csv_chunks,
+    get_missing_columns,
+    inspect_upload_file,
+    prepare_upload_file,
+    load_prepared_upload,
+)
+from utils.partitions import biomarker_partition_name, ensure_biomarker_partitions, precreate_biomarker_partitions
+from utils.series import build_biomarker_series, decode_series, series_frame
+from utils.executors import (
+    ExecutorSaturated,
+    BoundedExecutor,
+    run_in_process_pool,
+    run_in_db_pool,
+    run_in_password_pool,
+    get_process_pool,
+    get_password_pool,
+    shutdown_executors,
+)
+from utils.cache import TTLCache, summary_cache, user_cache
+from utils.export import encode_csv, encode_ndjson, encode_parquet
+from utils.http_cache import make_etag, etag_matches, not_modified, PRIVATE_REVALIDATE, NO_STORE
+from utils.pagination import encode_cursor, decode_cursor, keyset_order, keyset_page
+from utils.log_config import configure_logging, shutdown_logging, log_sampled, request_id
 
 __all__ = [
     "hash_password",
     "verify_password",
+    "measure_password_hash_cost",
     "calculate_health_analysis",
+    "calculate_health_analysis_batch",
+    "to_biomarker_frame",
+    "bulk_insert_biomarkers",
+    "REQUIRED_COLUMNS",
+    "PreparedUpload",
+    "store_upload_file",
+    "remove_upload_files",
+    "extract_csv_members",
+    "read_csv_chunks",
+    "get_missing_columns",
+    "inspect_upload_file",
+    "prepare_upload_file",
+    "load_prepared_upload",
+    "biomarker_partition_name",
+    "ensure_biomarker_partitions",
+    "precreate_biomarker_partitions",
+    "build_biomarker_series",
+    "decode_series",
+    "series_frame",
+    "ExecutorSaturated",
+    "BoundedExecutor",
+    "run_in_process_pool",
+    "run_in_db_pool",
+    "run_in_password_pool",
+    "get_process_pool",
+    "get_password_pool",
+    "shutdown_executors",
+    "TTLCache",
+    "summary_cache",
+    "user_cache",
+    "encode_csv",
+    "encode_ndjson",
+    "encode_parquet",
+    "make_etag",
+    "etag_matches",
+    "not_modified",
+    "PRIVATE_REVALIDATE",
+    "NO_STORE",
+    "encode_cursor",
+    "decode_cursor",
+    "keyset_order",
+    "keyset_page",
+    "configure_logging",
+    "shutdown_logging",
+    "log_sampled",
+    "request_id",
 ]
\ No newline at end of file
@@ -0,0 +1,221 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import hashlib
+import os
+import uuid
+import zipfile
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from models import BiomarkerUpload, AnalysisResult
+from config import UPLOAD_CHUNK_ROWS, UPLOAD_STORAGE_DIR, UPLOAD_READ_BYTES
+from utils.bulk_load import (
+    TIMEPOINT_SCORE_COLUMNS,
+    to_biomarker_frame,
+    write_frame_csv,
+    load_biomarker_file,
+    load_timepoint_file,
+)
+from utils.health_analysis import calculate_health_analysis, calculate_health_analysis_batch
+from utils.partitions import ensure_biomarker_partitions
+from utils.series import build_biomarker_series
+
+REQUIRED_COLUMNS = ['date', 'cholesterol_total', 'hdl', 'ldl', 'triglycerides', 'glucose', 'crp', 'vitamin_d']
+
+
+@dataclass
+class PreparedUpload:
+    """
+    Result of parsing an uploaded CSV: COPY-ready rows and per-row scores on
+    disk, plus the latest-row analysis and the years its rows fall in
+    """
+    rows_path: str
+    scores_path: str
+    records_processed: int
+    analysis: Dict[str, Any]
+    years: Tuple[int, ...] = ()
+
+    @property
+    def paths(self) -> Tuple[str, str]:
+        return self.rows_path, self.scores_path
+
+
+def _storage_path(suffix: str) -> str:
+    os.makedirs(UPLOAD_STORAGE_DIR, exist_ok=True)
+    return os.path.join(UPLOAD_STORAGE_DIR, f"{uuid.uuid4().hex}{suffix}")
+
+
+async def store_upload_file(file, suffix: str = ".csv") -> Tuple[str, str]:
+    """
+    Copy an UploadFile to the upload storage directory.
+    Only the awaited reads run on the event loop; the file is never held in memory whole.
+    Returns the stored path and the SHA-256 hex digest of the bytes, computed on the way through.
+    """
+    path = _storage_path(suffix)
+    digest = hashlib.sha256()
+
+    await file.seek(0)
+    with open(path, "wb") as out:
+        while True:
+            data = await file.read(UPLOAD_READ_BYTES)
+            if not data:
+                break
+            digest.update(data)
+            out.write(data)
+
+    return path, digest.hexdigest()
+
+
+def remove_upload_files(*paths: Optional[str]) -> None:
+    """Delete stored upload files, ignoring ones that are already gone"""
+    for path in paths:
+        if not path:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def extract_csv_members(zip_path: str, max_files: int) -> List[Tuple[str, str, str]]:
+    """
+    Extract the CSV members of a stored ZIP into the upload storage directory.
+    Returns (original filename, stored path, SHA-256 digest) triples; raises ValueError above max_files.
+    """
+    members: List[Tuple[str, str, str]] = []
+    path = None
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                # Skip directories, non-CSV files and macOS resource forks (._name.csv)
+                if info.is_dir() or not name.endswith('.csv') or name.startswith('.'):
+                    continue
+                if len(members) >= max_files:
+                    raise ValueError(f"ZIP contains more than {max_files} CSV files")
+
+                path = _storage_path(".csv")
+                digest = hashlib.sha256()
+                with archive.open(info) as src, open(path, "wb") as dst:
+                    for data in iter(lambda: src.read(UPLOAD_READ_BYTES), b""):
+                        digest.update(data)
+                        dst.write(data)
+                members.append((name, path, digest.hexdigest()))
+                path = None
+    except Exception:
+        remove_upload_files(path, *(member[1] for member in members))
+        raise
+
+    return members
+
+
+def read_csv_chunks(source: Union[str, Any], chunk_rows: int = UPLOAD_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Parse a CSV path or file object lazily, yielding DataFrames of at most chunk_rows rows.
+    Raises pandas.errors.EmptyDataError if the file has no content at all.
+    """
+    return iter(pd.read_csv(source, chunksize=chunk_rows))
+
+
+def get_missing_columns(columns: Iterable[str]) -> List[str]:
+    """Return the required biomarker columns that are not present in columns"""
+    present = set(columns)
+    return [col for col in REQUIRED_COLUMNS if col not in present]
+
+
+def inspect_upload_file(path: str) -> List[str]:
+    """
+    Cheap header check of a stored CSV. Returns the missing required columns.
+    Raises pandas.errors.EmptyDataError if the file has no data rows.
+    """
+    head = pd.read_csv(path, nrows=1)
+    missing_columns = get_missing_columns(head.columns)
+    if not missing_columns and head.empty:
+        raise pd.errors.EmptyDataError("No data rows")
+    return missing_columns
+
+
+def prepare_upload_file(
+    source_path: str,
+    upload_id: int,
+    chronological_age: int,
+    chunk_rows: int = UPLOAD_CHUNK_ROWS
+) -> PreparedUpload:
+    """
+    Parse a stored CSV chunk by chunk into a COPY-ready rows file, score every
+    row into a matching scores file and analyze the latest row.
+
+    Pure CPU/file work with no database access, so it runs in the process pool.
+    """
+    rows_path = f"{source_path}.rows"
+    scores_path = f"{source_path}.scores"
+    records_processed = 0
+    latest_row = None
+    years = set()
+
+    try:
+        with open(rows_path, "w", newline="") as out, open(scores_path, "w", newline="") as scores_out:
+            for chunk in read_csv_chunks(source_path, chunk_rows):
+                frame = to_biomarker_frame(chunk, upload_id)
+                write_frame_csv(frame, out)
+                years.update(frame['date'].dt.year.unique().tolist())
+
+                scores = pd.DataFrame(calculate_health_analysis_batch(frame, chronological_age), index=frame.index)
+                scores['date'] = frame['date']
+                scores['chronological_age'] = chronological_age
+                write_frame_csv(scores[TIMEPOINT_SCORE_COLUMNS], scores_out)
+
+                records_processed += len(chunk)
+                if len(chunk):
+                    latest_row = chunk.iloc[-1]
+
+        analysis = calculate_health_analysis(latest_row, chronological_age)
+    except Exception:
+        remove_upload_files(rows_path, scores_path)
+        raise
+
+    return PreparedUpload(
+        rows_path=rows_path,
+        scores_path=scores_path,
+        records_processed=records_processed,
+        analysis=analysis,
+        years=tuple(sorted(years))
+    )
+
+
+def load_prepared_upload(
+    db: Session,
+    upload: BiomarkerUpload,
+    prepared: PreparedUpload,
+    chronological_age: int
+) -> AnalysisResult:
+    """
+    Load prepared rows, their packed series and their per-row scores for an
+    upload in "processing" state, store its analysis and mark it "completed".
+
+    Everything happens in the caller's transaction; the caller commits, so
+    rows, analysis and status become visible together. Missing biomarker_data
+    partitions are created first, in a transaction of their own (see
+    ensure_biomarker_partitions), so call this before the transaction writes.
+    """
+    ensure_biomarker_partitions(db.get_bind(), prepared.years)
+    connection = db.connection()
+    load_biomarker_file(connection, prepared.rows_path, UPLOAD_CHUNK_ROWS)
+    build_biomarker_series(connection, upload.id)
+    load_timepoint_file(connection, prepared.scores_path, upload.user_id, upload.id, UPLOAD_CHUNK_ROWS)
+
+    analysis = prepared.analysis
+    analysis_result = AnalysisResult(
+        upload_id=upload.id,
+        biological_age=analysis['biological_age'],
+        chronological_age=chronological_age,
+        inflammation_score=analysis['inflammation_score'],
+        metabolic_health_score=analysis['metabolic_health_score'],
+        cardiovascular_risk=analysis['cardiovascular_risk']
+    )
+    db.add(analysis_result)
+
+    upload.status = "completed"
+    db.flush()
+
+    return analysis_result
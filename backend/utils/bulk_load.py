@@ -0,0 +1,126 @@
+from typing import IO, List
+import io
+import pandas as pd
+from sqlalchemy import Table, select
+from sqlalchemy.engine import Connection
+
+from models import BiomarkerData, AnalysisTimepoint
+
+BIOMARKER_FLOAT_COLUMNS = ['cholesterol_total', 'hdl', 'ldl', 'triglycerides', 'glucose', 'crp', 'vitamin_d']
+BIOMARKER_INSERT_COLUMNS = ['upload_id', 'date'] + BIOMARKER_FLOAT_COLUMNS
+
+TIMEPOINT_SCORE_COLUMNS = [
+    'date', 'biological_age', 'chronological_age',
+    'inflammation_score', 'metabolic_health_score', 'cardiovascular_risk'
+]
+TIMEPOINT_INSERT_COLUMNS = ['user_id', 'upload_id', 'biomarker_data_id'] + TIMEPOINT_SCORE_COLUMNS
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    Parse a whole date column at once.
+    Falls back to per-element format inference when the column mixes formats.
+    """
+    try:
+        return pd.to_datetime(values)
+    except ValueError:
+        return pd.to_datetime(values, format="mixed")
+
+
+def to_biomarker_frame(chunk: pd.DataFrame, upload_id: int) -> pd.DataFrame:
+    """Convert a raw CSV chunk into typed, insert-ready biomarker_data columns"""
+    frame = pd.DataFrame(index=chunk.index)
+    frame['upload_id'] = upload_id
+    frame['date'] = parse_dates(chunk['date'])
+    for column in BIOMARKER_FLOAT_COLUMNS:
+        frame[column] = chunk[column].astype('float64')
+    return frame[BIOMARKER_INSERT_COLUMNS]
+
+
+def copy_stream(connection: Connection, table_name: str, columns: List[str], stream: IO[str]) -> None:
+    """Stream CSV text from a file-like object into a Postgres table with COPY ... FROM STDIN"""
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", stream)
+    finally:
+        cursor.close()
+
+
+def write_frame_csv(frame: pd.DataFrame, stream: IO[str]) -> None:
+    """Write a typed frame as headerless COPY-compatible CSV (NaN kept as NaN, not NULL)"""
+    frame.to_csv(stream, index=False, header=False, na_rep='NaN')
+
+
+def copy_frame(connection: Connection, table_name: str, frame: pd.DataFrame) -> None:
+    """Stream a DataFrame into a Postgres table with COPY ... FROM STDIN"""
+    buffer = io.StringIO()
+    write_frame_csv(frame, buffer)
+    buffer.seek(0)
+    copy_stream(connection, table_name, list(frame.columns), buffer)
+
+
+def bulk_insert(connection: Connection, table: Table, frame: pd.DataFrame) -> None:
+    """
+    Insert a typed frame into table.
+    Uses COPY on PostgreSQL and a single executemany on other engines.
+    """
+    if frame.empty:
+        return
+
+    if connection.dialect.name == "postgresql":
+        copy_frame(connection, table.name, frame)
+    else:
+        records: List[dict] = frame.to_dict('records')
+        connection.execute(table.insert(), records)
+
+
+def bulk_insert_biomarkers(connection: Connection, frame: pd.DataFrame) -> None:
+    """Insert a typed biomarker frame into biomarker_data"""
+    bulk_insert(connection, BiomarkerData.__table__, frame)
+
+
+def load_biomarker_file(connection: Connection, path: str, chunk_rows: int) -> None:
+    """
+    Load a file written by write_frame_csv into biomarker_data.
+    PostgreSQL gets the file streamed straight into COPY; other engines read
+    it back chunk by chunk and use executemany.
+    """
+    if connection.dialect.name == "postgresql":
+        with open(path, "r", newline="") as f:
+            copy_stream(connection, BiomarkerData.__tablename__, BIOMARKER_INSERT_COLUMNS, f)
+        return
+
+    for frame in pd.read_csv(path, header=None, names=BIOMARKER_INSERT_COLUMNS, chunksize=chunk_rows):
+        frame['date'] = pd.to_datetime(frame['date'])
+        bulk_insert_biomarkers(connection, frame)
+
+
+def load_timepoint_file(
+    connection: Connection,
+    path: str,
+    user_id: int,
+    upload_id: int,
+    chunk_rows: int
+) -> None:
+    """
+    Load per-row scores (TIMEPOINT_SCORE_COLUMNS, one line per biomarker_data
+    row in file order) into analysis_timepoints.
+
+    Must run after the upload's biomarker_data rows were loaded in the same
+    transaction: they got ascending ids in file order, so streaming them back
+    ORDER BY id pairs each score line with its row.
+    """
+    data_ids = connection.execute(
+        select(BiomarkerData.id)
+        .where(BiomarkerData.upload_id == upload_id)
+        .order_by(BiomarkerData.id)
+        .execution_options(yield_per=chunk_rows)
+    ).scalars().partitions()
+
+    scores = pd.read_csv(path, header=None, names=TIMEPOINT_SCORE_COLUMNS, chunksize=chunk_rows)
+    for frame, ids in zip(scores, data_ids, strict=True):
+        frame.insert(0, 'biomarker_data_id', ids)
+        frame.insert(0, 'upload_id', upload_id)
+        frame.insert(0, 'user_id', user_id)
+        frame['date'] = pd.to_datetime(frame['date'])
+        bulk_insert(connection, AnalysisTimepoint.__table__, frame[TIMEPOINT_INSERT_COLUMNS])
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import threading
+import time
+
+from config import (
+    SUMMARY_CACHE_TTL_SECONDS,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    USER_CACHE_TTL_SECONDS,
+    USER_CACHE_MAX_ENTRIES,
+)
+
+_NOT_LOADED = object()  # _end_load() sentinel: the loader raised
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with per-entry expiry and LRU eviction.
+
+    Invalidation is local to this process; in multi-process deployments the
+    TTL bounds how long another process can serve stale entries.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # [version, loads in flight] per key, only while get_or_load runs for it
+        self._versions: Dict[Hashable, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Cache value for ttl_seconds (capped at the cache's TTL)"""
+        with self._lock:
+            self._store(key, value, ttl_seconds)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value, or call loader() and cache its result.
+        A result is not cached if key was invalidated while loader() ran,
+        so a load that raced a write can't pin pre-write data.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        version = self._begin_load(key)
+        try:
+            value = loader()
+        except BaseException:
+            self._end_load(key, version)
+            raise
+        self._end_load(key, version, value)
+        return value
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """get_or_load() for a coroutine loader"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        version = self._begin_load(key)
+        try:
+            value = await loader()
+        except BaseException:
+            self._end_load(key, version)
+            raise
+        self._end_load(key, version, value)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                # Only loads in flight need to see the invalidation
+                if key in self._versions:
+                    self._versions[key][0] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for load in self._versions.values():
+                load[0] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _begin_load(self, key: Hashable) -> int:
+        with self._lock:
+            load = self._versions.setdefault(key, [0, 0])
+            load[1] += 1
+            return load[0]
+
+    def _end_load(self, key: Hashable, version: int, value: Any = _NOT_LOADED) -> None:
+        """Cache value unless key was invalidated since _begin_load; drop the version with the last load"""
+        with self._lock:
+            load = self._versions[key]
+            if value is not _NOT_LOADED and load[0] == version:
+                self._store(key, value)
+            load[1] -= 1
+            if load[1] == 0:
+                del self._versions[key]
+
+    def _store(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# GET /biomarkers/summary payloads keyed by user id; invalidate on any upload change
+summary_cache = TTLCache(SUMMARY_CACHE_TTL_SECONDS, SUMMARY_CACHE_MAX_ENTRIES)
+
+# get_current_user snapshots keyed by user id; invalidate when a user row changes
+user_cache = TTLCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES)
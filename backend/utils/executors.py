@@ -0,0 +1,173 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import threading
+import time
+
+from config import UPLOAD_PARSE_PROCESSES, UPLOAD_DB_THREADS, PASSWORD_HASH_THREADS, PASSWORD_HASH_MAX_QUEUE
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised instead of queueing when a BoundedExecutor's queue is full"""
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard limit on waiting work.
+
+    submit() raises ExecutorSaturated once max_workers tasks are running and
+    max_queue more are waiting, so callers can shed load immediately instead
+    of piling up behind a burst.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, thread_name_prefix: str = ""):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._peak_queue_depth = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Tasks submitted but not yet started"""
+        return max(0, self._in_flight - self.max_workers)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturated(f"{self.queue_depth} tasks already queued")
+            self._in_flight += 1
+            self._submitted += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self.queue_depth)
+        submitted_at = time.perf_counter()
+
+        def run():
+            started_at = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._in_flight -= 1
+                    self._completed += 1
+                    self._wait_seconds += started_at - submitted_at
+                    self._run_seconds += finished_at - started_at
+
+        try:
+            return self._executor.submit(run)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": self.queue_depth,
+                "peak_queue_depth": self._peak_queue_depth,
+                "submitted": self._submitted,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2) if completed else None,
+                "avg_run_ms": round(self._run_seconds / completed * 1000, 2) if completed else None,
+            }
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+# Shared, bounded executors for the upload pipeline and password hashing, created on first use
+_process_pool: Optional[ProcessPoolExecutor] = None
+_db_pool: Optional[ThreadPoolExecutor] = None
+_password_pool: Optional[BoundedExecutor] = None
+_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Process pool for CPU-bound work (CSV parsing, scoring)"""
+    global _process_pool
+    if _process_pool is None:
+        with _lock:
+            if _process_pool is None:
+                # spawn: the API process runs threads, which fork() does not copy safely
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=UPLOAD_PARSE_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _process_pool
+
+
+def get_db_pool() -> ThreadPoolExecutor:
+    """Thread pool for blocking upload database writes (bulk loads); keep short queries off it"""
+    global _db_pool
+    if _db_pool is None:
+        with _lock:
+            if _db_pool is None:
+                _db_pool = ThreadPoolExecutor(max_workers=UPLOAD_DB_THREADS, thread_name_prefix="db-write")
+    return _db_pool
+
+
+def get_password_pool() -> BoundedExecutor:
+    """
+    Bounded thread pool for bcrypt. bcrypt releases the GIL while hashing,
+    so threads hash in parallel without the cost of a process pool.
+    """
+    global _password_pool
+    if _password_pool is None:
+        with _lock:
+            if _password_pool is None:
+                _password_pool = BoundedExecutor(
+                    max_workers=PASSWORD_HASH_THREADS,
+                    max_queue=PASSWORD_HASH_MAX_QUEUE,
+                    thread_name_prefix="password-hash",
+                )
+    return _password_pool
+
+
+async def _run_in(executor: Executor, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+async def run_in_process_pool(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await fn(*args, **kwargs) in the process pool (fn and arguments must be picklable)"""
+    return await _run_in(get_process_pool(), fn, *args, **kwargs)
+
+
+async def run_in_db_pool(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await fn(*args, **kwargs) in the database thread pool (with the caller's context, e.g. request id)"""
+    return await _run_in(get_db_pool(), contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+async def run_in_password_pool(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await fn(*args, **kwargs) in the password hashing pool; raises ExecutorSaturated when it is full"""
+    return await asyncio.wrap_future(get_password_pool().submit(contextvars.copy_context().run, fn, *args, **kwargs))
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down the shared executors (called on application shutdown)"""
+    global _process_pool, _db_pool, _password_pool
+    with _lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=wait, cancel_futures=True)
+            _process_pool = None
+        if _db_pool is not None:
+            _db_pool.shutdown(wait=wait, cancel_futures=True)
+            _db_pool = None
+        if _password_pool is not None:
+            _password_pool.shutdown(wait=wait, cancel_futures=True)
+            _password_pool = None
@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Sequence
+import csv
+import io
+import json
+import math
+
+from sqlalchemy import DateTime, Float, Integer, SmallInteger
+
+# Encoders turn batches of rows (tuples in the order of columns) into response
+# chunks, so an export never holds more than one batch in memory.
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def encode_csv(columns: Sequence[Any], batches: Iterable[List[tuple]]) -> Iterator[str]:
+    """CSV with a header row; one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    for batch in batches:
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in batch
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_ndjson(columns: Sequence[Any], batches: Iterable[List[tuple]]) -> Iterator[str]:
+    """One JSON object per line; one chunk per batch"""
+    names = [column.name for column in columns]
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(names, map(_json_value, row)))) + "\n"
+            for row in batch
+        )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_type(column: Any):
+    import pyarrow as pa
+
+    if isinstance(column.type, SmallInteger):
+        return pa.int16()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def encode_parquet(columns: Sequence[Any], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """
+    Parquet with one row group per batch, streamed as each group is written.
+    pyarrow is imported here rather than at module load, so only Parquet
+    exports pay for it.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column.name, _arrow_type(column)) for column in columns])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array([row[i] for row in batch], type=field.type) for i, field in enumerate(schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    yield sink.drain()
@@ -1,4 +1,5 @@
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Union
+import numpy as np
 import pandas as pd
 
 
@@ -72,4 +73,67 @@ def calculate_health_analysis(biomarkers: pd.Series, chronological_age: int) ->
         "inflammation_score": round(inflammation_score, 1),
         "metabolic_health_score": round(metabolic_score, 1),
         "cardiovascular_risk": cv_risk
-    }
\ No newline at end of file
+    }
+
+
+def calculate_health_analysis_batch(
+    biomarkers: Union[pd.DataFrame, Mapping[str, Any]],
+    chronological_age: Union[int, Any]
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized calculate_health_analysis for N rows at once.
+
+    biomarkers is a DataFrame (or mapping of equal-length arrays) with the
+    biomarker columns; chronological_age is a scalar or N ages. Returns the
+    same keys as calculate_health_analysis, each an array with one value per
+    row, and row for row the same values as the scalar function.
+    """
+    
+    def column(name: str) -> np.ndarray:
+        return np.asarray(biomarkers[name], dtype=np.float64)
+    
+    # NaN fails every comparison, so it falls through to the last branch
+    # exactly like the scalar if/elif chain
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chol_hdl_ratio = column('cholesterol_total') / column('hdl')
+    crp = column('crp')
+    glucose = column('glucose')
+    triglycerides = column('triglycerides')
+    vitamin_d = column('vitamin_d')
+    ldl = column('ldl')
+    
+    # 1. Cholesterol/HDL Ratio
+    ratio_conditions = [chol_hdl_ratio < 3.5, chol_hdl_ratio < 5.0]
+    age_modifier = np.select(ratio_conditions, [-3, 0], default=4)
+    cv_risk = np.select(ratio_conditions, ["low", "medium"], default="high").astype(object)
+    
+    # 2. CRP (Inflammation)
+    crp_conditions = [crp < 1.0, crp < 3.0]
+    inflammation_score = np.select(crp_conditions, [90, 70], default=40)
+    age_modifier += np.select(crp_conditions, [-2, 1], default=3)
+    
+    # 3. Glucose
+    glucose_conditions = [glucose < 100, glucose < 126]
+    metabolic_score = np.select(glucose_conditions, [95, 65], default=35)
+    age_modifier += np.select(glucose_conditions, [-2, 2], default=5)
+    
+    # 4. Triglycerides
+    age_modifier += np.select([triglycerides < 100, triglycerides > 200], [-1, 2], default=0)
+    
+    # 5. Vitamin D
+    age_modifier += np.select([vitamin_d < 20, vitamin_d >= 40], [1, -1], default=0)
+    
+    # 6. LDL
+    age_modifier += np.select([ldl < 100, ldl > 160], [-1, 2], default=0)
+    
+    ages = np.broadcast_to(np.asarray(chronological_age), age_modifier.shape)
+    biological_age = np.maximum(18, np.minimum(ages + age_modifier, ages + 20))
+    if biological_age.dtype.kind == 'f':
+        biological_age = np.round(biological_age, 1)
+    
+    return {
+        "biological_age": biological_age,
+        "inflammation_score": inflammation_score,
+        "metabolic_health_score": metabolic_score,
+        "cardiovascular_risk": cv_risk
+    }
@@ -0,0 +1,34 @@
+from typing import Any, Optional
+import hashlib
+
+from fastapi import Response, status
+
+# Responses are per-user, so shared caches must not store them; clients
+# revalidate every time and get a 304 when nothing changed
+PRIVATE_REVALIDATE = "private, no-cache"
+NO_STORE = "no-store"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag (quoted) derived from the given version parts"""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
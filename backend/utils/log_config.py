@@ -0,0 +1,120 @@
+"""
+Application logging.
+
+Handlers never run on the request path: loggers hand records to a
+QueueHandler and a QueueListener thread formats and writes them (console and
+logs/app_<date>.log). Every record carries the request's correlation id.
+"""
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import atexit
+import logging
+import os
+import queue
+import random
+import time
+
+from config import LOG_LEVEL, LOG_DIR, LOG_DEBUG_SAMPLE_RATE
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] [%(request_id)s] - %(message)s'
+
+# Correlation id of the request being handled (set by CorrelationIdMiddleware)
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current correlation id (runs in the emitting thread, where it is set)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    """
+    QueueHandler that only merges the message arguments before enqueueing.
+    The stock prepare() runs the full formatter (timestamps, layout) in the
+    calling thread; here that is left to the listener's handlers.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks can't cross threads safely; render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _BatchingQueueListener(QueueListener):
+    """
+    QueueListener that wakes at most every flush_interval seconds while idle.
+    Waking per record means a thread switch (and GIL handoff) per log line;
+    sleeping after the queue empties lets records pile up and be written in
+    one batch instead.
+    """
+
+    def __init__(self, log_queue, *handlers, flush_interval: float = 0.05, **kwargs):
+        super().__init__(log_queue, *handlers, **kwargs)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            if not block:
+                raise
+        time.sleep(self.flush_interval)
+        return self.queue.get()
+
+
+def configure_logging(level: str = LOG_LEVEL, log_dir: Optional[str] = LOG_DIR) -> QueueListener:
+    """Route the root logger through a queue to console (and file) handlers; idempotent"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        handlers.append(logging.FileHandler(os.path.join(log_dir, f'app_{datetime.now().strftime("%Y%m%d")}.log')))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _DeferredFormatQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    _listener = _BatchingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def log_sampled(logger: logging.Logger, level: int, msg: str, *args, rate: float = LOG_DEBUG_SAMPLE_RATE) -> None:
+    """
+    Log a hot-path record for roughly `rate` of calls.
+    Costs one isEnabledFor check when the level is disabled.
+    """
+    if logger.isEnabledFor(level) and random.random() < rate:
+        logger.log(level, msg, *args, stacklevel=2)
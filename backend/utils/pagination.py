@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+import base64
+import json
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(sort_date: datetime, row_id: int) -> str:
+    """Opaque cursor for the position right after (sort_date, row_id)"""
+    payload = json.dumps([sort_date.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_date, row_id = json.loads(payload)
+        return datetime.fromisoformat(sort_date), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_order(query: Query, date_column: Any, id_column: Any, after: Optional[Cursor]) -> Query:
+    """
+    Order query newest first by (date_column, id_column), starting after the cursor.
+
+    Seeks past the cursor with a row-value comparison instead of OFFSET, so
+    every page is an index range scan no matter how deep it is.
+    """
+    if after is not None:
+        query = query.filter(tuple_(date_column, id_column) < tuple_(*after))
+    return query.order_by(date_column.desc(), id_column.desc())
+
+
+def keyset_page(
+    query: Query,
+    date_column: Any,
+    id_column: Any,
+    after: Optional[Cursor],
+    limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Newest-first page of query (see keyset_order). Returns the rows and the
+    cursor for the next page (None on the last page).
+    """
+    rows = keyset_order(query, date_column, id_column, after).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, date_column.key), getattr(last, id_column.key))
@@ -0,0 +1,98 @@
+"""
+Yearly range partitions of biomarker_data (partitioned by date on PostgreSQL).
+
+Partitions are created on demand by ingest, before the rows are loaded. Each
+one is built as a plain table and then ATTACHed: ATTACH PARTITION only takes a
+SHARE UPDATE EXCLUSIVE lock on biomarker_data, so reads and other uploads keep
+running, whereas CREATE TABLE ... PARTITION OF would lock the table exclusively.
+The current and next year are created at startup, so ingest rarely has to.
+"""
+from datetime import datetime
+from typing import Iterable, Set
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from models import BiomarkerData
+
+# Serialises partition creation across processes (pg_advisory_xact_lock key)
+PARTITION_LOCK_KEY = 0x62696F6D  # "biom"
+
+# Attaching also locks biomarker_uploads (the upload_id foreign key is cloned
+# onto the partition), so don't queue behind a long writer; back off and
+# retry instead, doubling the delay after each attempt
+PARTITION_LOCK_TIMEOUT = "10s"
+PARTITION_ATTEMPTS = 4
+PARTITION_RETRY_DELAY_SECONDS = 1.0
+
+# SQLSTATE lock_not_available, raised when lock_timeout expires
+_LOCK_NOT_AVAILABLE = "55P03"
+
+logger = logging.getLogger(__name__)
+
+_known_years: Set[int] = set()
+_known_lock = threading.Lock()
+
+
+def biomarker_partition_name(year: int) -> str:
+    return f"{BiomarkerData.__tablename__}_y{year}"
+
+
+def ensure_biomarker_partitions(bind: Engine, years: Iterable[int]) -> None:
+    """
+    Make sure biomarker_data has a partition for every year in years.
+
+    Runs in its own short transaction on a fresh connection, so call it before
+    the caller's transaction writes to biomarker_uploads or biomarker_data;
+    otherwise the ATTACH waits on the caller's own locks until lock_timeout.
+    Years already seen by this process are skipped without a round trip.
+    A lock timeout is retried PARTITION_ATTEMPTS times before it is raised.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+
+    with _known_lock:
+        missing = sorted(set(years) - _known_years)
+    if not missing:
+        return
+
+    delay = PARTITION_RETRY_DELAY_SECONDS
+    for attempt in range(1, PARTITION_ATTEMPTS + 1):
+        try:
+            _create_partitions(bind, missing)
+            break
+        except OperationalError as e:
+            if getattr(e.orig, "pgcode", None) != _LOCK_NOT_AVAILABLE or attempt == PARTITION_ATTEMPTS:
+                raise
+            logger.warning("Partition lock busy (attempt %s/%s), retrying in %.1fs", attempt, PARTITION_ATTEMPTS, delay)
+            time.sleep(delay)
+            delay *= 2
+
+    with _known_lock:
+        _known_years.update(missing)
+
+
+def precreate_biomarker_partitions(bind: Engine) -> None:
+    """Create this year's and next year's partitions ahead of the uploads that need them"""
+    year = datetime.utcnow().year
+    ensure_biomarker_partitions(bind, [year, year + 1])
+
+
+def _create_partitions(bind: Engine, years: Iterable[int]) -> None:
+    table = BiomarkerData.__tablename__
+    with bind.begin() as connection:
+        connection.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+        for year in years:
+            name = biomarker_partition_name(year)
+            if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+                continue
+            connection.execute(text(f"CREATE TABLE {name} (LIKE {table})"))
+            connection.execute(text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            ))
@@ -1,5 +1,7 @@
 from passlib.context import CryptContext
+from typing import Dict
 import hashlib
+import time
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -21,4 +23,17 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     # Add the SAME pre-hash here!
     prehashed = hashlib.sha256(plain_password.encode('utf-8')).hexdigest()
-    return pwd_context.verify(prehashed, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(prehashed, hashed_password)
+
+
+def measure_password_hash_cost() -> Dict[str, float]:
+    """Time one hash_password and one verify_password call with the configured bcrypt cost"""
+    started = time.perf_counter()
+    hashed = hash_password("cost-measurement")
+    hashed_at = time.perf_counter()
+    verify_password("cost-measurement", hashed)
+    verified_at = time.perf_counter()
+    return {
+        "hash_seconds": hashed_at - started,
+        "verify_seconds": verified_at - hashed_at,
+    }
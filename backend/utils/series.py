@@ -0,0 +1,66 @@
+"""
+Packed per-upload biomarker series (biomarker_series).
+
+Each column of an upload's biomarker_data rows is stored as one BYTEA value in
+(date, id) order, so a whole-series read is a single row and decoding is a
+numpy.frombuffer view per column instead of one ORM object per row.
+"""
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from models import BiomarkerData, BiomarkerSeries
+from utils.bulk_load import BIOMARKER_FLOAT_COLUMNS
+
+# The byte layout Postgres' int8send/float8send produce
+SERIES_DATE_DTYPE = np.dtype(">i8")  # microseconds since 1970-01-01
+SERIES_VALUE_DTYPE = np.dtype(">f8")
+SERIES_DATETIME_DTYPE = np.dtype(">M8[us]")
+
+SERIES_COLUMNS = ['upload_id', 'row_count', 'dates'] + BIOMARKER_FLOAT_COLUMNS
+
+_PACKED_VALUES = ', '.join(
+    f"string_agg(float8send(coalesce({column}, 'NaN')), '' ORDER BY date, id)" for column in BIOMARKER_FLOAT_COLUMNS
+)
+
+# Packs server side, so the rows never travel to the application
+_PACK_SERIES_SQL = f"""
+INSERT INTO {BiomarkerSeries.__tablename__} ({', '.join(SERIES_COLUMNS)})
+SELECT upload_id, count(*),
+       string_agg(int8send((extract(epoch FROM date) * 1000000)::bigint), '' ORDER BY date, id),
+       {_PACKED_VALUES}
+FROM {BiomarkerData.__tablename__}
+WHERE upload_id = :upload_id
+GROUP BY upload_id
+"""
+
+
+def build_biomarker_series(connection: Connection, upload_id: int) -> None:
+    """
+    Pack an upload's biomarker_data rows into its biomarker_series row
+    (PostgreSQL). Run after the rows were loaded, in the same transaction.
+    An upload without rows gets no series.
+    """
+    connection.execute(text(_PACK_SERIES_SQL), {"upload_id": upload_id})
+
+
+def decode_series(series: BiomarkerSeries) -> Dict[str, np.ndarray]:
+    """
+    {'date': datetime64[us], <biomarker>: float64, ...} arrays for a series
+    row. Each is a read-only view over the stored bytes, not a copy.
+    """
+    arrays = {'date': np.frombuffer(series.dates, dtype=SERIES_DATE_DTYPE).view(SERIES_DATETIME_DTYPE)}
+    for column in BIOMARKER_FLOAT_COLUMNS:
+        arrays[column] = np.frombuffer(getattr(series, column), dtype=SERIES_VALUE_DTYPE)
+    return arrays
+
+
+def series_frame(series: BiomarkerSeries) -> pd.DataFrame:
+    """
+    A series as a DataFrame (date plus one float64 column per biomarker) for
+    analytics; converted to native byte order, so this one copies
+    """
+    return pd.DataFrame(decode_series(series)).astype({column: 'float64' for column in BIOMARKER_FLOAT_COLUMNS})
@@ -0,0 +1,15 @@
+from workers.upload_worker import (
+    enqueue_upload,
+    claim_next_job,
+    process_job,
+    run_worker,
+    UploadWorkerPool,
+)
+
+__all__ = [
+    "enqueue_upload",
+    "claim_next_job",
+    "process_job",
+    "run_worker",
+    "UploadWorkerPool",
+]
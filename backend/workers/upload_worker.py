@@ -0,0 +1,355 @@
+"""
+Upload queue worker.
+
+Claims queued upload jobs from the upload_jobs table with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers (threads in the
+API process or separate CLI processes) can drain the queue without handing
+the same job out twice.
+
+A worker refreshes its job's heartbeat_at while processing; a running job is
+only reclaimed once its heartbeat is older than UPLOAD_JOB_TIMEOUT_SECONDS.
+Completion and failure are written only while the job is still claimed by the
+same worker, so a worker whose claim was taken over discards its results.
+
+Run standalone (from backend/):
+    python -m workers.upload_worker --concurrency 4
+"""
+from typing import List, Optional
+from datetime import datetime, timedelta
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+
+from sqlalchemy import or_, and_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import BiomarkerUpload, UploadJob
+from dependencies.database import SessionLocal, engine
+from utils import (
+    inspect_upload_file,
+    prepare_upload_file,
+    load_prepared_upload,
+    remove_upload_files,
+    get_process_pool,
+    shutdown_executors,
+    precreate_biomarker_partitions,
+    summary_cache,
+)
+from config import (
+    UPLOAD_WORKER_POLL_SECONDS,
+    UPLOAD_JOB_TIMEOUT_SECONDS,
+    UPLOAD_JOB_HEARTBEAT_SECONDS,
+    UPLOAD_JOB_MAX_ATTEMPTS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Set whenever a job is enqueued so in-process workers don't wait a full poll interval
+_job_available = threading.Event()
+
+
+def enqueue_upload(
+    db: Session,
+    user_id: int,
+    filename: str,
+    file_path: str,
+    chronological_age: int,
+    content_digest: Optional[str] = None
+) -> BiomarkerUpload:
+    """
+    Create a "processing" upload plus its queued job and wake in-process workers.
+    Raises IntegrityError (after rolling back) if the user already has an upload with this digest.
+    """
+    upload = BiomarkerUpload(
+        user_id=user_id,
+        filename=filename,
+        status="processing",
+        content_digest=content_digest
+    )
+    upload.job = UploadJob(
+        file_path=file_path,
+        chronological_age=chronological_age,
+        status="queued",
+        attempts=0
+    )
+    db.add(upload)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    db.refresh(upload)
+
+    _job_available.set()
+    return upload
+
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[UploadJob]:
+    """
+    Claim the oldest runnable job, skipping rows locked by other workers.
+    Running jobs whose heartbeat is older than UPLOAD_JOB_TIMEOUT_SECONDS
+    (crashed worker) are reclaimed until they run out of attempts.
+    """
+    stale_before = datetime.utcnow() - timedelta(seconds=UPLOAD_JOB_TIMEOUT_SECONDS)
+
+    job = (
+        db.query(UploadJob)
+        .filter(
+            or_(
+                UploadJob.status == "queued",
+                and_(UploadJob.status == "running", UploadJob.heartbeat_at < stale_before),
+            ),
+            UploadJob.attempts < UPLOAD_JOB_MAX_ATTEMPTS,
+        )
+        .order_by(UploadJob.id)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if job is None:
+        db.rollback()
+        return None
+
+    job.status = "running"
+    job.worker_id = worker_id
+    job.attempts += 1
+    job.started_at = job.heartbeat_at = datetime.utcnow()
+    db.commit()
+
+    return job
+
+
+def fail_exhausted_jobs(db: Session) -> int:
+    """Mark stale jobs that have used up all attempts (and their uploads) as failed"""
+    stale_before = datetime.utcnow() - timedelta(seconds=UPLOAD_JOB_TIMEOUT_SECONDS)
+
+    jobs = (
+        db.query(UploadJob)
+        .filter(
+            UploadJob.status == "running",
+            UploadJob.heartbeat_at < stale_before,
+            UploadJob.attempts >= UPLOAD_JOB_MAX_ATTEMPTS,
+        )
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for job in jobs:
+        _mark_failed(job, "Job timed out after maximum attempts")
+    db.commit()
+    summary_cache.invalidate(*(job.upload.user_id for job in jobs))
+
+    return len(jobs)
+
+
+def process_job(db: Session, job: UploadJob, worker_id: str) -> None:
+    """
+    Parse, load and analyze the stored CSV of a job claimed by worker_id.
+    If another worker reclaimed the job meanwhile, the load is rolled back and
+    the job and its file are left to that worker.
+    """
+    job_id, file_path = job.id, job.file_path
+    upload = job.upload
+    user_id = upload.user_id
+    prepared = None
+    finished = False
+    heartbeat = JobHeartbeat(job_id, worker_id).start()
+
+    try:
+        missing_columns = inspect_upload_file(file_path)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+
+        # Parsing and scoring are CPU-bound; keep them off this process's GIL
+        prepared = get_process_pool().submit(
+            prepare_upload_file, file_path, upload.id, job.chronological_age
+        ).result()
+        load_prepared_upload(db, upload, prepared, job.chronological_age)
+
+        heartbeat.stop()
+        finished = _finish_job(
+            db, job_id, worker_id, status="completed", records_processed=prepared.records_processed
+        )
+        if finished:
+            db.commit()
+            logger.info("Upload job %s completed (upload=%s, rows=%s)", job_id, upload.id, prepared.records_processed)
+        else:
+            db.rollback()
+            logger.warning("Upload job %s was reclaimed from %s, discarding its load", job_id, worker_id)
+
+    except Exception as e:
+        heartbeat.stop()
+        db.rollback()
+        logger.exception("Upload job %s failed", job_id)
+        finished = _finish_job(db, job_id, worker_id, status="failed", error=f"Error processing file: {str(e)}")
+        if finished:
+            db.execute(update(BiomarkerUpload).where(BiomarkerUpload.id == upload.id).values(status="failed"))
+        db.commit()
+
+    finally:
+        summary_cache.invalidate(user_id)
+        remove_upload_files(*(prepared.paths if prepared else ()))
+
+    if finished:
+        remove_upload_files(file_path)
+
+
+def _finish_job(db: Session, job_id: int, worker_id: str, **values) -> bool:
+    """Close out a job only if worker_id still holds its claim; False if it was reclaimed"""
+    result = db.execute(
+        update(UploadJob)
+        .where(UploadJob.id == job_id, UploadJob.worker_id == worker_id, UploadJob.status == "running")
+        .values(finished_at=datetime.utcnow(), **values)
+    )
+    return result.rowcount == 1
+
+
+def _mark_failed(job: UploadJob, error: str) -> None:
+    job.status = "failed"
+    job.error = error
+    job.finished_at = datetime.utcnow()
+    job.upload.status = "failed"
+
+
+class JobHeartbeat:
+    """Refreshes a claimed job's heartbeat_at from a background thread until stopped"""
+
+    def __init__(self, job_id: int, worker_id: str, interval: float = UPLOAD_JOB_HEARTBEAT_SECONDS):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"upload-heartbeat-{job_id}", daemon=True)
+
+    def start(self) -> "JobHeartbeat":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def beat(self) -> bool:
+        """One heartbeat on its own connection; False once the claim is gone"""
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(UploadJob)
+                .where(
+                    UploadJob.id == self.job_id,
+                    UploadJob.worker_id == self.worker_id,
+                    UploadJob.status == "running",
+                )
+                .values(heartbeat_at=datetime.utcnow())
+            )
+            db.commit()
+            return result.rowcount == 1
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            try:
+                if not self.beat():
+                    logger.warning("Upload job %s is no longer claimed by %s", self.job_id, self.worker_id)
+                    return
+            except Exception:
+                logger.exception("Upload job %s heartbeat failed", self.job_id)
+
+
+def run_worker(
+    stop_event: threading.Event,
+    worker_id: Optional[str] = None,
+    poll_interval: float = UPLOAD_WORKER_POLL_SECONDS
+) -> None:
+    """Claim and process jobs until stop_event is set"""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    logger.info("Upload worker %s started", worker_id)
+
+    while not stop_event.is_set():
+        db = SessionLocal()
+        try:
+            job = claim_next_job(db, worker_id)
+            if job is not None:
+                process_job(db, job, worker_id)
+                continue
+            fail_exhausted_jobs(db)
+        except Exception:
+            logger.exception("Upload worker %s poll failed", worker_id)
+        finally:
+            db.close()
+
+        _job_available.wait(poll_interval)
+        _job_available.clear()
+
+    logger.info("Upload worker %s stopped", worker_id)
+
+
+class UploadWorkerPool:
+    """A set of worker threads draining the upload queue inside this process"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.stop_event = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+    def start(self) -> "UploadWorkerPool":
+        for i in range(self.size):
+            thread = threading.Thread(
+                target=run_worker,
+                args=(self.stop_event,),
+                name=f"upload-worker-{i}",
+                daemon=True,
+            )
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self.stop_event.set()
+        _job_available.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued biomarker uploads")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of worker threads")
+    parser.add_argument("--poll-interval", type=float, default=UPLOAD_WORKER_POLL_SECONDS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    try:
+        precreate_biomarker_partitions(engine)
+    except SQLAlchemyError:
+        logger.warning("Could not pre-create biomarker_data partitions", exc_info=True)
+
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info("Received signal %s, shutting down", signum)
+        stop_event.set()
+        _job_available.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    threads = [
+        threading.Thread(target=run_worker, args=(stop_event, None, args.poll_interval), name=f"upload-worker-{i}")
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    shutdown_executors()
+
+
+if __name__ == "__main__":
+    main()